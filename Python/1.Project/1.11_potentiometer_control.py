@@ -7,6 +7,7 @@ Shows real-time values and provides smooth brightness control.
 
 import machine
 import utime
+from adc_sampler import ADCSampler, FILTER_EMA
 
 # Pin definitions and constants
 POTENTIOMETER_PIN = 28          # potentiometer connected to ADC pin 28
@@ -29,7 +30,8 @@ led_brightness = 0              # calculated LED brightness
 last_reading = -1               # previous reading for change detection
 
 # Initialize hardware
-potentiometer = machine.ADC(POTENTIOMETER_PIN)
+# Sampled in the background and smoothed, so the LED does not flicker
+potentiometer = ADCSampler([POTENTIOMETER_PIN], rate_hz=200, smoothing=FILTER_EMA)
 led = machine.PWM(machine.Pin(LED_PIN))
 led.freq(PWM_FREQUENCY)
 
@@ -70,7 +72,7 @@ def update_brightness_control():
     global current_reading, led_brightness, last_reading
     
     # Read current potentiometer value
-    current_reading = potentiometer.read_u16()
+    current_reading = potentiometer.read()
     
     # Convert analog reading to PWM value for LED brightness
     led_brightness = map_value(current_reading, MIN_ANALOG_VALUE, MAX_ANALOG_VALUE,
@@ -87,6 +89,7 @@ def update_brightness_control():
 def main():
     """Main function"""
     show_control_info()
+    potentiometer.start()
     
     try:
         while True:
@@ -98,6 +101,7 @@ def main():
             
     except KeyboardInterrupt:
         print("\nShutting down...")
+        potentiometer.stop()
         # Turn off LED
         led.duty_u16(0)
         led.deinit()
@@ -7,7 +7,8 @@ the temperature in both Celsius and Fahrenheit.
 
 import machine
 import utime
-import math
+from adc_sampler import ADCSampler, FILTER_MEDIAN
+from thermistor import Thermistor
 
 # Pin and sensor constants
 THERMISTOR_PIN = 28              # thermistor connected to pin 28 (ADC)
@@ -16,29 +17,23 @@ PULLUP_RESISTANCE = 10000        # pull-up resistor value in Ohms
 UPDATE_INTERVAL = 1000           # reading interval in milliseconds
 
 # Temperature calculation constants
-ROOM_TEMP_KELVIN = 298.15        # room temperature in Kelvin (25°C)
-KELVIN_OFFSET = 273.15           # conversion offset from Celsius to Kelvin
-ADC_MAX_VALUE = 65535            # 16-bit ADC maximum value
-SUPPLY_VOLTAGE = 3.3             # supply voltage
+ROOM_TEMP_CELSIUS = 25.0         # temperature at which the thermistor reads 10k
+TABLE_STEP_BITS = 8              # one table entry per 256 ADC codes (~0.02°C error)
 
-# Initialize thermistor ADC
-thermistor = machine.ADC(THERMISTOR_PIN)
+# Thermistor sampled in the background: 8x oversampled, median of 5
+thermistor = ADCSampler([THERMISTOR_PIN], rate_hz=100, oversample=8, smoothing=FILTER_MEDIAN)
+
+# ADC code -> temperature table, built once from the Beta equation
+converter = Thermistor(BETA_VALUE, PULLUP_RESISTANCE, ROOM_TEMP_CELSIUS, PULLUP_RESISTANCE,
+                       step_bits=TABLE_STEP_BITS)
 
 def read_and_display_temperature():
     """Read thermistor and calculate temperature"""
-    # Read raw analog value from thermistor
-    analog_value = thermistor.read_u16()
-    
-    # Calculate temperature using the same logic as reference code
-    # Convert ADC reading to voltage (0-65535 maps to 0-3.3V)
-    voltage = SUPPLY_VOLTAGE * float(analog_value) / ADC_MAX_VALUE
-    
-    # Calculate thermistor resistance using voltage divider formula
-    thermistor_resistance = PULLUP_RESISTANCE * voltage / (SUPPLY_VOLTAGE - voltage)
+    # Latest filtered analog value from the sampler (no waiting)
+    analog_value = thermistor.read()
     
-    # Calculate temperature using Beta equation
-    temp_kelvin = 1.0 / (1.0 / ROOM_TEMP_KELVIN + math.log(thermistor_resistance / PULLUP_RESISTANCE) / BETA_VALUE)
-    temp_celsius = temp_kelvin - KELVIN_OFFSET
+    # Look the temperature up in the table (no log or division per reading)
+    temp_celsius = converter.celsius(analog_value)
     
     # Convert to Fahrenheit
     temp_fahrenheit = (temp_celsius * 1.8) + 32.0
@@ -61,6 +56,8 @@ def main():
     print("=== Digital Thermometer ===")
     print("Reading temperature from thermistor...")
     print()
+    thermistor.start()
+    utime.sleep_ms(100)  # Let the filter fill up
     
     while True:
         # Read temperature and display results
@@ -1,9 +1,12 @@
 import machine
 import utime
+from adc_sampler import ADCSampler, FILTER_EMA
 
-sensor = machine.ADC(28)
+# Sampled in the background and smoothed, so ripples on the water do not jitter
+sensor = ADCSampler([28], rate_hz=200, smoothing=FILTER_EMA)
+sensor.start()
 
 while True:
-    value=sensor.read_u16()
+    value=sensor.read()
     print(value)
     utime.sleep_ms(200)
\ No newline at end of file
@@ -12,8 +12,8 @@ Hardware Requirements:
 """
 
 # Import required libraries
-import machine  # For hardware control (PWM, Pin)
 import utime    # For time delays
+from servo import Servo, ServoGroup, TRAPEZOID  # Timer-driven servo motion
 
 # Hardware Configuration Constants
 SERVO_CONTROL_PIN = 15      # Digital pin connected to servo signal wire
@@ -22,65 +22,31 @@ PWM_FREQUENCY = 50          # Standard servo PWM frequency (50Hz)
 # Movement Constants
 SERVO_MIN_ANGLE = 0         # Minimum servo angle (degrees)
 SERVO_MAX_ANGLE = 180       # Maximum servo angle (degrees)
-SERVO_STEP_DELAY_MS = 15    # Delay between each degree step (milliseconds)
+SWING_DURATION_MS = 2700    # Time for one swing (same pace as 15 ms per degree)
+MOTION_PROFILE = TRAPEZOID  # Speed up, cruise, slow down at each end
 STARTUP_DELAY_MS = 1000     # Initial delay after servo setup (milliseconds)
 
 # PWM pulse width constants for servo control
-MIN_PULSE_WIDTH_MS = 0.5    # Minimum pulse width for 0 degrees (milliseconds)
-MAX_PULSE_WIDTH_MS = 2.5    # Maximum pulse width for 180 degrees (milliseconds)
-PWM_PERIOD_MS = 20          # PWM period for 50Hz (milliseconds)
-
-def interval_mapping(x, in_min, in_max, out_min, out_max):
-    """
-    Map a value from one range to another range
-    
-    Args:
-        x: Input value to be mapped
-        in_min: Minimum value of input range
-        in_max: Maximum value of input range
-        out_min: Minimum value of output range
-        out_max: Maximum value of output range
-    
-    Returns:
-        Mapped value in the output range
-    """
-    return (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
-
-def servo_write(servo_pwm, angle):
-    """
-    Set servo motor to specific angle
-    
-    Args:
-        servo_pwm: PWM object controlling the servo
-        angle: Target angle in degrees (0-180)
-    """
-    # Convert angle to pulse width (0.5ms to 2.5ms)
-    pulse_width = interval_mapping(angle, SERVO_MIN_ANGLE, SERVO_MAX_ANGLE, 
-                                   MIN_PULSE_WIDTH_MS, MAX_PULSE_WIDTH_MS)
-    
-    # Convert pulse width to duty cycle (0-65535 for 16-bit PWM)
-    duty_cycle = int(interval_mapping(pulse_width, 0, PWM_PERIOD_MS, 0, 65535))
-    
-    # Apply duty cycle to servo
-    servo_pwm.duty_u16(duty_cycle)
+MIN_PULSE_WIDTH_US = 500    # Minimum pulse width for 0 degrees (microseconds)
+MAX_PULSE_WIDTH_US = 2500   # Maximum pulse width for 180 degrees (microseconds)
+UPDATE_PERIOD_MS = 20       # Motion update interval, one 50Hz PWM frame
 
 def setup_servo():
     """
     Initialize and setup the servo motor
     
     Returns:
-        PWM object configured for servo control
+        Servo object and the ServoGroup that moves it
     """
     print("Setting up servo motor...")
     
-    # Create PWM object on the servo control pin
-    servo_motor = machine.PWM(machine.Pin(SERVO_CONTROL_PIN))
-    
-    # Set PWM frequency to standard servo frequency (50Hz)
-    servo_motor.freq(PWM_FREQUENCY)
+    # Servo on the control pin at 50Hz, with its angle-to-duty table
+    servo_motor = Servo(SERVO_CONTROL_PIN, MIN_PULSE_WIDTH_US, MAX_PULSE_WIDTH_US,
+                        SERVO_MAX_ANGLE, PWM_FREQUENCY)
+    motion = ServoGroup([servo_motor], UPDATE_PERIOD_MS)
     
     # Move servo to starting position (0 degrees)
-    servo_write(servo_motor, SERVO_MIN_ANGLE)
+    servo_motor.write(SERVO_MIN_ANGLE)
     print(f"Servo positioned at {SERVO_MIN_ANGLE} degrees")
     
     # Wait for servo to reach starting position
@@ -88,41 +54,43 @@ def setup_servo():
     utime.sleep_ms(STARTUP_DELAY_MS)
     
     print("Servo setup complete!")
-    return servo_motor
+    return servo_motor, motion
+
+def wait_for_motion(motion):
+    """
+    Wait until a move has finished
+    
+    The timer moves the servo; this loop is free to do other work.
+    
+    Args:
+        motion: ServoGroup running the move
+    """
+    while motion.moving:
+        utime.sleep_ms(UPDATE_PERIOD_MS)
 
-def swing_servo_forward(servo_motor):
+def swing_servo_forward(motion):
     """
     Swing servo forward from minimum to maximum angle
     
     Args:
-        servo_motor: PWM object controlling the servo
+        motion: ServoGroup controlling the servo
     """
     print(f"Swinging forward: {SERVO_MIN_ANGLE}° to {SERVO_MAX_ANGLE}°")
-    
-    for current_angle in range(SERVO_MIN_ANGLE, SERVO_MAX_ANGLE + 1):
-        # Set servo to current angle position
-        servo_write(servo_motor, current_angle)
-        
-        # Wait for servo to reach position before next step
-        utime.sleep_ms(SERVO_STEP_DELAY_MS)
+    motion.move([SERVO_MAX_ANGLE], SWING_DURATION_MS, profile=MOTION_PROFILE)
+    wait_for_motion(motion)
 
-def swing_servo_backward(servo_motor):
+def swing_servo_backward(motion):
     """
     Swing servo backward from maximum to minimum angle
     
     Args:
-        servo_motor: PWM object controlling the servo
+        motion: ServoGroup controlling the servo
     """
     print(f"Swinging backward: {SERVO_MAX_ANGLE}° to {SERVO_MIN_ANGLE}°")
-    
-    for current_angle in range(SERVO_MAX_ANGLE, SERVO_MIN_ANGLE - 1, -1):
-        # Set servo to current angle position
-        servo_write(servo_motor, current_angle)
-        
-        # Wait for servo to reach position before next step
-        utime.sleep_ms(SERVO_STEP_DELAY_MS)
+    motion.move([SERVO_MIN_ANGLE], SWING_DURATION_MS, profile=MOTION_PROFILE)
+    wait_for_motion(motion)
 
-def perform_swinging_motion(servo_motor):
+def perform_swinging_motion(motion):
     """
     Perform complete swinging motion
     
@@ -131,13 +99,13 @@ def perform_swinging_motion(servo_motor):
     2. Swing back from maximum to minimum angle
     
     Args:
-        servo_motor: PWM object controlling the servo
+        motion: ServoGroup controlling the servo
     """
     # Swing forward: from 0 to 180 degrees
-    swing_servo_forward(servo_motor)
+    swing_servo_forward(motion)
     
     # Swing backward: from 180 to 0 degrees
-    swing_servo_backward(servo_motor)
+    swing_servo_backward(motion)
 
 def main():
     """
@@ -149,7 +117,7 @@ def main():
     print()
     
     # Step 1: Setup the servo motor
-    servo_motor = setup_servo()
+    servo_motor, motion = setup_servo()
     
     try:
         cycle_count = 0
@@ -162,7 +130,7 @@ def main():
             print(f"--- Swing Cycle #{cycle_count} ---")
             
             # Perform complete swinging motion
-            perform_swinging_motion(servo_motor)
+            perform_swinging_motion(motion)
             
             print(f"Cycle #{cycle_count} completed")
             print()
@@ -173,8 +141,8 @@ def main():
         
         # Return servo to center position
         print("Returning servo to center position...")
-        servo_write(servo_motor, 90)
-        utime.sleep_ms(500)
+        motion.move([90], 500, profile=MOTION_PROFILE)
+        wait_for_motion(motion)
         
         # Turn off PWM
         servo_motor.deinit()
@@ -14,6 +14,8 @@ Hardware Requirements:
 # Import required libraries
 import machine  # For hardware control (ADC, Pin)
 import utime    # For time delays
+from adc_sampler import ADCSampler, FILTER_EMA  # Background ADC sampling
+from joystick import Joystick, NAMES  # Calibration, dead zone, directions
 
 # Hardware Configuration Constants
 JOYSTICK_X_PIN = 27             # Joystick X-axis analog pin (VRX)
@@ -24,15 +26,20 @@ JOYSTICK_BUTTON_PIN = 16        # Joystick button digital pin (SW)
 ANALOG_MIN_VALUE = 0            # Minimum analog reading value
 ANALOG_MAX_VALUE = 65535        # Maximum analog reading value (16-bit ADC)
 READING_DELAY_MS = 100          # Delay between readings (milliseconds)
+POLL_DELAY_MS = 10              # Direction polling interval (milliseconds)
+DEAD_ZONE = 150                 # Dead zone radius (of 1000 per half axis)
 
 # Button States
 BUTTON_PRESSED = 0              # Active button state (pulled down when pressed)
 BUTTON_RELEASED = 1             # Inactive button state (pulled up when released)
 
 # Initialize joystick components
-x_joystick = machine.ADC(JOYSTICK_X_PIN)
-y_joystick = machine.ADC(JOYSTICK_Y_PIN)
+# Both axes are sampled round-robin from a timer and smoothed
+X_CHANNEL = 0
+Y_CHANNEL = 1
+axes = ADCSampler([JOYSTICK_X_PIN, JOYSTICK_Y_PIN], rate_hz=400, smoothing=FILTER_EMA, ema_shift=2)
 joystick_button = machine.Pin(JOYSTICK_BUTTON_PIN, machine.Pin.IN, machine.Pin.PULL_UP)
+joystick = None                 # Calibrated joystick, created once sampling runs
 
 def read_x_axis():
     """
@@ -43,7 +50,7 @@ def read_x_axis():
     Returns:
         Raw X-axis value (0-65535)
     """
-    return x_joystick.read_u16()
+    return axes.read(X_CHANNEL)
 
 def read_y_axis_inverted():
     """
@@ -55,7 +62,7 @@ def read_y_axis_inverted():
     Returns:
         Inverted Y-axis value (0-65535)
     """
-    raw_value = y_joystick.read_u16()
+    raw_value = axes.read(Y_CHANNEL)
     # Invert the Y-axis: 65535 - raw_value
     return ANALOG_MAX_VALUE - raw_value
 
@@ -85,8 +92,23 @@ def display_joystick_values():
     y_value = read_y_axis_inverted()
     button_state = read_button_inverted()
     
+    # Calibrated position (-1000..1000, up and right positive)
+    pos_x, pos_y = joystick.read()
+    
     # Display formatted output
-    print(f"X: {x_value} | Y: {y_value} | Button: {button_state}")
+    print(f"X: {x_value} | Y: {y_value} | Pos: ({pos_x}, {pos_y}) | Button: {button_state}")
+
+def create_joystick():
+    """
+    Create the Calibrated Joystick
+    
+    Measures the resting centre, so leave the stick alone at start-up.
+    The extents are learned as the stick is moved.
+    """
+    global joystick
+    joystick = Joystick(lambda: axes.read(X_CHANNEL), lambda: axes.read(Y_CHANNEL),
+                        dead_zone=DEAD_ZONE)
+    print(f"Centre calibrated at X: {joystick.cx} | Y: {joystick.cy}")
 
 def setup_joystick():
     """
@@ -108,6 +130,9 @@ def main():
     """
     # Setup the joystick system
     setup_joystick()
+    axes.start()
+    utime.sleep_ms(50)          # Let the filtered values settle
+    create_joystick()
     
     try:
         print("Starting joystick monitoring...")
@@ -115,14 +140,24 @@ def main():
         print()
         
         # Continuous joystick monitoring loop
+        last_display = utime.ticks_ms()
         while True:
+            # Direction events only arrive when the direction changes
+            direction = joystick.poll()
+            if direction is not None:
+                print(f"Direction: {NAMES[direction]}")
+            
             # Read and display joystick values
-            display_joystick_values()
+            now = utime.ticks_ms()
+            if utime.ticks_diff(now, last_display) >= READING_DELAY_MS:
+                display_joystick_values()
+                last_display = now
             
-            # Wait before next reading
-            utime.sleep_ms(READING_DELAY_MS)
+            # Wait before next poll
+            utime.sleep_ms(POLL_DELAY_MS)
             
     except KeyboardInterrupt:
+        axes.stop()
         print("\nJoystick monitoring stopped by user")
         print("Joystick controller deactivated")
 
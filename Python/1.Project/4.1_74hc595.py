@@ -8,8 +8,8 @@ a continuous mesmerizing water-like animation.
 Hardware: 74HC595 shift register + 8 LEDs with current limiting resistors
 """
 
-import machine
 import time
+from hc595 import HC595
 
 # 74HC595 Pin Configuration Constants
 DATA_PIN = 0        # DS (Serial Data Input) - pin 14 of 74HC595
@@ -24,9 +24,7 @@ class HC595FlowingLED:
     
     def __init__(self):
         """Initialize 74HC595 control pins"""
-        self.data_pin = machine.Pin(DATA_PIN, machine.Pin.OUT)
-        self.latch_pin = machine.Pin(LATCH_PIN, machine.Pin.OUT)
-        self.clock_pin = machine.Pin(CLOCK_PIN, machine.Pin.OUT)
+        self.shift_register = HC595(DATA_PIN, CLOCK_PIN, LATCH_PIN)
         
         # Smooth Flowing LED Patterns
         self.flow_patterns = [
@@ -58,26 +56,7 @@ class HC595FlowingLED:
         Update Shift Register
         Sends data to 74HC595 and latches the output.
         """
-        self.latch_pin.low()                           # Prepare for data
-        self.shift_out_msb_first(pattern)              # Send 8 bits
-        self.latch_pin.high()                          # Latch data to outputs
-    
-    def shift_out_msb_first(self, data):
-        """
-        Shift out data MSB first (Most Significant Bit first)
-        Equivalent to Arduino's shiftOut() function
-        """
-        for bit in range(7, -1, -1):  # Start from bit 7 down to bit 0
-            self.clock_pin.low()
-            time.sleep_ms(1)
-            
-            # Extract the bit value
-            bit_value = (data >> bit) & 1
-            self.data_pin.value(bit_value)
-            time.sleep_ms(1)
-            
-            self.clock_pin.high()
-            time.sleep_ms(1)
+        self.shift_register.write_byte(pattern)          # Shift 8 bits, latch once
     
     def run_smooth_flowing_animation(self):
         """
@@ -8,8 +8,8 @@ continuously for educational and debugging purposes.
 Hardware: 74HC595 shift register + Common Cathode 7-segment display
 """
 
-import machine
 import time
+from hc595 import HC595
 
 # 74HC595 Pin Configuration Constants
 DATA_PIN = 0        # DS (Serial Data Input) - pin 14 of 74HC595
@@ -24,9 +24,7 @@ class SevenSegmentHexDisplay:
     
     def __init__(self):
         """Initialize 74HC595 control pins and display patterns"""
-        self.data_pin = machine.Pin(DATA_PIN, machine.Pin.OUT)
-        self.latch_pin = machine.Pin(LATCH_PIN, machine.Pin.OUT)
-        self.clock_pin = machine.Pin(CLOCK_PIN, machine.Pin.OUT)
+        self.shift_register = HC595(DATA_PIN, CLOCK_PIN, LATCH_PIN)
         
         # 7-Segment Display Patterns for Hexadecimal Digits (0-F)
         # Pattern format: gfedcba (bit 7 unused, bits 6-0 control segments)
@@ -62,26 +60,7 @@ class SevenSegmentHexDisplay:
         Update Display
         Sends pattern data to 74HC595 and updates the 7-segment display.
         """
-        self.latch_pin.low()                           # Prepare for data transmission
-        self.shift_out_msb_first(pattern)              # Send 8-bit pattern
-        self.latch_pin.high()                          # Latch data to display
-    
-    def shift_out_msb_first(self, data):
-        """
-        Shift out data MSB first (Most Significant Bit first)
-        Equivalent to Arduino's shiftOut() function
-        """
-        for bit in range(7, -1, -1):  # Start from bit 7 down to bit 0
-            self.clock_pin.low()
-            time.sleep_ms(1)
-            
-            # Extract the bit value
-            bit_value = (data >> bit) & 1
-            self.data_pin.value(bit_value)
-            time.sleep_ms(1)
-            
-            self.clock_pin.high()
-            time.sleep_ms(1)
+        self.shift_register.write_byte(pattern)          # Shift 8 bits, latch once
     
     def display_hexadecimal_sequence(self):
         """
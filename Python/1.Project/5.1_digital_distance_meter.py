@@ -6,12 +6,13 @@ Ultrasonic ranging with HC-SR04 (MicroPython)
 This refactor keeps the original functionality while improving readability:
 - English comments and prints
 - Replaces magic numbers with constants
-- Adds timeouts to avoid infinite loops
+- Echo timing runs in a PIO state machine (see ultrasonic.py), so the
+  main loop never busy-waits on the echo pin
 - Simple, beginner-friendly structure
 """
 
-import machine
 import time
+from ultrasonic import Ultrasonic
 
 
 # =========================
@@ -20,73 +21,28 @@ import time
 TRIGGER_PIN = 17
 ECHO_PIN = 16
 
-TRIGGER_PULSE_US = 10
-SETTLE_DELAY_US = 2
+PING_PERIOD_MS = 60       # One ping per period, timed by PIO in the background
+FILTER_WINDOW = 5         # Median of the last 5 echoes
 MEASURE_INTERVAL_MS = 300
 
-TIMEOUT_US = 100_000  # 0.1s timeout to avoid getting stuck
-
-# Speed of sound: 340 m/s = 34,000 cm/s = 0.034 cm/us
-SPEED_OF_SOUND_CM_PER_US = 0.034
-
-
-class UltrasonicSensor:
-    """HC-SR04 distance measurement helper (MicroPython)."""
-
-    def __init__(self, trigger_pin: int, echo_pin: int) -> None:
-        self.trigger = machine.Pin(trigger_pin, machine.Pin.OUT)
-        self.echo = machine.Pin(echo_pin, machine.Pin.IN)
-
-        # Ensure trigger starts low and sensor is settled
-        self.trigger.low()
-        time.sleep_ms(50)
-
-    def _send_trigger_pulse(self) -> None:
-        """Send a 10us trigger pulse to start measurement."""
-        self.trigger.low()
-        time.sleep_us(SETTLE_DELAY_US)
-        self.trigger.high()
-        time.sleep_us(TRIGGER_PULSE_US)
-        self.trigger.low()
-
-    def measure_distance_cm(self) -> float:
-        """Measure distance in centimeters; return -1 on timeout."""
-        self._send_trigger_pulse()
-
-        # Wait for echo to go high (start)
-        start_wait = time.ticks_us()
-        while self.echo.value() == 0:
-            if time.ticks_diff(time.ticks_us(), start_wait) > TIMEOUT_US:
-                return -1
-
-        pulse_start = time.ticks_us()
-
-        # Wait for echo to go low (end)
-        while self.echo.value() == 1:
-            if time.ticks_diff(time.ticks_us(), pulse_start) > TIMEOUT_US:
-                return -1
-
-        pulse_end = time.ticks_us()
-        duration_us = time.ticks_diff(pulse_end, pulse_start)
-
-        # Distance = (duration_us * speed_of_sound_cm_per_us) / 2
-        distance_cm = (duration_us * SPEED_OF_SOUND_CM_PER_US) / 2.0
-        return distance_cm
-
 
 def main() -> None:
-    sensor = UltrasonicSensor(TRIGGER_PIN, ECHO_PIN)
+    sensor = Ultrasonic([(TRIGGER_PIN, ECHO_PIN)], PING_PERIOD_MS, FILTER_WINDOW)
+    sensor.start()
     print("Starting measurements. Press Ctrl+C to stop.")
     try:
         while True:
-            distance_cm = sensor.measure_distance_cm()
+            # Returns the latest filtered reading at once; nothing blocks here
+            distance_cm = sensor.distance_cm()
             if distance_cm >= 0:
                 print("Distance: %.2f cm" % distance_cm)
             else:
-                print("Measurement failed (timeout). Check sensor wiring and range.")
+                print("No echo (out of range). Check sensor wiring and range.")
             time.sleep_ms(MEASURE_INTERVAL_MS)
     except KeyboardInterrupt:
         print("Measurement stopped by user.")
+    finally:
+        sensor.deinit()
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@
 import machine
 import time
 import sys
+from ultrasonic import Ultrasonic
+from alert import AlertPlayer, beep
 
 # --- Configuration ---
 # Hardware Pins
@@ -21,6 +23,13 @@ DANGER_ZONE_CM = 20   # Less than this is DANGER
 WARNING_ZONE_CM = 50  # Less than this is WARNING
 # Anything above WARNING_ZONE_CM is considered SAFE.
 
+# Alert patterns: (freq, level, ms) steps; an active buzzer only uses on/off
+DANGER_PATTERN = beep(70, 70)    # Fast, continuous beeps
+WARNING_PATTERN = beep(100, 300) # Slower, intermittent beeps
+
+CHECK_INTERVAL_MS = 60  # Re-check the zone at the ranging rate
+PRINT_INTERVAL_MS = 500
+
 class ReversingAlarmSystem:
     """
     Manages all functionality for the reversing alarm system.
@@ -29,88 +38,62 @@ class ReversingAlarmSystem:
         """Initializes all hardware components."""
         print("🔧 Initializing Reversing Alarm System...")
         
-        self.trig = machine.Pin(TRIG_PIN, machine.Pin.OUT)
-        self.echo = machine.Pin(ECHO_PIN, machine.Pin.IN)
+        # Pings and echo timing run in the background (PIO + timer)
+        self.ranger = Ultrasonic([(TRIG_PIN, ECHO_PIN)])
         self.buzzer = machine.Pin(BUZZER_PIN, machine.Pin.OUT)
         self.led = machine.Pin(LED_PIN, machine.Pin.OUT)
+        # Patterns play from a timer, so a zone change is heard at once
+        self.alert = AlertPlayer(self.buzzer, self.led)
+        self.zone = None
+        self.last_print = time.ticks_ms()
         
         self.cleanup() # Ensure all outputs are off initially
         print("✅ System Ready. Press Ctrl+C to exit.")
 
     def measure_distance(self):
         """
-        Measures distance using the HC-SR04 sensor.
-        Returns the distance in centimeters, or -1 on timeout.
+        Returns the latest filtered distance in centimeters, or -1 when
+        no echo came back. Does not wait for the sensor.
         """
-        # Send a 10µs trigger pulse
-        self.trig.low()
-        time.sleep_us(2)
-        self.trig.high()
-        time.sleep_us(10)
-        self.trig.low()
-
-        # Wait for the echo pulse to start, with a timeout
-        # This prevents the program from getting stuck if the sensor is disconnected.
-        timeout_us = 30000 # 30ms, corresponds to ~5 meters, well beyond our needs.
-        start_time = time.ticks_us()
-        while not self.echo.value():
-            if time.ticks_diff(time.ticks_us(), start_time) > timeout_us:
-                return -1 # Timeout error
-
-        pulse_start = time.ticks_us()
-
-        # Wait for the echo pulse to end, with a timeout
-        while self.echo.value():
-            if time.ticks_diff(time.ticks_us(), pulse_start) > timeout_us:
-                return -1 # Timeout error
-
-        pulse_end = time.ticks_us()
-
-        # Calculate distance: (pulse_duration * speed_of_sound) / 2
-        # Speed of sound is ~343 m/s or 34,300 cm/s or 0.0343 cm/µs
-        pulse_duration = time.ticks_diff(pulse_end, pulse_start)
-        distance_cm = (pulse_duration * 0.0343) / 2
-        
-        return distance_cm
+        return self.ranger.distance_cm()
 
     def play_alert(self, distance):
         """
-        Plays a specific alert pattern on the LED and buzzer based on the distance.
+        Switches the LED and buzzer to the pattern for the distance zone.
+        Returns immediately; the pattern keeps playing in the background.
         """
         if distance < 0:
-            print("Sensor timeout. Check wiring.")
-            time.sleep(0.5)
-            return
+            zone, pattern = "none", None
+        elif distance <= DANGER_ZONE_CM:
+            zone, pattern = "danger", DANGER_PATTERN
+        elif distance <= WARNING_ZONE_CM:
+            zone, pattern = "warning", WARNING_PATTERN
+        else:
+            # SAFE ZONE: No sound, LED off
+            zone, pattern = "safe", None
+
+        if pattern is None:
+            self.alert.stop()
+        else:
+            self.alert.play(pattern) # No restart if it is already playing
 
-        if distance <= DANGER_ZONE_CM:
-            # DANGER ZONE: Fast, continuous beeps
+        now = time.ticks_ms()
+        if zone == self.zone and time.ticks_diff(now, self.last_print) < PRINT_INTERVAL_MS:
+            return
+        self.zone = zone
+        self.last_print = now
+        if zone == "none":
+            print("No echo. Check wiring.")
+        elif zone == "danger":
             print(f"🚨 DANGER!  Distance: {distance:.1f} cm")
-            self.led.high()
-            self.buzzer.high()
-            time.sleep(0.07)
-            self.led.low()
-            self.buzzer.low()
-            time.sleep(0.07)
-        
-        elif distance <= WARNING_ZONE_CM:
-            # WARNING ZONE: Slower, intermittent beeps
+        elif zone == "warning":
             print(f"⚠️ WARNING! Distance: {distance:.1f} cm")
-            self.led.high()
-            self.buzzer.high()
-            time.sleep(0.1)
-            self.led.low()
-            self.buzzer.low()
-            time.sleep(0.3) # Longer pause
-            
         else:
-            # SAFE ZONE: No sound, solid LED for feedback
             print(f"✅ SAFE.    Distance: {distance:.1f} cm")
-            self.led.low() # Or you could turn it on to show it's "active"
-            self.buzzer.low()
-            time.sleep(0.5) # Longer delay in the safe zone
 
     def cleanup(self):
         """Turns off all hardware outputs to ensure a safe state."""
+        self.alert.stop()
         self.buzzer.low()
         self.led.low()
 
@@ -122,9 +105,12 @@ class ReversingAlarmSystem:
         print(f"   - ⚠️ Warning: < {WARNING_ZONE_CM} cm")
         print("="*40 + "\n")
 
+        self.ranger.start()
+        time.sleep_ms(100) # Let the first echoes come in
         while True:
             distance = self.measure_distance()
             self.play_alert(distance)
+            time.sleep_ms(CHECK_INTERVAL_MS)
             
 def main():
     """Main function to start the application."""
@@ -135,6 +121,7 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Program interrupted by user.")
     finally:
+        alarm_system.ranger.deinit()
         alarm_system.cleanup()
         print("🧹 System shut down. All outputs are off.")
 
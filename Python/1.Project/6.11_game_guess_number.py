@@ -8,6 +8,7 @@
 # - Provides a clearer and more interactive user experience on the LCD.
 
 from lcd1602 import LCD
+from keypad import Keypad, PRESS
 from machine import I2C, Pin
 import time
 import urandom
@@ -39,20 +40,15 @@ class GuessTheNumberGame:
         # Hardware
         self.i2c = I2C(0, sda=Pin(LCD_SDA_PIN), scl=Pin(LCD_SCL_PIN), freq=400000)
         self.lcd = LCD(self.i2c)
-        self.row_pins = [Pin(p, Pin.OUT) for p in ROW_PINS]
-        # **CRITICAL FIX**: Initialize column pins with internal pull-down resistors.
-        self.col_pins = [Pin(p, Pin.IN, Pin.PULL_DOWN) for p in COL_PINS]
+        # Keypad driver: column pins use internal pull-downs and wake the
+        # scanner by interrupt; key presses are debounced and queued.
+        self.keypad = Keypad(ROW_PINS, COL_PINS, KEYPAD_LAYOUT, debounce_ms=30)
         
         # Game State
         self.target_number = 0
         self.upper_bound = 99
         self.lower_bound = 0
         self.current_guess_str = ""
-        
-        # Keypad State Management
-        self.last_key_pressed = None
-        self.last_key_time = 0
-        self.debounce_delay_ms = 200 # Debounce delay to prevent multiple presses
 
     def reset_game(self):
         """Resets the game to a new round."""
@@ -63,38 +59,17 @@ class GuessTheNumberGame:
         print(f"New game started. Secret number is: {self.target_number}") # For debugging
         self.update_lcd_display("Guess the number!", f"{self.lower_bound} < ? < {self.upper_bound}")
 
-    def scan_keypad(self):
-        """
-        Scans the keypad for a single key press.
-        Returns the character of the pressed key or None.
-        """
-        for r, row_pin in enumerate(self.row_pins):
-            row_pin.high()
-            for c, col_pin in enumerate(self.col_pins):
-                if col_pin.value() == 1:
-                    row_pin.low() # Reset the row pin
-                    return KEYPAD_LAYOUT[r][c]
-            row_pin.low()
-        return None
-
     def get_key_press(self):
         """
-        Gets a single, debounced key press from the keypad.
+        Gets the next key press from the keypad's event queue.
         Returns the key character or None if no new key is pressed.
         """
-        key = self.scan_keypad()
-        current_time = time.ticks_ms()
-        
-        if key is not None:
-            # Check if this key is different from the last one OR if enough time has passed
-            if key != self.last_key_pressed or time.ticks_diff(current_time, self.last_key_time) > self.debounce_delay_ms:
-                self.last_key_pressed = key
-                self.last_key_time = current_time
+        event = self.keypad.get()
+        while event:
+            kind, key = event
+            if kind == PRESS:
                 return key
-        else:
-            # If no key is pressed, reset the last key state
-            self.last_key_pressed = None
-            
+            event = self.keypad.get() # Skip release / long-press events
         return None
 
     def process_guess(self):
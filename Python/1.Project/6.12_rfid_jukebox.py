@@ -10,6 +10,12 @@ from ws2812 import WS2812
 import machine
 import time
 import urandom
+try:
+    # Optional song library (songs.bin from the iot examples)
+    from song_library import SongLibrary
+    from melody import play
+except ImportError:
+    SongLibrary = None
 
 # --- Configuration ---
 # Hardware Pins
@@ -57,6 +63,15 @@ class RFIDJukebox:
         # Buzzer (PWM)
         self.buzzer = machine.PWM(machine.Pin(BUZZER_PIN))
         
+        # Song library - cards may also hold a song name (e.g. "nokia")
+        self.library = None
+        if SongLibrary:
+            try:
+                self.library = SongLibrary()
+                print(f"🎼 Song library: {', '.join(self.library.names())}")
+            except OSError:
+                print("ℹ️ songs.bin not found, playing note cards only.")
+        
         self.cleanup() # Ensure all outputs are off
         print("✅ Jukebox Ready! Please scan a card.")
 
@@ -96,6 +111,14 @@ class RFIDJukebox:
             print("Card is empty. Nothing to play.")
             return
             
+        song_name = text.strip().lower()
+        if self.library and song_name in self.library:
+            # Loaded from flash only now, while it is being played
+            print(f"🎵 Playing song: \"{song_name}\"")
+            play(self.buzzer, self.library.melody(song_name))
+            print("✅ Song finished.")
+            return
+            
         print(f"🎵 Playing score: \"{text}\"")
         clean_text = text.replace(' ', '').upper()
         
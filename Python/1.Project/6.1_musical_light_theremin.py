@@ -21,6 +21,7 @@ Hardware Requirements:
 
 import machine
 import utime
+from adc_sampler import ADCSampler, FILTER_EMA
 
 # Hardware pin definitions
 LED_PIN = 16                # Status LED pin
@@ -61,7 +62,7 @@ TOTAL_NOTES = len(THEREMIN_NOTES)   # Total number of available musical notes
 
 # Initialize hardware components
 led = machine.Pin(LED_PIN, machine.Pin.OUT)        # Status indicator LED
-photoresistor = machine.ADC(PHOTORESISTOR_PIN)     # Light level sensor
+photoresistor = ADCSampler([PHOTORESISTOR_PIN], rate_hz=200, smoothing=FILTER_EMA)  # Light level, sampled in the background
 buzzer = machine.PWM(machine.Pin(BUZZER_PIN))      # PWM-controlled buzzer
 
 # System state variables for operation
@@ -147,7 +148,7 @@ def read_light_sensor():
     Returns:
         Integer ADC value (0-65535 for 16-bit ADC)
     """
-    return photoresistor.read_u16()
+    return photoresistor.read()  # Latest smoothed value, no waiting
 
 def calibrate_light_sensor():
     """
@@ -206,6 +207,9 @@ def play_startup_melody():
 print("=== Musical Light Theremin v2.0 ===")
 print("Enhanced with standard musical notes!")
 
+photoresistor.start()
+utime.sleep_ms(50)  # Let the filter settle
+
 # Perform light sensor calibration to establish musical range
 calibrate_light_sensor()
 
@@ -248,6 +252,7 @@ except Exception as e:
 finally:
     # Critical: Always stop buzzer when program ends to prevent continuous noise
     print("Stopping buzzer...")
+    photoresistor.stop()
     stop_buzzer()
     led.value(0)  # Turn off status LED
     print("Theremin safely stopped")
\ No newline at end of file
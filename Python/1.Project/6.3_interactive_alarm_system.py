@@ -1,5 +1,6 @@
 import machine
 import time
+from alert import AlertPlayer, pattern, beep, ramp
 
 # Hardware Pin Constants
 BUZZER_PIN = 15
@@ -14,6 +15,7 @@ BUZZER_DUTY_CYCLE = 30000
 EFFECT_STEPS = 100
 EFFECT_INCREMENT = 2
 EFFECT_DELAY_MS = 10
+CHECK_INTERVAL_MS = 20   # How often the main loop looks at the switch
 
 # Sound Frequency Range
 MIN_FREQUENCY = 130
@@ -34,77 +36,33 @@ led = machine.PWM(machine.Pin(LED_PIN))
 led.freq(LED_PWM_FREQUENCY)
 switch = machine.Pin(SWITCH_PIN, machine.Pin.IN)
 
+# Buzzer and LED patterns are stepped by a timer in the background
+alert = AlertPlayer(buzzer, led, duty=BUZZER_DUTY_CYCLE)
+
 # Global variables
 alarm_active = False
 alarm_mode = MODE_SWEEP
 
-def stop_buzzer(pwm_pin):
-    """Turn off the buzzer by setting duty cycle to zero"""
-    pwm_pin.duty_u16(0)
-
-def play_tone(pwm_pin, frequency):
-    """Play a tone at specified frequency on the buzzer"""
-    pwm_pin.freq(frequency)
-    pwm_pin.duty_u16(BUZZER_DUTY_CYCLE)
-
-def map_value(x, in_min, in_max, out_min, out_max):
-    """Map a value from one range to another"""
-    return (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
-
-def sweep_alarm_effect():
-    """Create a sweeping alarm effect with gradual frequency and brightness change"""
-    for step in range(0, EFFECT_STEPS, EFFECT_INCREMENT):
-        if not alarm_active:
-            break
-        
-        # Calculate LED brightness and buzzer frequency
-        brightness = int(map_value(step, 0, EFFECT_STEPS, MIN_BRIGHTNESS, MAX_BRIGHTNESS))
-        frequency = int(map_value(step, 0, EFFECT_STEPS, MIN_FREQUENCY, MAX_FREQUENCY))
-        
-        # Apply effects
-        led.duty_u16(brightness)
-        play_tone(buzzer, frequency)
-        time.sleep_ms(EFFECT_DELAY_MS)
-
-def pulse_alarm_effect():
-    """Create a pulsing alarm effect with on/off cycles"""
-    # High intensity pulse
-    led.duty_u16(MAX_BRIGHTNESS)
-    play_tone(buzzer, MAX_FREQUENCY)
-    time.sleep_ms(200)
-    
-    # Off period
-    led.duty_u16(MIN_BRIGHTNESS)
-    stop_buzzer(buzzer)
-    time.sleep_ms(100)
-
-def rapid_alarm_effect():
-    """Create a rapid flashing alarm effect"""
-    # Quick flash sequence
-    for _ in range(5):
-        if not alarm_active:
-            break
-        led.duty_u16(MAX_BRIGHTNESS)
-        play_tone(buzzer, MIN_FREQUENCY + MAX_FREQUENCY // 2)
-        time.sleep_ms(50)
-        
-        led.duty_u16(MIN_BRIGHTNESS)
-        stop_buzzer(buzzer)
-        time.sleep_ms(50)
+# Effects as timing tables of (frequency, brightness, ms) steps
+# Sweep: frequency and brightness rise together in small steps
+SWEEP_PATTERN = ramp(MIN_FREQUENCY, MAX_FREQUENCY, MIN_BRIGHTNESS, MAX_BRIGHTNESS,
+                     EFFECT_STEPS // EFFECT_INCREMENT, EFFECT_DELAY_MS)
+# Pulse: high intensity pulse, then an off period
+PULSE_PATTERN = pattern((MAX_FREQUENCY, MAX_BRIGHTNESS, 200), (0, MIN_BRIGHTNESS, 100))
+# Rapid: quick flashes
+RAPID_PATTERN = beep(50, 50, MIN_FREQUENCY + MAX_FREQUENCY // 2, MAX_BRIGHTNESS)
+# Startup confirmation beep, played once before the effect
+STARTUP_BEEP = pattern((1000, MAX_BRIGHTNESS // 2, 100), (0, MIN_BRIGHTNESS, 50))
+
+ALARM_PATTERNS = [SWEEP_PATTERN, PULSE_PATTERN, RAPID_PATTERN]
 
 def run_alarm_effect():
-    """Execute the appropriate alarm effect based on current mode"""
-    if alarm_mode == MODE_SWEEP:
-        sweep_alarm_effect()
-    elif alarm_mode == MODE_PULSE:
-        pulse_alarm_effect()
-    elif alarm_mode == MODE_RAPID:
-        rapid_alarm_effect()
+    """Play the effect for the current mode (keeps it running if it already is)"""
+    alert.play(ALARM_PATTERNS[alarm_mode], intro=STARTUP_BEEP)
 
 def turn_off_alarm():
     """Turn off both buzzer and LED"""
-    stop_buzzer(buzzer)
-    led.duty_u16(MIN_BRIGHTNESS)
+    alert.stop()
 
 def display_mode_selection():
     """Display mode selection menu"""
@@ -134,9 +92,7 @@ def select_alarm_mode():
                 print(f"\n✓ Mode selected: {mode} ({mode_names[mode]})")
                 
                 # Mode confirmation beep
-                play_tone(buzzer, 500 + mode * 200)
-                time.sleep_ms(200)
-                stop_buzzer(buzzer)
+                alert.play(pattern((500 + mode * 200, 0, 200)), repeat=False)
                 
                 print(f"Alarm system is ready in {mode_names[mode]} mode!")
                 print("Toggle the switch to activate the alarm.")
@@ -159,18 +115,11 @@ def switch_interrupt_handler(pin):
     alarm_active = pin.value()
     mode_names = ["Sweep", "Pulse", "Rapid"]
     
+    # Only record the state; the main loop switches the pattern at once
     if alarm_active:
         print(f"🚨 Alarm activated - Mode: {mode_names[alarm_mode]}")
-        
-        # Startup confirmation beep
-        play_tone(buzzer, 1000)
-        led.duty_u16(MAX_BRIGHTNESS // 2)
-        time.sleep_ms(100)
-        turn_off_alarm()
-        time.sleep_ms(50)
     else:
         print("✅ Alarm deactivated")
-        turn_off_alarm()
 
 # Main program starts here
 def main():
@@ -187,14 +136,18 @@ def main():
     
     print("🔄 System running... (Press Ctrl+C to exit)")
     
+    running = False
     try:
         # Main program loop
         while True:
-            if alarm_active:
-                run_alarm_effect()
-            else:
-                turn_off_alarm()
-                time.sleep_ms(50)  # Small delay when inactive
+            # React to the switch at once; the pattern runs on by itself
+            if alarm_active != running:
+                running = alarm_active
+                if running:
+                    run_alarm_effect()
+                else:
+                    turn_off_alarm()
+            time.sleep_ms(CHECK_INTERVAL_MS)
                 
     except KeyboardInterrupt:
         print("\n\n👋 Program stopped by user")
@@ -6,6 +6,8 @@ LEDs: GP7=Red, GP8=Yellow, GP9=Green
 """
 
 from machine import Pin, Timer
+from hc595 import HC595
+from segment_display import SegmentDisplay
 import time
 
 # ---------- CONSTANTS ----------
@@ -20,11 +22,9 @@ DIGIT_PINS = (10, 13, 12, 11)
 # LED pins (Red, Yellow, Green)
 LED_PINS = (7, 8, 9)
 
-# segment patterns 0-9 (abcdefgdp)
-SEGMENTS = (
-    0x3F, 0x06, 0x5B, 0x4F, 0x66,
-    0x6D, 0x7D, 0x07, 0x7F, 0x6F
-)
+# display refresh (timer driven) and on-time per digit in percent
+REFRESH_HZ = 100
+BRIGHTNESS = 80
 
 # light durations [Green, Yellow, Red] in seconds
 DURATIONS = (30, 5, 30)
@@ -32,28 +32,15 @@ DURATIONS = (30, 5, 30)
 # ---------- 7-SEGMENT DISPLAY ----------
 class Display:
     def __init__(self):
-        self.sdi   = Pin(SDI_PIN, Pin.OUT)
-        self.rclk  = Pin(RCLK_PIN, Pin.OUT)
-        self.srclk = Pin(SRCLK_PIN, Pin.OUT)
-        self.digit = [Pin(p, Pin.OUT) for p in DIGIT_PINS]
-        for d in self.digit:
-            d.value(1)           # all digits OFF
-
-    def _shift_out(self, byte):
-        self.rclk(0)
-        for bit in range(7, -1, -1):
-            self.srclk(0)
-            self.sdi((byte >> bit) & 1)
-            self.srclk(1)
-        self.rclk(1)
+        self.hc595 = HC595(SDI_PIN, SRCLK_PIN, RCLK_PIN)
+        self.segments = SegmentDisplay(self.hc595, DIGIT_PINS, REFRESH_HZ, BRIGHTNESS)
+        self.segments.start()            # refreshed from a timer
+        self.value = None
 
     def show(self, value):
-        for pos in range(4):
-            self.digit[pos](0)               # enable digit
-            digit = (value // 10**pos) % 10
-            self._shift_out(SEGMENTS[digit])
-            time.sleep_us(500)               # small delay for brightness
-            self.digit[pos](1)               # disable digit
+        if value != self.value:          # only touch the buffer on a change
+            self.segments.show_number(value)
+            self.value = value
 
 # ---------- TRAFFIC LIGHT ----------
 class TrafficLight:
@@ -86,4 +73,5 @@ Timer(period=1000, mode=Timer.PERIODIC, callback=timer_cb)
 
 while True:
     display.show(counter)
-    light.set(state)
\ No newline at end of file
+    light.set(state)
+    time.sleep_ms(50)
\ No newline at end of file
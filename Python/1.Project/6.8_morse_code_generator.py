@@ -5,25 +5,18 @@
 from machine import Pin, PWM
 import time
 import sys
+from morse import MORSE_CODE, MorseTransmitter, MorseDecoder, encode, to_string, duration_ms
 
 # --- Configuration ---
 BUZZER_PIN = 15      # Pin for the buzzer
 LED_PIN = 14         # Pin for the LED
+KEY_PIN = 16         # Optional button (to 3V3) or light sensor for 'listen'
 DOT_DURATION = 0.15  # Base time unit for a dot (seconds)
+TONE_FREQUENCY = 1000  # Buzzer pitch (Hz)
+QUEUE_SIZE = 4       # Messages that can wait while one is playing
 
 # --- Morse Code Dictionary (Standard Notation) ---
-MORSE_DICTIONARY = {
-    'A': '.-',   'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.',
-    'F': '..-.', 'G': '--.',  'H': '....', 'I': '..',  'J': '.---',
-    'K': '-.-',  'L': '.-..', 'M': '--',   'N': '-.',  'O': '---',
-    'P': '.--.', 'Q': '--.-', 'R': '.-.',  'S': '...', 'T': '-',
-    'U': '..-',  'V': '...-', 'W': '.--',  'X': '-..-', 'Y': '-.--',
-    'Z': '--..',
-    '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-',
-    '5': '.....', '6': '-....', '7': '--...', '8': '---..', '9': '----.',
-    '?': '..--..', '/': '-..-.', ',': '--..--', '.': '.-.-.-',
-    ';': '-.-.-.', '!': '-.-.--', '@': '.--.-.', ':': '---...'
-}
+MORSE_DICTIONARY = MORSE_CODE
 
 class MorseCodeGenerator:
     """
@@ -31,60 +24,45 @@ class MorseCodeGenerator:
     """
     def __init__(self, led_pin, buzzer_pin, dot_duration):
         """Initializes the generator and hardware."""
-        self.dot_duration = dot_duration
-        self.dash_duration = dot_duration * 3  # A dash is 3x a dot
-        self.symbol_pause = dot_duration       # Pause between dots/dashes is 1x dot
-        self.letter_pause = dot_duration * 3   # Pause between letters is 3x dot
-        self.word_pause = dot_duration * 7     # Pause between words is 7x dot
+        self.unit_ms = int(dot_duration * 1000)  # Every timing is a multiple of a dot
 
         self.led = Pin(led_pin, Pin.OUT)
         self.buzzer = PWM(Pin(buzzer_pin))
-        self.buzzer.freq(1000)  # Set a pleasant frequency
+        # Messages are compiled to timing tables and streamed from a timer,
+        # so the prompt is back at once and further messages queue up
+        self.transmitter = MorseTransmitter(self.led, self.buzzer, self.unit_ms,
+                                            TONE_FREQUENCY, queue_size=QUEUE_SIZE)
         self.cleanup() # Ensure outputs are off
 
-    def signal_on(self):
-        """Turns the LED and Buzzer on."""
-        self.led.value(1)
-        self.buzzer.duty_u16(32768)  # 50% duty cycle for sound
-
     def signal_off(self):
-        """Turns the LED and Buzzer off."""
-        self.led.value(0)
-        self.buzzer.duty_u16(0)
-
-    def play_signal(self, duration):
-        """Plays a signal (dot or dash) for a given duration."""
-        self.signal_on()
-        time.sleep(duration)
-        self.signal_off()
-        time.sleep(self.symbol_pause)
+        """Stops sending, empties the queue and turns the LED and Buzzer off."""
+        self.transmitter.stop()
 
     def play_morse_message(self, message):
-        """Converts and plays an entire message in Morse code."""
-        print(f"\n🎵 Playing Morse code for: \"{message}\"")
-        print("--- Morse Code Output ---")
-        
-        for char in message.upper():
-            if char == ' ':
-                print("   (space)")
-                time.sleep(self.word_pause - self.letter_pause) # Account for upcoming letter pause
-                continue
-
-            pattern = MORSE_DICTIONARY.get(char)
-            if pattern is None:
-                print(f"⚠️ Character '{char}' not supported, skipping.")
-                continue
-
-            print(f"📡 {char} -> {pattern}")
-            for symbol in pattern:
-                if symbol == '.':
-                    self.play_signal(self.dot_duration)
-                elif symbol == '-':
-                    self.play_signal(self.dash_duration)
-            
-            time.sleep(self.letter_pause - self.symbol_pause) # Pause between letters
-
-        print("✅ Transmission complete!\n")
+        """Compiles a message and queues it for playback."""
+        elements = encode(message)
+        if not elements:
+            print("⚠️ Nothing to send (no supported characters).")
+            return
+        print(f"\n🎵 Queued: \"{message}\"")
+        print(f"📡 {to_string(elements)}  ({duration_ms(elements, self.unit_ms) / 1000:.1f} s)")
+        if not self.transmitter.send(message):
+            print("⚠️ Queue full, message dropped. Try again shortly.")
+
+    def listen(self):
+        """Decodes Morse keyed on KEY_PIN until Ctrl+C."""
+        print(f"\n👂 Listening on GP{KEY_PIN}... (Press Ctrl+C to stop)")
+        decoder = MorseDecoder(KEY_PIN, self.unit_ms, pull=Pin.PULL_DOWN)
+        try:
+            while True:
+                text = decoder.read()
+                if text:
+                    print(text, end="")
+                time.sleep_ms(50)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            decoder.deinit()
 
     def display_morse_chart(self):
         """Displays a formatted Morse code reference chart."""
@@ -111,16 +89,19 @@ class MorseCodeGenerator:
         print("\n🎯 Morse Code Generator is Active!")
         print("   - Type a message and press Enter to play.")
         print("   - Type 'chart' to display the Morse code reference.")
+        print(f"   - Type 'listen' to decode Morse keyed on GP{KEY_PIN}.")
         print("   - Press Ctrl+C to exit.\n")
         
         while True:
             try:
-                message = input("💬 Enter message (or 'chart'): ").strip()
+                message = input("💬 Enter message (or 'chart' / 'listen'): ").strip()
                 if not message:
                     continue
                 
                 if message.lower() == 'chart':
                     self.display_morse_chart()
+                elif message.lower() == 'listen':
+                    self.listen()
                 else:
                     self.play_morse_message(message)
             
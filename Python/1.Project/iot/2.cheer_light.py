@@ -1,48 +1,110 @@
 """
 CheerLights Global Color Synchronization
 Simple project to sync LED colors worldwide
+
+Colors arrive over the CheerLights MQTT feed when the broker is reachable,
+so changes show up immediately. Otherwise the ThingSpeak feed is polled
+with conditional requests and the strip is only rewritten on a change.
 """
-import urequests
-import json
+import http_client
+from json_stream import extract
 import time
 import machine
+import ubinascii
 from ws2812 import WS2812
 from do_connect import do_connect
+try:
+    from umqtt.simple import MQTTClient
+except ImportError:
+    MQTTClient = None          # umqtt not installed - polling only
 
 # Simple configuration
 LED_PIN = 0                    # LED strip data pin
-LED_COUNT = 8                  # Number of LEDs  
+LED_COUNT = 8                  # Number of LEDs
 UPDATE_INTERVAL = 10           # Update every 10 seconds
 REQUEST_TIMEOUT = 10           # HTTP request timeout in seconds
+SCAN_BUFFER_SIZE = 128         # Bytes of the response scanned per read
 API_URL = "http://api.thingspeak.com/channels/1417/field/2/last.json"
 
+# MQTT push configuration
+MQTT_BROKER = "mqtt.cheerlights.com"
+MQTT_TOPIC = b"cheerlightsRGB" # Payload is the color as "#RRGGBB"
+MQTT_KEEPALIVE = 60            # Seconds between keepalive pings
+MQTT_RETRY_INTERVAL = 300      # Seconds of polling before trying MQTT again
+MQTT_CHECK_INTERVAL = 100      # Milliseconds between message checks
+
+# Response body is streamed through this buffer instead of a new string per poll
+scan_buffer = bytearray(SCAN_BUFFER_SIZE)
+
+# Validators from the last feed response, sent back so the server can
+# answer 304 Not Modified instead of repeating the same body
+feed_etag = None
+feed_last_modified = None
+
+# Color currently shown on the strip
+current_color = None
+
 # Connect to WiFi and setup LEDs
 print("Starting CheerLights...")
 do_connect()
 led_strip = WS2812(machine.Pin(LED_PIN), LED_COUNT)
 
+def parse_color(hex_color):
+    """Convert '#RRGGBB' to a number (remove # symbol)"""
+    return int('0x' + hex_color[1:7], 16)
+
+def apply_color(color):
+    """Write color to the strip unless it is already showing"""
+    global current_color
+    if color == current_color:
+        print("Color unchanged, strip left as is")
+        return
+    led_strip.write_all(color)
+    current_color = color
+    print("LEDs updated!")
+
 def get_color():
-    """Get current CheerLights color from internet with timeout protection"""
+    """
+    Get current CheerLights color from internet with timeout protection
+
+    Returns:
+        int: Color (the current one again on 304 Not Modified), or None on error
+    """
+    global feed_etag, feed_last_modified
     response = None
     try:
         print("Getting new color...")
-        
-        # Make HTTP request with timeout
-        response = urequests.get(API_URL, timeout=REQUEST_TIMEOUT)
-        
-        if response.status_code == 200:
-            # Get color data from JSON
-            data = json.loads(response.content.decode('utf-8'))
+
+        # Conditional request - only a changed feed sends a body
+        headers = {}
+        if feed_etag:
+            headers["If-None-Match"] = feed_etag
+        if feed_last_modified:
+            headers["If-Modified-Since"] = feed_last_modified
+
+        # Make HTTP request with timeout (reuses the kept-alive connection)
+        response = http_client.get(API_URL, headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 304 and current_color is not None:
+            print("Feed not modified")
+            return current_color
+        elif response.status_code == 200:
+            feed_etag = response.headers.get("etag")
+            feed_last_modified = response.headers.get("last-modified")
+
+            # Get color data from JSON, scanning only for field2
+            data = extract(response, ("field2",), scan_buffer)
+
+            # Read the (short) remainder so the connection can be reused
+            while response.readinto(scan_buffer):
+                pass
             hex_color = data['field2']
             print(f"New color: {hex_color}")
-            
-            # Convert hex to number (remove # symbol)
-            color = int('0x' + hex_color[1:7], 16)
-            return color
+            return parse_color(hex_color)
         else:
             print(f"HTTP error: status {response.status_code}")
             return None
-            
+
     except OSError as e:
         print(f"Network error: {e}")
         return None
@@ -57,25 +119,70 @@ def get_color():
             except:
                 pass
 
+def on_mqtt_message(topic, message):
+    """MQTT callback - a new color was pushed"""
+    hex_color = message.decode('utf-8').strip()
+    print(f"Pushed color: {hex_color}")
+    try:
+        apply_color(parse_color(hex_color))
+    except ValueError:
+        print(f"Ignoring invalid color: {hex_color}")
+
+def run_mqtt():
+    """
+    Follow the CheerLights MQTT feed until the connection drops
+
+    Raises:
+        OSError: When the broker cannot be reached or the connection is lost
+    """
+    client_id = b"cheerlights-" + ubinascii.hexlify(machine.unique_id())
+    client = MQTTClient(client_id, MQTT_BROKER, keepalive=MQTT_KEEPALIVE)
+    client.set_callback(on_mqtt_message)
+    client.connect()
+    try:
+        # Subscribe once; the broker pushes every color change
+        client.subscribe(MQTT_TOPIC)
+        print(f"Subscribed to {MQTT_TOPIC.decode()} on {MQTT_BROKER}")
+        last_ping = time.ticks_ms()
+        while True:
+            client.check_msg()
+            if time.ticks_diff(time.ticks_ms(), last_ping) >= MQTT_KEEPALIVE * 500:
+                client.ping()
+                last_ping = time.ticks_ms()
+            time.sleep_ms(MQTT_CHECK_INTERVAL)
+    finally:
+        try:
+            client.disconnect()
+        except OSError:
+            pass
+
 # Main loop - runs forever with error recovery
-print(f"Starting CheerLights! Updates every {UPDATE_INTERVAL} seconds")
 consecutive_errors = 0
 MAX_ERRORS = 3
+last_mqtt_attempt = None
 
 while True:
     try:
+        # Prefer the push feed whenever MQTT is available
+        if MQTTClient is not None and (last_mqtt_attempt is None or
+                time.ticks_diff(time.ticks_ms(), last_mqtt_attempt) >= MQTT_RETRY_INTERVAL * 1000):
+            last_mqtt_attempt = time.ticks_ms()
+            try:
+                run_mqtt()
+            except OSError as e:
+                print(f"MQTT unavailable ({e}), polling every {UPDATE_INTERVAL} seconds")
+
         # Get the latest color from CheerLights
         color = get_color()
-        
+
         # Update LEDs if we got a color
         if color is not None:
-            led_strip.write_all(color)
-            print("LEDs updated!")
+            apply_color(color)
             consecutive_errors = 0  # Reset error counter on success
         else:
             consecutive_errors += 1
             print(f"Failed to get color ({consecutive_errors}/{MAX_ERRORS})")
-            
+
             # If too many consecutive errors, try to reconnect WiFi
             if consecutive_errors >= MAX_ERRORS:
                 print("Too many errors, attempting WiFi reconnect...")
@@ -85,11 +192,11 @@ while True:
                     print("WiFi reconnected successfully")
                 except:
                     print("WiFi reconnect failed")
-        
+
         # Wait before checking again
         print(f"Waiting {UPDATE_INTERVAL} seconds...")
         time.sleep(UPDATE_INTERVAL)
-        
+
     except KeyboardInterrupt:
         print("CheerLights stopped by user")
         break
@@ -2,13 +2,14 @@
 Weather Station with LCD Display
 Displays real-time weather information and local time on LCD screen
 """
-import urequests
+import http_client
 import time
+from json_stream import extract
 import ntptime
 from machine import I2C, Pin
 from lcd1602 import LCD
 from secrets import secrets
-from do_connect import do_connect
+from wifi_manager import WiFiManager, asyncio
 
 # Hardware configuration constants
 LCD_SDA_PIN = 6                # I2C SDA pin for LCD
@@ -25,30 +26,31 @@ NTP_RETRY_DELAY = 2            # Delay between NTP sync attempts
 DEFAULT_CITY = "Shenzhen"        # Default city for weather
 DEFAULT_UNITS = "metric"       # Default measurement units
 API_TIMEOUT = 10               # HTTP request timeout in seconds
+SCAN_BUFFER_SIZE = 256         # Bytes of the response scanned per read
 
-print("Starting Weather Station...")
+# Response body is streamed through this buffer instead of a new one per update
+scan_buffer = bytearray(SCAN_BUFFER_SIZE)
 
-# Connect to WiFi
-print("Connecting to WiFi...")
-do_connect()
+print("Starting Weather Station...")
 
-# Sync time with NTP server
-print("Synchronizing time...")
-ntp_attempts = 0
+# WiFi is kept up by a background task; the rest of the program only
+# waits for the link when it actually needs the network
+wifi = WiFiManager(secrets['ssid'], secrets['password'])
 MAX_NTP_ATTEMPTS = 5
 
-while ntp_attempts < MAX_NTP_ATTEMPTS:
-    try:
-        ntptime.settime()
-        print("Time synchronized successfully")
-        break
-    except OSError as e:
-        ntp_attempts += 1
-        print(f"Time sync attempt {ntp_attempts}/{MAX_NTP_ATTEMPTS}...")
-        time.sleep(NTP_RETRY_DELAY)
-
-if ntp_attempts >= MAX_NTP_ATTEMPTS:
+async def sync_time():
+    """Sync time with NTP server, retrying without blocking other tasks"""
+    print("Synchronizing time...")
+    for ntp_attempt in range(1, MAX_NTP_ATTEMPTS + 1):
+        try:
+            ntptime.settime()
+            print("Time synchronized successfully")
+            return True
+        except OSError as e:
+            print(f"Time sync attempt {ntp_attempt}/{MAX_NTP_ATTEMPTS}...")
+            await asyncio.sleep(NTP_RETRY_DELAY)
     print("WARNING: Time sync failed, using local time")
+    return False
 
 # Initialize LCD display
 print(f"Initializing LCD on I2C bus {I2C_BUS}")
@@ -76,6 +78,17 @@ SPEED_UNITS = {
     "imperial": "mph",    # Miles per hour
 }
 
+# Fields read from the OpenWeather response; everything else is skipped
+# while streaming, so the full JSON document is never held in RAM
+WEATHER_FIELDS = (
+    "name", "timezone", "visibility",
+    "coord.lon", "coord.lat",
+    "sys.country", "sys.sunrise", "sys.sunset",
+    "weather.0.main",
+    "main.temp", "main.feels_like", "main.humidity", "main.pressure",
+    "wind.speed",
+)
+
 def get_weather_data(city=DEFAULT_CITY, api_key=None, units=DEFAULT_UNITS, lang='zh_cn'):
     """
     Fetch weather data from OpenWeatherMap API
@@ -87,7 +100,7 @@ def get_weather_data(city=DEFAULT_CITY, api_key=None, units=DEFAULT_UNITS, lang=
         lang: Language for weather descriptions
     
     Returns:
-        dict: Weather data or None if failed
+        dict: WEATHER_FIELDS path -> value, or None if failed
     """
     if not api_key:
         print("ERROR: No API key provided")
@@ -98,11 +111,14 @@ def get_weather_data(city=DEFAULT_CITY, api_key=None, units=DEFAULT_UNITS, lang=
         url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units={units}&lang={lang}"
         print(f"Fetching weather for {city}...")
         
-        # Make HTTP GET request with timeout
-        response = urequests.get(url, timeout=API_TIMEOUT)
+        # Make HTTP GET request with timeout (reuses the kept-alive connection)
+        response = http_client.get(url, timeout=API_TIMEOUT)
         
         if response.status_code == 200:
-            weather_data = response.json()
+            weather_data = extract(response, WEATHER_FIELDS, scan_buffer)
+            # Read the remainder so the connection goes back to the pool
+            while response.readinto(scan_buffer):
+                pass
             response.close()
             print("Weather data retrieved successfully")
             return weather_data
@@ -126,23 +142,23 @@ def display_weather_debug(weather_data, units=DEFAULT_UNITS):
         
     try:
         timezone_hours = int(weather_data["timezone"] / 3600)
-        sunrise = time.localtime(weather_data['sys']['sunrise'] + weather_data["timezone"])
-        sunset = time.localtime(weather_data['sys']['sunset'] + weather_data["timezone"])
+        sunrise = time.localtime(weather_data['sys.sunrise'] + weather_data["timezone"])
+        sunset = time.localtime(weather_data['sys.sunset'] + weather_data["timezone"])
         
         print(f'=== Weather Details ===')
-        print(f'City: {weather_data["name"]}, {weather_data["sys"]["country"]}')
-        print(f'Coordinates: [{weather_data["coord"]["lon"]}, {weather_data["coord"]["lat"]}]')
+        print(f'City: {weather_data["name"]}, {weather_data["sys.country"]}')
+        print(f'Coordinates: [{weather_data["coord.lon"]}, {weather_data["coord.lat"]}]')
         print(f'Timezone: UTC{timezone_hours:+d}')
         print(f'Sunrise: {sunrise[3]:02d}:{sunrise[4]:02d}')
         print(f'Sunset: {sunset[3]:02d}:{sunset[4]:02d}')
-        print(f'Weather: {weather_data["weather"][0]["main"]}')
-        print(f'Temperature: {weather_data["main"]["temp"]:.1f}{TEMPERATURE_UNITS[units]}')
-        print(f'Feels like: {weather_data["main"]["feels_like"]:.1f}{TEMPERATURE_UNITS[units]}')
-        print(f'Humidity: {weather_data["main"]["humidity"]}%')
-        print(f'Pressure: {weather_data["main"]["pressure"]}hPa')
+        print(f'Weather: {weather_data["weather.0.main"]}')
+        print(f'Temperature: {weather_data["main.temp"]:.1f}{TEMPERATURE_UNITS[units]}')
+        print(f'Feels like: {weather_data["main.feels_like"]:.1f}{TEMPERATURE_UNITS[units]}')
+        print(f'Humidity: {weather_data["main.humidity"]}%')
+        print(f'Pressure: {weather_data["main.pressure"]}hPa')
         
-        if "wind" in weather_data:
-            print(f'Wind: {weather_data["wind"]["speed"]}{SPEED_UNITS[units]}')
+        if "wind.speed" in weather_data:
+            print(f'Wind: {weather_data["wind.speed"]}{SPEED_UNITS[units]}')
         if "visibility" in weather_data:
             print(f'Visibility: {weather_data["visibility"]}m')
             
@@ -160,9 +176,9 @@ def update_lcd_display(lcd, weather_data, units=DEFAULT_UNITS):
             return
             
         # Extract weather information
-        weather_condition = weather_data["weather"][0]["main"]
-        temperature = weather_data["main"]["temp"]
-        humidity = weather_data["main"]["humidity"]
+        weather_condition = weather_data["weather.0.main"]
+        temperature = weather_data["main.temp"]
+        humidity = weather_data["main.humidity"]
         
         # Calculate local time with timezone offset
         timezone_offset = int(weather_data["timezone"] / 3600)
@@ -188,70 +204,72 @@ def update_lcd_display(lcd, weather_data, units=DEFAULT_UNITS):
 
 
 # Main weather monitoring loop
-print("Starting weather monitoring...")
-print(f"Update interval: {UPDATE_INTERVAL} seconds")
-
-consecutive_errors = 0
-MAX_ERRORS = 3
-
-# Show loading message
-lcd.clear()
-lcd.message("Weather Station\nLoading...")
-
-while True:
-    try:
-        # Fetch weather data
-        weather_data = get_weather_data(
-            city=DEFAULT_CITY,
-            api_key=secrets['openweather_api_key'],
-            units=DEFAULT_UNITS
-        )
-        
-        if weather_data:
-            # Update LCD display with weather info
-            update_lcd_display(lcd, weather_data, DEFAULT_UNITS)
+async def main():
+    print("Starting weather monitoring...")
+    print(f"Update interval: {UPDATE_INTERVAL} seconds")
+    
+    consecutive_errors = 0
+    
+    # Start the connection manager and wait for the first link
+    wifi.start()
+    lcd.clear()
+    lcd.message("Weather Station\nConnecting WiFi")
+    await wifi.wait_connected()
+    await sync_time()
+    
+    # Show loading message
+    lcd.clear()
+    lcd.message("Weather Station\nLoading...")
+    
+    while True:
+        try:
+            # Wait for the link instead of retrying against a dead network
+            if not wifi.link_up.is_set():
+                print("Waiting for WiFi...")
+                lcd.clear()
+                lcd.message("WiFi Lost\nReconnecting...")
+                await wifi.wait_connected()
             
-            # Reset error counter on success
-            consecutive_errors = 0
+            # Fetch weather data
+            weather_data = get_weather_data(
+                city=DEFAULT_CITY,
+                api_key=secrets['openweather_api_key'],
+                units=DEFAULT_UNITS
+            )
             
-            # Optional: Print detailed debug info (uncomment to enable)
-            # display_weather_debug(weather_data, DEFAULT_UNITS)
+            if weather_data:
+                # Update LCD display with weather info
+                update_lcd_display(lcd, weather_data, DEFAULT_UNITS)
+                
+                # Reset error counter on success
+                consecutive_errors = 0
+                
+                # Optional: Print detailed debug info (uncomment to enable)
+                # display_weather_debug(weather_data, DEFAULT_UNITS)
+                
+            else:
+                # Handle weather fetch failure
+                consecutive_errors += 1
+                print(f"Weather fetch failed ({consecutive_errors} in a row)")
+                
+                # Show error on LCD
+                lcd.clear()
+                lcd.message(f"Weather Error\nRetry {consecutive_errors}")
             
-        else:
-            # Handle weather fetch failure
-            consecutive_errors += 1
-            print(f"Weather fetch failed ({consecutive_errors}/{MAX_ERRORS})")
+            # Wait before next update (other tasks keep running)
+            print(f"Next update in {UPDATE_INTERVAL} seconds...")
+            await asyncio.sleep(UPDATE_INTERVAL)
             
-            # Show error on LCD
+        except Exception as e:
+            print(f"Unexpected error in main loop: {e}")
+            consecutive_errors += 1
             lcd.clear()
-            lcd.message(f"Weather Error\nRetry {consecutive_errors}/{MAX_ERRORS}")
-            
-            # Try to reconnect WiFi after multiple failures
-            if consecutive_errors >= MAX_ERRORS:
-                print("Too many consecutive errors, attempting WiFi reconnect...")
-                try:
-                    do_connect()
-                    consecutive_errors = 0
-                    print("WiFi reconnected successfully")
-                    lcd.clear()
-                    lcd.message("WiFi Reconnected\nResuming...")
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"WiFi reconnect failed: {e}")
-        
-        # Wait before next update
-        print(f"Next update in {UPDATE_INTERVAL} seconds...")
-        time.sleep(UPDATE_INTERVAL)
-        
-    except KeyboardInterrupt:
-        print("Weather station stopped by user")
-        lcd.clear()
-        lcd.message("Weather Station\nStopped")
-        break
-        
-    except Exception as e:
-        print(f"Unexpected error in main loop: {e}")
-        consecutive_errors += 1
-        lcd.clear()
-        lcd.message("System Error\nCheck Console")
-        time.sleep(UPDATE_INTERVAL)
+            lcd.message("System Error\nCheck Console")
+            await asyncio.sleep(UPDATE_INTERVAL)
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    print("Weather station stopped by user")
+    lcd.clear()
+    lcd.message("Weather Station\nStopped")
@@ -1,14 +1,19 @@
 """
 IoT Environmental Control Web Server
 Provides web-based control for RGB LEDs and real-time sensor monitoring
+
+Upload the www folder alongside this file (run build_assets.py first to
+refresh www/style.css.gz after editing the stylesheet).
 """
 import machine
-import socket
 from machine import Pin
 from dht import DHT11, InvalidPulseCount
-from time import sleep
+from time import ticks_ms, ticks_diff
 from secrets import secrets
 from do_connect import do_connect
+from http_server import HTTPServer, Response, asyncio
+from html_template import Template
+from static_assets import add_static
 
 # Hardware configuration constants
 RED_LED_PIN = 13               # Red LED GPIO pin
@@ -16,12 +21,13 @@ GREEN_LED_PIN = 14             # Green LED GPIO pin
 BLUE_LED_PIN = 15              # Blue LED GPIO pin
 DHT_SENSOR_PIN = 16            # DHT11 sensor data pin
 WEB_SERVER_PORT = 80           # HTTP server port
-MAX_CONNECTIONS = 1            # Maximum concurrent connections
-REQUEST_BUFFER_SIZE = 1024     # HTTP request buffer size
+MAX_CONNECTIONS = 4            # Maximum concurrent connections
 
 # Sensor reading constants
 SENSOR_RETRY_COUNT = 3         # Retry attempts for failed sensor readings
 SENSOR_ERROR_VALUE = "Error"   # Display value for sensor errors
+SENSOR_RETRY_DELAY = 100       # Milliseconds between read attempts
+SENSOR_CACHE_TIME = 2000       # Milliseconds a reading is reused (DHT11 needs 1 s between reads)
 
 print("Initializing IoT Environmental Control System...")
 
@@ -36,13 +42,25 @@ print(f"Initializing DHT11 sensor on pin {DHT_SENSOR_PIN}")
 sensor_pin = Pin(DHT_SENSOR_PIN, Pin.IN)
 dht_sensor = DHT11(sensor_pin)
 
-def read_sensor_data():
+# Last good reading and when it was taken, shared by page loads and polls
+last_reading = None
+last_reading_ms = 0
+
+async def read_sensor_data():
     """
     Read temperature and humidity from DHT11 sensor with retry logic
     
+    A reading less than SENSOR_CACHE_TIME old is returned without touching
+    the sensor, and retries wait with asyncio so other connections keep
+    being served.
+    
     Returns:
         tuple: (temperature, humidity) or (None, None) if failed
     """
+    global last_reading, last_reading_ms
+    if last_reading and ticks_diff(ticks_ms(), last_reading_ms) < SENSOR_CACHE_TIME:
+        return last_reading
+    
     for attempt in range(SENSOR_RETRY_COUNT):
         try:
             dht_sensor.measure()
@@ -52,7 +70,9 @@ def read_sensor_data():
             # Validate sensor readings
             if temperature is not None and humidity is not None:
                 print(f"Sensor reading: {temperature}°C, {humidity}%")
-                return temperature, humidity
+                last_reading = temperature, humidity
+                last_reading_ms = ticks_ms()
+                return last_reading
             else:
                 print(f"Invalid sensor reading on attempt {attempt + 1}")
                 
@@ -64,7 +84,7 @@ def read_sensor_data():
             
         # Small delay before retry
         if attempt < SENSOR_RETRY_COUNT - 1:
-            sleep(0.1)
+            await asyncio.sleep_ms(SENSOR_RETRY_DELAY)
     
     print("All sensor read attempts failed")
     return None, None
@@ -96,191 +116,16 @@ def control_led(color):
     else:
         print(f"Unknown LED color: {color}")
 
-def create_beautiful_webpage(temperature, humidity):
-    """
-    Generate a modern, responsive webpage with beautiful CSS styling
-    
-    Args:
-        temperature: Current temperature reading
-        humidity: Current humidity reading
-        
-    Returns:
-        str: Complete HTML page with embedded CSS
-    """
-    html = f"""<!DOCTYPE html>
+# Page template - static HTML is encoded to bytes once at startup,
+# only the sensor fields are filled in per request. The stylesheet is
+# served separately from www/style.css so browsers can cache it.
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>IoT Environmental Control</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }}
-        
-        .container {{
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-            max-width: 500px;
-            width: 100%;
-            text-align: center;
-        }}
-        
-        h1 {{
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 2.2em;
-            font-weight: 300;
-        }}
-        
-        .subtitle {{
-            color: #666;
-            margin-bottom: 40px;
-            font-size: 1.1em;
-        }}
-        
-        .sensor-data {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-        
-        .sensor-card {{
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .sensor-card.temperature {{
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        }}
-        
-        .sensor-card.humidity {{
-            background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
-        }}
-        
-        .sensor-value {{
-            font-size: 2em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        
-        .sensor-label {{
-            font-size: 0.9em;
-            opacity: 0.9;
-        }}
-        
-        .control-section {{
-            margin-bottom: 30px;
-        }}
-        
-        .section-title {{
-            color: #333;
-            margin-bottom: 20px;
-            font-size: 1.3em;
-            font-weight: 500;
-        }}
-        
-        .button-grid {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-        
-        .control-btn {{
-            padding: 15px 30px;
-            border: none;
-            border-radius: 10px;
-            font-size: 1em;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            color: white;
-        }}
-        
-        .btn-red {{
-            background: linear-gradient(135deg, #ff6b6b 0%, #ee5a52 100%);
-        }}
-        
-        .btn-green {{
-            background: linear-gradient(135deg, #51cf66 0%, #40c057 100%);
-        }}
-        
-        .btn-blue {{
-            background: linear-gradient(135deg, #4dabf7 0%, #339af0 100%);
-        }}
-        
-        .btn-off {{
-            background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
-            grid-column: 1 / -1;
-        }}
-        
-        .control-btn:hover {{
-            transform: translateY(-3px);
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
-        }}
-        
-        .control-btn:active {{
-            transform: translateY(-1px);
-        }}
-        
-        .footer {{
-            margin-top: 30px;
-            color: #888;
-            font-size: 0.9em;
-        }}
-        
-        .status-indicator {{
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            background: #51cf66;
-            border-radius: 50%;
-            margin-right: 8px;
-            animation: pulse 2s infinite;
-        }}
-        
-        @keyframes pulse {{
-            0% {{ opacity: 1; }}
-            50% {{ opacity: 0.5; }}
-            100% {{ opacity: 1; }}
-        }}
-        
-        @media (max-width: 480px) {{
-            .container {{
-                padding: 25px;
-            }}
-            
-            .sensor-data {{
-                grid-template-columns: 1fr;
-            }}
-            
-            h1 {{
-                font-size: 1.8em;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="/style.css">
 </head>
 <body>
     <div class="container">
@@ -289,11 +134,11 @@ def create_beautiful_webpage(temperature, humidity):
         
         <div class="sensor-data">
             <div class="sensor-card temperature">
-                <div class="sensor-value">{temperature}°</div>
+                <div class="sensor-value" id="temperature">{temperature}°</div>
                 <div class="sensor-label">Temperature</div>
             </div>
             <div class="sensor-card humidity">
-                <div class="sensor-value">{humidity}%</div>
+                <div class="sensor-value" id="humidity">{humidity}%</div>
                 <div class="sensor-label">Humidity</div>
             </div>
         </div>
@@ -321,119 +166,94 @@ def create_beautiful_webpage(temperature, humidity):
             System Status: Online
         </div>
     </div>
+    <script>
+        // Poll the JSON endpoint every 5s instead of reloading the whole page
+        setInterval(function() {{
+            fetch("/sensors.json").then(function(r) {{ return r.json(); }}).then(function(d) {{
+                document.getElementById("temperature").textContent = d.temperature + "°";
+                document.getElementById("humidity").textContent = d.humidity + "%";
+            }}).catch(function() {{}});
+        }}, 5000);
+    </script>
 </body>
-</html>"""
-    return html
+</html>""")
 
-def handle_web_request(connection):
+def create_beautiful_webpage(temperature, humidity):
     """
-    Handle incoming HTTP requests and serve web pages
+    Generate a modern, responsive webpage with beautiful CSS styling
     
     Args:
-        connection: Socket connection object
+        temperature: Current temperature reading
+        humidity: Current humidity reading
+        
+    Returns:
+        list: Encoded page chunks with the sensor values spliced in
     """
-    while True:
-        client = None
-        try:
-            # Accept client connection
-            client = connection.accept()[0]
-            print("New client connected")
-            
-            # Receive HTTP request
-            request_data = client.recv(REQUEST_BUFFER_SIZE)
-            request_str = str(request_data)
-            
-            # Parse request path
-            try:
-                request_path = request_str.split()[1]
-                print(f"Request: {request_path}")
-            except (IndexError, ValueError):
-                request_path = "/"
-                print("Invalid request format, defaulting to root")
-            
-            # Process LED control commands
-            if request_path == '/off' or request_path == '/off?':
-                control_led('off')
-            elif request_path == '/red' or request_path == '/red?':
-                control_led('red')
-            elif request_path == '/green' or request_path == '/green?':
-                control_led('green')  
-            elif request_path == '/blue' or request_path == '/blue?':
-                control_led('blue')
-            elif request_path == '/' or request_path == '/index.html':
-                # Root path - just display the main page (no LED change)
-                print("Serving main page")
-            elif request_path == '/favicon.ico':
-                # Ignore favicon requests
-                print("Favicon request ignored")
-            else:
-                print(f"Unknown request path: {request_path}")
-            
-            # Read sensor data
-            temperature, humidity = read_sensor_data()
-            
-            # Format sensor values for display
-            if temperature is None or humidity is None:
-                temp_display = SENSOR_ERROR_VALUE
-                hum_display = SENSOR_ERROR_VALUE
-                print("Using error values for sensor display")
-            else:
-                temp_display = f"{temperature:.1f}"
-                hum_display = f"{humidity:.1f}"
-            
-            # Generate and send webpage
-            html_content = create_beautiful_webpage(temp_display, hum_display)
-            
-            # Send HTTP response headers
-            response_headers = "HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nConnection: close\r\n\r\n"
-            client.send(response_headers.encode('utf-8'))
-            client.send(html_content.encode('utf-8'))
-            
-            print("Response sent successfully")
-            
-        except OSError as e:
-            print(f"Network error handling request: {e}")
-            
-        except Exception as e:
-            print(f"Unexpected error handling request: {e}")
-            
-        finally:
-            # Always close client connection
-            if client:
-                try:
-                    client.close()
-                    print("Client connection closed")
-                except:
-                    pass
+    return PAGE_TEMPLATE.render(temperature=temperature, humidity=humidity)
 
-def create_web_server(ip_address):
+async def format_sensor_data():
     """
-    Create and configure web server socket
+    Read the sensor and format its values for display
     
-    Args:
-        ip_address: IP address to bind server to
-        
     Returns:
-        socket: Configured server socket
+        tuple: (temperature, humidity) display strings
     """
-    try:
-        server_address = (ip_address, WEB_SERVER_PORT)
-        server_socket = socket.socket()
-        server_socket.bind(server_address)
-        server_socket.listen(MAX_CONNECTIONS)
-        
-        print(f"Web server created successfully")
-        print(f"Server Address: http://{ip_address}:{WEB_SERVER_PORT}")
-        print(f"Max connections: {MAX_CONNECTIONS}")
-        
-        return server_socket
-        
-    except OSError as e:
-        print(f"Failed to create web server: {e}")
-        raise
-    except Exception as e:
-        print(f"Unexpected error creating web server: {e}")
-        raise
+    temperature, humidity = await read_sensor_data()
+    
+    # Format sensor values for display
+    if temperature is None or humidity is None:
+        print("Using error values for sensor display")
+        return SENSOR_ERROR_VALUE, SENSOR_ERROR_VALUE
+    return f"{temperature:.1f}", f"{humidity:.1f}"
+
+async def render_page():
+    """Read the sensor and render the main page"""
+    temp_display, hum_display = await format_sensor_data()
+    return create_beautiful_webpage(temp_display, hum_display)
+
+async def render_sensor_json():
+    """Read the sensor and return its values as a small JSON document"""
+    temp_display, hum_display = await format_sensor_data()
+    body = '{"temperature": "%s", "humidity": "%s"}' % (temp_display, hum_display)
+    return Response(body, content_type="application/json")
+
+def create_web_server():
+    """
+    Create the web server and register its routes
+    
+    Returns:
+        HTTPServer: Server with page and LED control routes
+    """
+    app = HTTPServer(max_connections=MAX_CONNECTIONS)
+    
+    async def index(request):
+        # Root path - just display the main page (no LED change)
+        print("Serving main page")
+        return await render_page()
+    
+    def led_route(color):
+        async def handler(request):
+            # Process LED control command, then show the page again
+            control_led(color)
+            return await render_page()
+        return handler
+    
+    async def sensors(request):
+        # Sensor values only, polled by the page script
+        return await render_sensor_json()
+    
+    async def favicon(request):
+        # Ignore favicon requests
+        return ""
+    
+    app.add_route('/', index)
+    app.add_route('/index.html', index)
+    for color in ('red', 'green', 'blue', 'off'):
+        app.add_route('/' + color, led_route(color))
+    app.add_route('/sensors.json', sensors)
+    add_static(app, '/style.css', 'www/style.css')
+    app.add_route('/favicon.ico', favicon)
+    return app
 
 # Main program execution
 print("Starting main program...")
@@ -448,7 +268,9 @@ try:
         
         # Create web server
         print("Creating web server...")
-        server_connection = create_web_server(ip_address)
+        app = create_web_server()
+        print(f"Server Address: http://{ip_address}:{WEB_SERVER_PORT}")
+        print(f"Max connections: {MAX_CONNECTIONS}")
         
         # Start serving requests
         print("🌐 Web server is running!")
@@ -456,7 +278,7 @@ try:
         print("🔴🟢🔵 Control your RGB LEDs and monitor sensors")
         print("Press Ctrl+C to stop the server")
         
-        handle_web_request(server_connection)
+        asyncio.run(app.serve(ip_address, WEB_SERVER_PORT))
         
     else:
         print("ERROR: Failed to obtain IP address")
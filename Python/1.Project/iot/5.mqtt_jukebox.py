@@ -5,8 +5,13 @@ This program connects to an MQTT broker and plays predefined melodies
 based on received messages. It includes graceful exit functionality
 using keyboard interrupt (Ctrl+C).
 
+The MQTT connection is event driven: the topic is subscribed once, the
+client keeps the connection alive (and reconnects) in the background, and
+a melody plays as its own task - a new song request interrupts the one
+that is playing instead of waiting for it to finish.
+
 Hardware Requirements:
-- ESP32/ESP8266 with MicroPython
+- Raspberry Pi Pico W with MicroPython
 - Buzzer connected to GPIO 15
 
 Supported Songs:
@@ -15,20 +20,24 @@ Supported Songs:
 - "nevergonnagiveyouup" - Rick Astley
 - "imperialmarch" - Imperial March (Darth Vader theme)
 
+Upload songs.bin (built with build_songs.py) next to this program.
+
 Usage:
 - Send song name to MQTT topic 'LAFVIN MQTT'
+- Send "stop", "pause" or "resume" to control playback
+- Send "tempo <bpm>" (e.g. "tempo 160") to change speed
 - Use Ctrl+C to exit gracefully
 """
 
-import time
-import sys
 from machine import Pin, PWM
-from umqtt.simple import MQTTClient
+from mqtt_async import MQTTClient, asyncio
 
-# Buzzer setup
-from play_music import *
+# Buzzer setup - songs are read from songs.bin only when requested
+from melody import Sequencer
+from song_library import SongLibrary
+library = SongLibrary()
 buzzer = PWM(Pin(15))
-play_flag = False
+sequencer = Sequencer(buzzer)  # Plays from an asyncio task; CPU stays free
 
 # Wi-Fi connection
 from secrets import *
@@ -43,106 +52,84 @@ client_id = 'Jimmy'
 topic = b'LAFVIN MQTT'
 
 # Global variables for resource management
-client = None
-running = True
-melody = None
+client = MQTTClient(client_id, mqtt_server, keepalive=60)
+
 
 def cleanup_resources():
     """
     Clean up all resources including MQTT connection and buzzer
     """
-    global client, buzzer
     print("\nCleaning up resources...")
-    
+
     try:
         # Stop buzzer
-        if buzzer:
-            buzzer.duty_u16(0)  # Stop PWM output
-            print("✓ Buzzer stopped")
+        sequencer.stop()
+        buzzer.duty_u16(0)  # Stop PWM output
+        print("✓ Buzzer stopped")
     except Exception as e:
         print(f"Error cleaning buzzer: {e}")
-    
-    try:
-        # Disconnect MQTT
-        if client:
-            client.disconnect()
-            print("✓ MQTT connection closed")
-    except Exception as e:
-        print(f"Error disconnecting MQTT: {e}")
-    
+
     print("✓ Resource cleanup completed")
 
 
-def callback(topic, message):
+def handle_message(topic, message):
+    """Start, replace, pause or stop playback for one received message"""
     print("New message on topic {}".format(topic.decode('utf-8')))
-    message = message.decode('utf-8')
+    message = message.decode('utf-8').strip()
     print(message)
-    if message in song.keys():
-        global melody,play_flag
-        melody = song[message]
-        play_flag = True
-
-
-# Main program
-def main():
+    if message in library:
+        # A new request interrupts whatever is playing
+        sequencer.load(library.events(message), library.tempo(message))
+        sequencer.play()
+        print(f"🎵 Starting music playback: {message}")
+    elif message == "stop":
+        sequencer.stop()
+    elif message == "pause":
+        sequencer.pause()
+    elif message == "resume":
+        sequencer.resume()
+    elif message.startswith("tempo "):
+        try:
+            sequencer.set_tempo(int(message[6:]))
+            print(f"Tempo set to {sequencer.tempo} BPM")
+        except ValueError as e:
+            # A bad value must not stop the jukebox
+            print(f"Ignoring '{message}': {e}")
+
+
+async def main():
     """
     Main program entry point with graceful exit handling
     """
-    global client, running, play_flag, melody
-    
+    # Subscribe once; the client resubscribes by itself after a reconnect
+    client.subscribe(topic)
+    client.start()
+    await client.connected.wait()
+    print(f'✓ Successfully connected to MQTT server: {mqtt_server}')
+    print(f'✓ Client ID: {client_id}')
+    print(f'✓ Subscribed topic: {topic.decode("utf-8")}')
+    print("✓ Music player started - Press Ctrl+C to exit")
+    print("-" * 50)
+
     try:
-        # Initialize MQTT client
-        client = MQTTClient(client_id, mqtt_server, keepalive=60)
-        client.set_callback(callback)
-        client.connect()
-        print(f'✓ Successfully connected to MQTT server: {mqtt_server}')
-        print(f'✓ Client ID: {client_id}')
-        print(f'✓ Subscribed topic: {topic.decode("utf-8")}')
-        print("✓ Music player started - Press Ctrl+C to exit")
-        print("-" * 50)
-        
-        # Main loop
-        while running:
+        while True:
+            msg_topic, message = await client.get()
             try:
-                client.subscribe(topic)
-                client.check_msg()  # Check for new messages
-                
-                # Play music if requested
-                if play_flag:
-                    print(f"🎵 Starting music playback...")
-                    play(buzzer, melody)
-                    play_flag = False
-                    print("🎵 Music playback completed")
-                
-                time.sleep(0.1)  # Reduce CPU usage
-                
-            except KeyboardInterrupt:
-                # Catch Ctrl+C
-                print("\nUser interrupt detected, shutting down...")
-                break
+                handle_message(msg_topic, message)
             except Exception as e:
-                print(f"Error in main loop: {e}")
-                time.sleep(1)  # Brief delay after error
-                
-    except OSError as e:
-        print(f'❌ Failed to connect to MQTT server: {e}')
-        print('Try restarting device or check network connection...')
-        cleanup_resources()
-        return
-    except Exception as e:
-        print(f'❌ Program initialization failed: {e}')
-        cleanup_resources()
-        return
+                print(f"Error handling message: {e}")
     finally:
-        # Ensure resources are cleaned up
-        running = False
-        cleanup_resources()
+        await client.disconnect()
+        print("✓ MQTT connection closed")
 
 # Run main program
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # Catch Ctrl+C
+        print("\nUser interrupt detected, shutting down...")
     except Exception as e:
         print(f"Program terminated with exception: {e}")
+    finally:
         cleanup_resources()
-
@@ -3,7 +3,8 @@ import network
 import time
 from secrets import *
 from do_connect import *
-import usocket as socket
+from http_server import HTTPServer, asyncio
+from html_template import Template
 
 # Initialize network connection
 do_connect()
@@ -15,7 +16,8 @@ relay.value(0)  # Set initial state to OFF (0)
 
 # HTML template for web interface
 # Contains CSS for switch styling and JavaScript for AJAX requests
-HTML_TEMPLATE = """<html>
+# Static parts are encoded once; only {state} is filled in per request
+HTML_TEMPLATE = Template("""<html>
 <head>
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <style>
@@ -42,56 +44,40 @@ function toggleCheckbox(element) {{
 <span class="slider"></span>
 </label>
 </body>
-</html>"""
+</html>""")
 
 def web_server():
     """
     Generate HTML response based on current relay state
-    Returns: HTML content with current relay state
+    Returns: HTML chunks with current relay state
     """
     relay_state = 'checked' if relay.value() == 1 else ''
-    return HTML_TEMPLATE.format(state=relay_state)
+    return HTML_TEMPLATE.render(state=relay_state)
 
-def handle_request(conn):
+app = HTTPServer()
+
+@app.route('/')
+async def handle_request(request):
     """
     Handle incoming HTTP requests
     Args:
-        conn: Socket connection object
+        request: Parsed HTTP request
     """
-    # Receive and process HTTP request
-    request = conn.recv(1024)
-    request = str(request)
-    print('Content = %s' % request)
+    print('Request = %s %s' % (request.path, request.query))
     
     # Process relay control commands
-    if '/?relay=on' in request:
+    command = request.query.get('relay')
+    if command == 'on':
         print('RELAY ON')
         relay.value(1)
-    elif '/?relay=off' in request:
+    elif command == 'off':
         print('RELAY OFF')
         relay.value(0)
 
     # Send HTTP response
-    response = web_server()
-    conn.send(b'HTTP/1.1 200 OK\n')
-    conn.send(b'Content-Type: text/html\n')
-    conn.send(b'Connection: close\n\n')
-    conn.sendall(response.encode('utf-8'))
-    conn.close()
-
-# Initialize socket server
-s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-s.bind(('', 80))  # Bind to port 80
-s.listen(5)       # Listen for up to 5 connections
+    return web_server()
 
 print('Server started, waiting for connections...')
 
-# Main loop to handle incoming connections
-while True:
-    try:
-        # Accept new connection
-        conn, addr = s.accept()
-        print('Got a connection from %s' % str(addr))
-        handle_request(conn)
-    except OSError as e:
-        print('Connection closed: %s' % e)
+# Serve clients concurrently until stopped
+asyncio.run(app.serve('0.0.0.0', 80))
@@ -29,9 +29,9 @@ Setup Requirements:
 
 import time
 import machine
-import urequests as requests
 from machine import Pin, PWM
 from do_connect import do_connect
+from blynk_client import BlynkClient
 from dht import DHT11, InvalidPulseCount
 
 # =====================================
@@ -79,62 +79,9 @@ dht_sensor = DHT11(sensor_pin)
 # Blynk API Functions
 # =====================================
 
-def blynk_write(token, pin, value):
-    """
-    Write value to Blynk virtual pin
-    
-    Args:
-        token: Blynk authentication token
-        pin: Virtual pin name (e.g., "V0")
-        value: Value to write
-    
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        api_url = f"https://blynk.cloud/external/api/update?token={token}&{pin}={value}"
-        response = requests.get(api_url)
-        
-        if response.status_code == 200:
-            print(f"✓ Successfully updated {pin} = {value}")
-            response.close()
-            return True
-        else:
-            print(f"❌ Failed to update {pin}. Status: {response.status_code}")
-            response.close()
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error writing to Blynk: {e}")
-        return False
-
-def blynk_read(token, pin):
-    """
-    Read value from Blynk virtual pin
-    
-    Args:
-        token: Blynk authentication token
-        pin: Virtual pin name (e.g., "V0")
-    
-    Returns:
-        str: Pin value or None if error
-    """
-    try:
-        api_url = f"https://blynk.cloud/external/api/get?token={token}&{pin}"
-        response = requests.get(api_url)
-        
-        if response.status_code == 200:
-            value = response.text.strip()
-            response.close()
-            return value
-        else:
-            print(f"❌ Failed to read {pin}. Status: {response.status_code}")
-            response.close()
-            return None
-            
-    except Exception as e:
-        print(f"❌ Error reading from Blynk: {e}")
-        return None
+# All virtual pins are read and written through one batched client,
+# one HTTPS request per direction instead of one per pin
+blynk = BlynkClient(BLYNK_TOKEN)
 
 # =====================================
 # Sensor Functions
@@ -282,10 +229,11 @@ def main():
             try:
                 # ===== Control RGB LEDs based on Blynk slider values =====
                 
-                # Read RGB brightness sliders (0-100)
-                red_brightness = blynk_read(BLYNK_TOKEN, "V0")
-                green_brightness = blynk_read(BLYNK_TOKEN, "V1") 
-                blue_brightness = blynk_read(BLYNK_TOKEN, "V2")
+                # Read RGB brightness sliders (0-100) in a single request
+                sliders = blynk.get("V0", "V1", "V2") or {}
+                red_brightness = sliders.get("V0")
+                green_brightness = sliders.get("V1")
+                blue_brightness = sliders.get("V2")
                 
                 # Process RGB brightness controls
                 rgb_changed = False
@@ -326,18 +274,14 @@ def main():
                     temperature, humidity = read_sensor_data()
                     
                     if temperature is not None and humidity is not None:
-                        # Send temperature and humidity to Blynk
-                        temp_success = blynk_write(BLYNK_TOKEN, "V3", str(temperature))
-                        hum_success = blynk_write(BLYNK_TOKEN, "V4", str(humidity))
-                        
-                        if temp_success and hum_success:
+                        # Send temperature and humidity to Blynk (unchanged values are skipped)
+                        if blynk.update({"V3": temperature, "V4": humidity}):
                             print(f"✅ Sensor data sent: {temperature}°C, {humidity}%")
                         else:
                             print("⚠️  Failed to send sensor data to Blynk")
                     else:
                         # Send error values to Blynk
-                        blynk_write(BLYNK_TOKEN, "V3", "Error")
-                        blynk_write(BLYNK_TOKEN, "V4", "Error")
+                        blynk.update({"V3": "Error", "V4": "Error"})
                         print("❌ Sensor error - sent error values to Blynk")
                     
                     last_sensor_update = current_time
@@ -0,0 +1,127 @@
+"""
+Batched Blynk HTTP Client
+
+Moves several virtual pins per HTTPS request using Blynk's multi-pin
+endpoints instead of one request per pin:
+- get("V0", "V1", "V2")            -> one /external/api/get call
+- update({"V3": 21, "V4": 40})     -> one /external/api/batch/update call
+
+Values that have not changed since the last successful update are not
+sent again; if nothing changed, no request is made at all.
+
+Requests go through http_client, so the TLS connection to the server is
+kept alive between cycles. The server URL is configurable so the client
+can be tested against a local stand-in HTTP server.
+"""
+import json
+import http_client
+
+BLYNK_SERVER = "https://blynk.cloud"   # Blynk cloud base URL
+REQUEST_TIMEOUT = 10                   # HTTP request timeout in seconds
+
+
+def _quote(value):
+    """Minimal URL encoding for pin values"""
+    out = []
+    for c in str(value):
+        if c.isalpha() or c.isdigit() or c in "-_.~":
+            out.append(c)
+        else:
+            for b in c.encode("utf-8"):
+                out.append("%%%02X" % b)
+    return "".join(out)
+
+
+class BlynkClient:
+    """
+    Blynk HTTP API client
+
+    Args:
+        token: Blynk device auth token
+        server: Base URL of the Blynk server
+    """
+
+    def __init__(self, token, server=BLYNK_SERVER):
+        self.token = token
+        self.server = server
+        self.last_sent = {}     # pin -> value string last written successfully
+
+    def _request(self, endpoint, query):
+        """
+        Perform one GET request
+
+        Returns:
+            str: Response body, or None on failure
+        """
+        url = f"{self.server}/external/api/{endpoint}?token={self.token}&{query}"
+        response = None
+        try:
+            response = http_client.get(url, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 200:
+                return response.text
+            print(f"❌ Blynk {endpoint} failed. Status: {response.status_code}")
+        except Exception as e:
+            print(f"❌ Blynk {endpoint} error: {e}")
+        finally:
+            if response:
+                response.close()
+        return None
+
+    def get(self, *pins):
+        """
+        Read several virtual pins in one request
+
+        Args:
+            pins: Virtual pin names (e.g., "V0", "V1")
+
+        Returns:
+            dict: pin -> value string, or None if the request failed
+        """
+        body = self._request("get", "&".join(pins))
+        if body is None:
+            return None
+        body = body.strip()
+        if len(pins) == 1:
+            # Single-pin reads return the bare value, not JSON
+            return {pins[0]: body}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            print("❌ Invalid Blynk response")
+            return None
+        values = {}
+        for pin in pins:
+            # Blynk echoes keys in the case they were requested; accept either
+            value = data.get(pin, data.get(pin.lower(), data.get(pin.upper())))
+            if value is not None:
+                values[pin] = str(value)
+        return values
+
+    def update(self, values):
+        """
+        Write several virtual pins in one request, skipping unchanged ones
+
+        Args:
+            values: dict of pin -> value
+
+        Returns:
+            bool: True if the pins are up to date on the server
+        """
+        changed = {}
+        for pin in values:
+            value = str(values[pin])
+            if self.last_sent.get(pin) != value:
+                changed[pin] = value
+        if not changed:
+            return True
+
+        query = "&".join(f"{pin}={_quote(changed[pin])}" for pin in changed)
+        if self._request("batch/update", query) is None:
+            return False
+        self.last_sent.update(changed)
+        print(f"✓ Updated {', '.join(f'{pin}={changed[pin]}' for pin in changed)}")
+        return True
+
+    def reset_cache(self):
+        """Forget last-sent values so the next update() writes every pin"""
+        self.last_sent.clear()
@@ -0,0 +1,36 @@
+"""
+Precompress Web Assets
+
+Run on your computer (CPython) before copying the web examples to the
+Pico W:
+
+    python build_assets.py
+
+Every text asset in the www folder gets a gzip-compressed "<name>.gz"
+sibling. Upload the www folder (including the .gz files) to the board;
+static_assets.py serves the compressed version to browsers that accept it.
+"""
+import gzip
+import os
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "www")
+COMPRESS_EXTENSIONS = (".css", ".js", ".html", ".json", ".svg")
+
+
+def build(asset_dir=ASSET_DIR):
+    """Write a .gz next to every compressible file in asset_dir"""
+    for name in sorted(os.listdir(asset_dir)):
+        if not name.endswith(COMPRESS_EXTENSIONS):
+            continue
+        src = os.path.join(asset_dir, name)
+        with open(src, "rb") as f:
+            data = f.read()
+        # mtime=0 keeps the output (and therefore the ETag) stable between builds
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        with open(src + ".gz", "wb") as f:
+            f.write(packed)
+        print(f"{name}: {len(data)} -> {len(packed)} bytes")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,38 @@
+"""
+Build the Binary Song Library
+
+Run on your computer (CPython) or on the board after editing the songs
+in play_music.py:
+
+    python build_songs.py
+
+The melodies are packed into songs.bin (see song_library.py for the
+format). Upload songs.bin next to the programs; they then load a song
+only when it is played instead of importing every list in play_music.py.
+"""
+from play_music import song, tempo
+from song_library import SONG_FILE, write_library
+
+
+def _script_folder():
+    """Folder of this script ('' for the current one); no os.path on MicroPython"""
+    try:
+        path = __file__
+    except NameError:
+        return ""
+    cut = max(path.rfind("/"), path.rfind("\\"))
+    return path[:cut + 1] if cut >= 0 else ""
+
+
+OUTPUT_FILE = _script_folder() + SONG_FILE
+
+
+def build(path=OUTPUT_FILE):
+    """Write every song from play_music.py into the library file"""
+    size = write_library(song, path, tempo)
+    notes = sum(len(song[name]) // 2 for name in song)
+    print(f"{len(song)} songs, {notes} notes -> {size} bytes")
+
+
+if __name__ == "__main__":
+    build()
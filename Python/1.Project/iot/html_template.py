@@ -0,0 +1,74 @@
+"""
+Pre-rendered HTML Templates
+
+Splits a page into static and dynamic parts once at startup. The static
+parts are encoded to bytes a single time; each request only formats the
+few dynamic fields and hands the chunk list to the HTTP server, which
+writes them out one after another without joining them into a new string.
+
+Template syntax is the plain subset of str.format: {name} is a field,
+{{ and }} are literal braces (so existing CSS/JS written for .format works
+unchanged). Format specs and conversions ({name:spec}, {name!r}) are not
+supported; format such values before passing them to render().
+"""
+
+
+class Template:
+    """
+    Pre-encoded template
+
+    Args:
+        text: Template source with bare {name} fields and {{ }} escapes
+
+    Raises:
+        ValueError: On an unclosed or empty field, or one with a format
+                    spec or conversion
+    """
+
+    def __init__(self, text):
+        self.chunks = []    # Static bytes, with None where a field goes
+        self.fields = []    # (chunk index, field name)
+        static = []
+        i = 0
+        n = len(text)
+        while i < n:
+            c = text[i]
+            if c in "{}" and i + 1 < n and text[i + 1] == c:
+                static.append(c)
+                i += 2
+            elif c == "{":
+                end = text.find("}", i)
+                if end < 0:
+                    raise ValueError("Unclosed field at position %d" % i)
+                name = text[i + 1:end]
+                if not name or ":" in name or "!" in name or "{" in name:
+                    raise ValueError("Unsupported field {%s}: only bare {name} fields" % name)
+                self._flush(static)
+                self.fields.append((len(self.chunks), name))
+                self.chunks.append(None)
+                i = end + 1
+            else:
+                # Copy the run of plain text up to the next brace in one go
+                j = i + 1
+                while j < n and text[j] not in "{}":
+                    j += 1
+                static.append(text[i:j])
+                i = j
+        self._flush(static)
+
+    def _flush(self, static):
+        if static:
+            self.chunks.append("".join(static).encode("utf-8"))
+            static.clear()
+
+    def render(self, **values):
+        """
+        Fill in the dynamic fields
+
+        Returns:
+            list: Byte chunks ready to be written in order
+        """
+        out = list(self.chunks)
+        for index, name in self.fields:
+            out[index] = str(values[name]).encode("utf-8")
+        return out
@@ -0,0 +1,377 @@
+"""
+Persistent HTTP/1.1 Client
+
+Drop-in replacement for the urequests.get calls in the IoT examples that
+avoids paying for DNS, TCP and TLS on every request:
+- Idle connections are kept per host and reused (HTTP keep-alive)
+- DNS lookups are cached for DNS_CACHE_TTL seconds
+- TLS sessions are resumed on reconnect where the ssl module supports it
+  (CPython); on MicroPython the kept-alive connection avoids the handshake
+- Response bodies can be streamed into a caller-supplied buffer with
+  Response.readinto(), or read whole with .content / .text / .json()
+
+Runs on MicroPython and CPython, so it can be tested against a local server.
+"""
+import json
+try:
+    import usocket as socket
+except ImportError:
+    import socket
+try:
+    import ssl
+except ImportError:
+    import ussl as ssl
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    from time import monotonic
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+# Client configuration
+DEFAULT_TIMEOUT = 10           # Socket timeout in seconds
+DNS_CACHE_TTL = 300            # Seconds a resolved address is reused
+POOL_IDLE_TIMEOUT = 30         # Seconds an idle kept-alive connection is reused
+MAX_IDLE_PER_HOST = 1          # Idle connections kept per host
+RECV_BUFFER_SIZE = 512         # Per-connection receive buffer
+MAX_HEADER_LINE = 1024         # Longest accepted response header line
+
+
+def parse_url(url):
+    """
+    Split a URL into its parts
+
+    Returns:
+        tuple: (scheme, host, port, path)
+    """
+    scheme, _, rest = url.partition("://")
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL: {url}")
+    host, sep, path = rest.partition("/")
+    path = sep + path if sep else "/"
+    port = 443 if scheme == "https" else 80
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    return scheme, host, port, path
+
+
+class _Connection:
+    """Socket with a small read buffer, so header lines can be read without a file object"""
+
+    def __init__(self, sock, key, raw=None):
+        self.sock = sock
+        self.raw = raw if raw is not None else sock  # Socket under TLS, if any
+        self.key = key
+        self.buf = bytearray(RECV_BUFFER_SIZE)
+        self.mv = memoryview(self.buf)
+        self.start = 0
+        self.end = 0
+        self.idle_since = 0
+        self.reused = False
+        try:
+            self._recv_into = sock.recv_into
+        except AttributeError:
+            self._recv_into = sock.readinto
+        try:
+            self._send = sock.sendall
+        except AttributeError:
+            self._send = sock.write
+
+    def send(self, data):
+        self._send(data)
+
+    def settimeout(self, timeout):
+        # MicroPython SSL sockets have no settimeout; the raw socket has
+        sock = self.sock if hasattr(self.sock, "settimeout") else self.raw
+        sock.settimeout(timeout)
+
+    def _fill(self):
+        self.start = 0
+        self.end = self._recv_into(self.mv) or 0
+        return self.end
+
+    def readline(self):
+        """Read one line including its line ending; b'' at EOF"""
+        line = b""
+        while True:
+            if self.start == self.end and not self._fill():
+                return line
+            i = self.start
+            while i < self.end and self.buf[i] != 10:
+                i += 1
+            if i < self.end:
+                line += bytes(self.mv[self.start:i + 1])
+                self.start = i + 1
+                return line
+            line += bytes(self.mv[self.start:self.end])
+            self.start = self.end
+            if len(line) > MAX_HEADER_LINE:
+                raise OSError("Header line too long")
+
+    def readinto(self, mv):
+        """Read up to len(mv) bytes, serving buffered data first; 0 at EOF"""
+        if self.start < self.end:
+            n = min(len(mv), self.end - self.start)
+            mv[:n] = self.mv[self.start:self.start + n]
+            self.start += n
+            return n
+        return self._recv_into(mv) or 0
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class Response:
+    """
+    HTTP response with a streamed body
+
+    Attributes:
+        status_code: HTTP status code
+        headers: dict of lowercase header name -> value
+    """
+
+    def __init__(self, client, conn, status, headers, no_body):
+        self.client = client
+        self.conn = conn
+        self.status_code = status
+        self.headers = headers
+        self._chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        self._chunk_left = 0
+        length = headers.get("content-length")
+        self._remaining = int(length) if length is not None else None
+        self._keep_alive = headers.get("connection", "").lower() != "close" and (
+            self._chunked or self._remaining is not None or no_body)
+        self._done = no_body or self._remaining == 0
+        self._content = None
+
+    def readinto(self, buf):
+        """
+        Stream the next part of the body into buf
+
+        Returns:
+            int: Bytes written to buf, 0 once the body is complete
+        """
+        if self._done:
+            return 0
+        mv = memoryview(buf)
+        if self._chunked:
+            if self._chunk_left == 0:
+                size = int(self.conn.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while self.conn.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._finish()
+                    return 0
+                self._chunk_left = size
+            n = self.conn.readinto(mv[:min(len(mv), self._chunk_left)])
+            if not n:
+                raise OSError("Connection closed mid-chunk")
+            self._chunk_left -= n
+            if self._chunk_left == 0:
+                self.conn.readline()  # CRLF after chunk data
+            return n
+        if self._remaining is not None:
+            mv = mv[:min(len(mv), self._remaining)]
+        n = self.conn.readinto(mv)
+        if self._remaining is not None:
+            if not n:
+                raise OSError("Connection closed before end of body")
+            self._remaining -= n
+            if self._remaining == 0:
+                self._finish()
+        elif not n:
+            self._finish()
+        return n
+
+    def _finish(self):
+        self._done = True
+        self.close()
+
+    @property
+    def content(self):
+        """Whole body as bytes (reads it into memory)"""
+        if self._content is None:
+            parts = []
+            buf = bytearray(RECV_BUFFER_SIZE)
+            while True:
+                n = self.readinto(buf)
+                if not n:
+                    break
+                parts.append(bytes(buf[:n]))
+            self._content = b"".join(parts)
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        """Release the connection: back to the pool if the body was fully read"""
+        conn = self.conn
+        if conn is None:
+            return
+        self.conn = None
+        if self._done and self._keep_alive:
+            self.client._release(conn)
+        else:
+            conn.close()
+
+
+class HTTPClient:
+    """
+    HTTP/1.1 client with a keep-alive connection pool
+
+    Args:
+        timeout: Socket timeout in seconds
+        dns_ttl: Seconds to cache DNS results
+        max_idle_per_host: Idle connections kept per host
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, dns_ttl=DNS_CACHE_TTL, max_idle_per_host=MAX_IDLE_PER_HOST):
+        self.timeout = timeout
+        self.dns_ttl = dns_ttl
+        self.max_idle_per_host = max_idle_per_host
+        self._dns = {}          # (host, port) -> (address, resolved at ms)
+        self._pool = {}         # (scheme, host, port) -> [idle _Connection]
+        self._tls_sessions = {} # host -> ssl session (CPython only)
+        self._tls_context = None
+
+    def resolve(self, host, port):
+        """Resolve host, using the cached address while it is fresh"""
+        key = (host, port)
+        entry = self._dns.get(key)
+        now = ticks_ms()
+        if entry and ticks_diff(now, entry[1]) < self.dns_ttl * 1000:
+            return entry[0]
+        addr = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][-1]
+        self._dns[key] = (addr, now)
+        return addr
+
+    def _wrap_tls(self, sock, host):
+        if hasattr(ssl, "create_default_context"):
+            # CPython: verify certificates and resume the previous session
+            if self._tls_context is None:
+                self._tls_context = ssl.create_default_context()
+            sock = self._tls_context.wrap_socket(
+                sock, server_hostname=host, session=self._tls_sessions.get(host))
+            self._tls_sessions[host] = sock.session
+            return sock
+        return ssl.wrap_socket(sock, server_hostname=host)
+
+    def _connect(self, scheme, host, port, timeout):
+        key = (scheme, host, port)
+        idle = self._pool.get(key)
+        now = ticks_ms()
+        while idle:
+            conn = idle.pop()
+            if ticks_diff(now, conn.idle_since) < POOL_IDLE_TIMEOUT * 1000:
+                try:
+                    conn.settimeout(timeout)
+                except Exception:
+                    conn.close()
+                    continue
+                conn.reused = True
+                return conn
+            conn.close()
+
+        raw = sock = socket.socket()
+        try:
+            sock.settimeout(timeout)
+            sock.connect(self.resolve(host, port))
+            if scheme == "https":
+                sock = self._wrap_tls(sock, host)
+        except Exception:
+            sock.close()
+            # Address may have changed; resolve again next time
+            self._dns.pop((host, port), None)
+            raise
+        return _Connection(sock, key, raw)
+
+    def _release(self, conn):
+        idle = self._pool.setdefault(conn.key, [])
+        if len(idle) < self.max_idle_per_host:
+            conn.idle_since = ticks_ms()
+            idle.append(conn)
+        else:
+            conn.close()
+
+    def request(self, method, url, headers=None, body=None, timeout=None):
+        """
+        Send a request and read the response headers
+
+        The returned Response must be read to the end (or closed) before
+        its connection can be reused.
+        """
+        scheme, host, port, path = parse_url(url)
+        if timeout is None:
+            timeout = self.timeout
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+        if headers:
+            for name in headers:
+                head += f"{name}: {headers[name]}\r\n"
+        if body:
+            head += f"Content-Length: {len(body)}\r\n"
+        head = (head + "\r\n").encode()
+
+        for attempt in range(2):
+            conn = self._connect(scheme, host, port, timeout)
+            try:
+                conn.send(head)
+                if body:
+                    conn.send(body)
+                status_line = conn.readline()
+                if not status_line:
+                    raise OSError("Connection closed by server")
+                break
+            except OSError:
+                conn.close()
+                # A pooled connection may have been closed by the server while
+                # idle; retry once on a fresh connection
+                if not conn.reused or attempt:
+                    raise
+
+        parts = status_line.split(None, 2)
+        status = int(parts[1])
+        resp_headers = {}
+        while True:
+            line = conn.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            resp_headers[name.strip().lower()] = value.strip()
+        no_body = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+        return Response(self, conn, status, resp_headers, no_body)
+
+    def get(self, url, headers=None, timeout=None):
+        return self.request("GET", url, headers, None, timeout)
+
+    def close(self):
+        """Close every pooled connection"""
+        for idle in self._pool.values():
+            for conn in idle:
+                conn.close()
+        self._pool.clear()
+
+
+# Shared by all modules that import http_client, so they share one pool
+default_client = HTTPClient()
+
+
+def get(url, headers=None, timeout=None):
+    """GET through the shared client (urequests.get compatible for status_code/text/json/close)"""
+    return default_client.get(url, headers, timeout)
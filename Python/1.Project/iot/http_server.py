@@ -0,0 +1,384 @@
+"""
+Asynchronous HTTP/1.1 Server
+
+Small asyncio web server shared by the IoT examples. Serves several
+clients at once, keeps connections alive between requests and rejects
+oversized requests instead of running out of RAM.
+
+Runs unchanged on MicroPython (asyncio / uasyncio) and CPython, so it can
+be load-tested on a PC:  python http_server.py
+"""
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# Server limits
+MAX_CONNECTIONS = 4            # Concurrent client connections
+MAX_REQUEST_LINE = 512         # Longest accepted request line / header line
+MAX_HEADER_COUNT = 24          # Header lines per request
+MAX_BODY_SIZE = 2048           # Largest accepted request body
+KEEPALIVE_TIMEOUT = 5          # Idle seconds before closing a kept-alive connection
+FILE_CHUNK_SIZE = 512          # Bytes read from flash per write when streaming a file
+
+STATUS_TEXT = {
+    200: "OK",
+    204: "No Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """Raised while parsing a request; carries the HTTP status to answer with"""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class Request:
+    """Parsed HTTP request: method, path, query dict, headers (lowercase names) and body"""
+
+    def __init__(self, method, path, query, version, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+
+class Response:
+    """
+    HTTP response
+
+    Args:
+        body: bytes, str, a list/tuple of byte chunks written in order, or an
+              open binary file streamed in FILE_CHUNK_SIZE pieces (needs length)
+        status: HTTP status code
+        content_type: Value of the Content-Type header
+        headers: Optional dict of extra headers
+        length: Body size in bytes when body is a file
+    """
+
+    def __init__(self, body=b"", status=200, content_type="text/html", headers=None, length=None):
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.headers = headers
+        self.length = length
+
+
+def parse_query(qs):
+    """Decode 'a=1&b=2' into a dict (no percent-decoding, values are str)"""
+    query = {}
+    if qs:
+        for pair in qs.split("&"):
+            key, _, value = pair.partition("=")
+            if key:
+                query[key] = value
+    return query
+
+
+class RequestReader:
+    """
+    Stream reader with a bounded readline
+
+    Reads at most limit + 1 bytes ahead while looking for the end of a line,
+    so an endless request line cannot fill RAM. Bytes read past the line are
+    kept for the next call (pipelined requests, bodies).
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.buf = b""
+
+    async def readline(self, limit=MAX_REQUEST_LINE):
+        """Read one line including its ending; b'' at EOF"""
+        while True:
+            i = self.buf.find(b"\n")
+            if 0 <= i < limit:
+                line = self.buf[:i + 1]
+                self.buf = self.buf[i + 1:]
+                return line
+            if i >= limit or len(self.buf) >= limit:
+                raise RequestError(431)
+            chunk = await self.reader.read(limit - len(self.buf))
+            if not chunk:
+                line = self.buf         # Partial line (or b'') at EOF
+                self.buf = b""
+                return line
+            self.buf += chunk
+
+    async def readexactly(self, n):
+        data = self.buf[:n]
+        self.buf = self.buf[n:]
+        if len(data) < n:
+            data += await self.reader.readexactly(n - len(data))
+        return data
+
+
+async def read_request(reader):
+    """
+    Read one request from the stream
+
+    Args:
+        reader: RequestReader wrapping the connection's stream; keep using
+                the same one for every request on a connection
+
+    Returns:
+        Request, or None if the client closed the connection
+
+    Raises:
+        RequestError: If the request is malformed or over the size limits
+    """
+    line = await reader.readline(MAX_REQUEST_LINE)
+    if not line:
+        return None
+    try:
+        if not line.endswith(b"\n"):
+            raise ValueError("truncated line")
+        method, target, version = line.decode().split()
+    except (ValueError, UnicodeError):
+        raise RequestError(400)
+
+    headers = {}
+    while True:
+        line = await reader.readline(MAX_REQUEST_LINE)
+        if not line:
+            return None
+        if line in (b"\r\n", b"\n"):
+            break
+        if len(headers) >= MAX_HEADER_COUNT:
+            raise RequestError(431)
+        try:
+            name, sep, value = line.decode().partition(":")
+        except UnicodeError:
+            raise RequestError(400)
+        if not sep or not line.endswith(b"\n"):
+            raise RequestError(400)
+        headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    length = headers.get("content-length")
+    if length:
+        try:
+            length = int(length)
+        except ValueError:
+            raise RequestError(400)
+        if length < 0:
+            raise RequestError(400)
+        if length > MAX_BODY_SIZE:
+            raise RequestError(413)
+        body = await reader.readexactly(length)
+
+    path, _, qs = target.partition("?")
+    return Request(method, path, parse_query(qs), version, headers, body)
+
+
+class HTTPServer:
+    """
+    Routing asyncio HTTP server
+
+    Handlers are coroutines taking a Request and returning a Response,
+    bytes or str:
+
+        app = HTTPServer()
+
+        @app.route("/")
+        async def index(request):
+            return "<h1>Hello</h1>"
+
+        asyncio.run(app.serve(port=80))
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self.routes = {}
+        self.max_connections = max_connections
+        self.active = 0
+        self.server = None
+
+    def route(self, path, methods=("GET",)):
+        """Decorator registering a handler for path"""
+        def register(handler):
+            for method in methods:
+                self.routes[(method, path)] = handler
+            return handler
+        return register
+
+    def add_route(self, path, handler, methods=("GET",)):
+        """Register a handler without the decorator syntax"""
+        self.route(path, methods)(handler)
+
+    async def start(self, host="0.0.0.0", port=80):
+        """Start listening; returns the asyncio server object"""
+        self.server = await asyncio.start_server(self._serve_client, host, port)
+        return self.server
+
+    async def serve(self, host="0.0.0.0", port=80):
+        """Start listening and run until cancelled"""
+        await self.start(host, port)
+        while True:
+            await asyncio.sleep(3600)
+
+    async def _dispatch(self, request):
+        handler = self.routes.get((request.method, request.path))
+        if handler is None and request.method == "HEAD":
+            # HEAD runs the GET handler; _send leaves out the body
+            handler = self.routes.get(("GET", request.path))
+        if handler is None:
+            for method, path in self.routes:
+                if path == request.path:
+                    return Response(b"Method Not Allowed", 405, "text/plain")
+            return Response(b"Not Found", 404, "text/plain")
+        result = await handler(request)
+        if isinstance(result, Response):
+            return result
+        return Response(result)
+
+    async def _send(self, writer, response, keep_alive, head_only=False):
+        body = response.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        stream = hasattr(body, "readinto")
+        if stream:
+            chunks = ()
+            length = response.length
+        else:
+            chunks = (body,) if isinstance(body, (bytes, bytearray, memoryview)) else body
+            length = 0
+            for chunk in chunks:
+                length += len(chunk)
+
+        head = "HTTP/1.1 %d %s\r\nConnection: %s\r\n" % (
+            response.status, STATUS_TEXT.get(response.status, ""),
+            "keep-alive" if keep_alive else "close")
+        if response.status != 304:
+            head += "Content-Length: %d\r\n" % length
+            if response.content_type:
+                head += "Content-Type: %s\r\n" % response.content_type
+        if response.headers:
+            for name in response.headers:
+                head += "%s: %s\r\n" % (name, response.headers[name])
+        writer.write((head + "\r\n").encode())
+        try:
+            if head_only:
+                pass
+            elif stream:
+                # One buffer per file; the stream writer copies whatever
+                # it cannot send straight away, so buf is safe to refill
+                buf = bytearray(FILE_CHUNK_SIZE)
+                mv = memoryview(buf)
+                while True:
+                    n = body.readinto(buf)
+                    if not n:
+                        break
+                    writer.write(mv[:n])
+                    await writer.drain()
+            else:
+                for chunk in chunks:
+                    writer.write(chunk)
+            await writer.drain()
+        finally:
+            if stream:
+                body.close()
+
+    async def _serve_client(self, reader, writer):
+        if self.active >= self.max_connections:
+            try:
+                await self._send(writer, Response(b"Busy", 503, "text/plain"), False)
+            finally:
+                await self._close(writer)
+            return
+
+        self.active += 1
+        try:
+            keep_alive = True
+            stream = RequestReader(reader)
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(read_request(stream), KEEPALIVE_TIMEOUT)
+                except RequestError as e:
+                    await self._send(writer, Response(STATUS_TEXT[e.status], e.status, "text/plain"), False)
+                    break
+                except (asyncio.TimeoutError, EOFError):
+                    break
+                if request is None:
+                    break
+
+                connection = request.headers.get("connection", "").lower()
+                if request.version == "HTTP/1.0":
+                    keep_alive = connection == "keep-alive"
+                else:
+                    keep_alive = connection != "close"
+
+                try:
+                    response = await self._dispatch(request)
+                except Exception as e:
+                    print(f"Handler error on {request.path}: {e}")
+                    response = Response(b"Internal Server Error", 500, "text/plain")
+                    keep_alive = False
+                await self._send(writer, response, keep_alive, request.method == "HEAD")
+        except OSError as e:
+            print(f"Client connection error: {e}")
+        finally:
+            self.active -= 1
+            await self._close(writer)
+
+    async def _close(self, writer):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+# Load generator - CPython only, used to benchmark the server on a PC
+async def _load_worker(host, port, path, count, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = ("GET %s HTTP/1.1\r\nHost: %s\r\n\r\n" % (path, host)).encode()
+    for _ in range(count):
+        writer.write(request)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        stats[0] += 1
+    writer.close()
+
+
+async def benchmark(host="127.0.0.1", port=8080, path="/", clients=8, requests=500):
+    """Run `clients` keep-alive connections against a server and print requests/s"""
+    import time
+    stats = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*[_load_worker(host, port, path, requests, stats) for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+    print(f"{stats[0]} requests in {elapsed:.2f}s: {stats[0] / elapsed:.0f} req/s")
+
+
+# Demo/benchmark - runs when file is executed directly on a PC
+if __name__ == "__main__":
+    app = HTTPServer(max_connections=16)
+
+    @app.route("/")
+    async def index(request):
+        return "<h1>Hello from http_server</h1>"
+
+    async def main():
+        await app.start("127.0.0.1", 8080)
+        await benchmark()
+
+    asyncio.run(main())
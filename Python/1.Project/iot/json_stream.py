@@ -0,0 +1,239 @@
+"""
+Streaming JSON Field Extractor
+
+Pulls a few values out of a large JSON response without building the
+whole object tree. The body is read in small chunks and scanned byte by
+byte; only the requested key paths are kept.
+
+Paths use dots between keys and array indexes, e.g.:
+    extract(response, ("main.temp", "weather.0.main", "field2"))
+    -> {"main.temp": 23.4, "weather.0.main": "Clouds", "field2": "#ff0000"}
+
+Paths must lead to strings, numbers, booleans or null; paths that are
+missing from the document are simply absent from the result. Reading
+stops as soon as every requested path has been found.
+"""
+import json
+
+SCAN_CHUNK_SIZE = 128          # Bytes read from the stream per step
+
+# Scanner states
+_VALUE = 0                     # Expecting a value
+_KEY = 1                       # Expecting an object key or '}'
+_COLON = 2                     # Expecting ':' after a key
+_AFTER = 3                     # Expecting ',' or a closing bracket
+_STRING = 4                    # Inside a string
+_SCALAR = 5                    # Inside a number / true / false / null
+
+_WHITESPACE = b" \t\r\n"
+_SCALAR_END = b" \t\r\n,]}"
+
+
+class FieldScanner:
+    """
+    Incremental scanner; feed() it chunks of a JSON document
+
+    Args:
+        paths: Dotted key paths to extract
+    """
+
+    def __init__(self, paths):
+        self.targets = {}
+        self.prefixes = set()
+        for path in paths:
+            parts = tuple(path.split("."))
+            self.targets[parts] = path
+            for i in range(len(parts)):
+                self.prefixes.add(parts[:i])
+        self.values = {}
+        self.state = _VALUE
+        self.stack = []        # Per open container: array index, or -1 for objects
+        self.path = []         # Key / index per level; None where no target can match
+        self.token = bytearray()
+        self.collect = False   # Keep bytes of the current string / scalar
+        self.is_key = False
+        self.escape = False
+
+    @property
+    def done(self):
+        """True once every requested path has been found"""
+        return len(self.values) == len(self.targets)
+
+    def _current(self):
+        # Path tuple of the value about to start, or None if it cannot match
+        if None in self.path:
+            return None
+        return tuple(self.path)
+
+    def _end_value(self):
+        if self.collect:
+            self.values[self.targets[tuple(self.path)]] = json.loads(bytes(self.token))
+            self.token = bytearray()
+            self.collect = False
+        self.state = _AFTER
+
+    def _start_value(self, c):
+        path = self._current()
+        if c == 0x7B:  # '{'
+            self.stack.append(-1)
+            self.state = _KEY
+        elif c == 0x5B:  # '['
+            self.stack.append(0)
+            self.path.append("0" if path in self.prefixes else None)
+            self.state = _VALUE
+        else:
+            self.collect = path in self.targets
+            if self.collect:
+                self.token.append(c)
+            if c == 0x22:  # '"'
+                self.is_key = False
+                self.state = _STRING
+            else:
+                self.state = _SCALAR
+
+    def _close(self):
+        # Leave the innermost container; it was the value of its parent
+        if self.stack.pop() >= 0:
+            self.path.pop()
+        self.state = _AFTER
+
+    def feed(self, data):
+        """Scan the next chunk (bytes, bytearray or memoryview)"""
+        for c in data:
+            state = self.state
+            if state == _STRING:
+                if self.collect:
+                    self.token.append(c)
+                if self.escape:
+                    self.escape = False
+                elif c == 0x5C:  # '\'
+                    self.escape = True
+                elif c == 0x22:  # closing '"'
+                    if self.is_key:
+                        if self.collect:
+                            self.path.append(json.loads(bytes(self.token)))
+                            self.token = bytearray()
+                            self.collect = False
+                        else:
+                            self.path.append(None)
+                        self.state = _COLON
+                    else:
+                        self._end_value()
+            elif state == _SCALAR:
+                if c in _SCALAR_END:
+                    self._end_value()
+                    self._structural(c)
+                elif self.collect:
+                    self.token.append(c)
+            elif c not in _WHITESPACE:
+                self._structural(c)
+
+    def _structural(self, c):
+        state = self.state
+        if c in _WHITESPACE:
+            return
+        if state == _VALUE:
+            if c == 0x5D and self.stack and self.stack[-1] == 0:  # ']' of an empty array
+                self._close()
+            else:
+                self._start_value(c)
+        elif state == _KEY:
+            if c == 0x22:
+                path = self._current()
+                self.collect = path is not None and path in self.prefixes
+                if self.collect:
+                    self.token.append(c)
+                self.is_key = True
+                self.state = _STRING
+            elif c == 0x7D:  # '}' of an empty object
+                self._close()
+        elif state == _COLON:
+            if c == 0x3A:
+                self.state = _VALUE
+        elif state == _AFTER:
+            if c == 0x2C:  # ','
+                index = self.stack[-1]
+                self.path.pop()
+                if index < 0:
+                    self.state = _KEY
+                else:
+                    self.stack[-1] = index + 1
+                    parent = self._current()
+                    self.path.append(str(index + 1) if parent in self.prefixes else None)
+                    self.state = _VALUE
+            elif c == 0x7D:  # '}'
+                self.path.pop()
+                self._close()
+            elif c == 0x5D:  # ']'
+                self._close()
+
+
+def extract(stream, paths, buf=None):
+    """
+    Read a JSON document from stream and return only the requested fields
+
+    Args:
+        stream: Object with readinto(), e.g. an http_client Response
+        paths: Dotted key paths to extract
+        buf: Optional preallocated read buffer
+
+    Returns:
+        dict: path -> value for every path found
+    """
+    scanner = FieldScanner(paths)
+    if buf is None:
+        buf = bytearray(SCAN_CHUNK_SIZE)
+    mv = memoryview(buf)
+    while not scanner.done:
+        n = stream.readinto(buf)
+        if not n:
+            break
+        scanner.feed(mv[:n])
+    return scanner.values
+
+
+def benchmark(copies=40):
+    """Compare peak memory of json.loads against extract() on a large payload"""
+    import io
+    import gc
+    record = ('{"coord":{"lon":114.06,"lat":22.55},"weather":[{"id":803,"main":"Clouds",'
+              '"description":"broken clouds","icon":"04d"}],"main":{"temp":28.4,'
+              '"feels_like":32.1,"pressure":1008,"humidity":79},"name":"Shenzhen"}')
+    # Pad with a large list ahead of the wanted fields, like a forecast payload
+    payload = ('{"list":[' + ",".join([record] * copies) + '],' + record[1:]).encode()
+    paths = ("main.temp", "main.humidity", "weather.0.main")
+
+    def measure(fn):
+        gc.collect()
+        try:
+            import tracemalloc
+            tracemalloc.start()
+            result = fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        except ImportError:
+            # MicroPython: approximate peak as the allocation growth with GC disabled
+            gc.disable()
+            before = gc.mem_alloc()
+            result = fn()
+            peak = gc.mem_alloc() - before
+            gc.enable()
+        return result, peak
+
+    def full():
+        data = json.loads(io.BytesIO(payload).read())
+        return data["main"]["temp"], data["main"]["humidity"], data["weather"][0]["main"]
+
+    def streamed():
+        values = extract(io.BytesIO(payload), paths)
+        return tuple(values[p] for p in paths)
+
+    a, peak_full = measure(full)
+    b, peak_stream = measure(streamed)
+    print(f"payload: {len(payload)} bytes, values match: {a == b}")
+    print(f"json.loads peak: {peak_full} bytes")
+    print(f"extract peak:    {peak_stream} bytes")
+
+
+if __name__ == "__main__":
+    benchmark()
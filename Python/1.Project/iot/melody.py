@@ -0,0 +1,246 @@
+"""Melody Playback Module
+
+Tone generation, melody compilation and the non-blocking Sequencer.
+Kept apart from play_music.py so programs that load songs from the
+binary song library do not have to parse every built-in melody.
+"""
+
+import time
+import array
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# Musical timing constants
+DEFAULT_TEMPO = 220              # Default playback tempo (BPM)
+NOTE_PLAY_RATIO = 0.9            # Percentage of note duration to play (90%)
+PWM_DUTY_CYCLE = 30000           # PWM duty cycle for audio output
+SILENCE_DURATION = 100           # Default silence duration in ms
+MIN_TEMPO = 20                   # Slowest tempo the sequencer accepts (BPM)
+MAX_TEMPO = 1000                 # Fastest tempo the sequencer accepts (BPM)
+
+# Global tempo setting - modify to change playback speed
+tempo = DEFAULT_TEMPO
+
+# Calculate whole note duration in milliseconds based on tempo
+wholenote = (60000 * 4) / tempo
+
+def tone(pin, frequency, duration):
+    """
+    Generate a tone on the specified pin
+    
+    Args:
+        pin: PWM pin object for audio output
+        frequency: Tone frequency in Hz (0 for silence)
+        duration: Duration in milliseconds
+    """
+    if frequency == 0:
+        # Silence - no frequency output
+        pass
+    else:
+        # Generate tone with specified frequency
+        pin.freq(frequency)
+        pin.duty_u16(PWM_DUTY_CYCLE)
+    
+    time.sleep_ms(duration)
+    pin.duty_u16(0)  # Stop audio output
+
+def noTone(pin):
+    """
+    Stop audio output on the specified pin
+    
+    Args:
+        pin: PWM pin object to silence
+    """
+    tone(pin, 0, SILENCE_DURATION)
+
+def compile_melody(melody, tempo=DEFAULT_TEMPO):
+    """
+    Precompile a melody into timed events
+    
+    Durations are worked out once here, so playback needs no float math.
+    The note period matches the original player: the tone sounds for
+    NOTE_PLAY_RATIO of the note, then it waits the full note length plus
+    SILENCE_DURATION before the next one.
+    
+    Args:
+        melody: List containing alternating notes and durations
+        tempo: Tempo in BPM the event times are computed for
+    
+    Returns:
+        array: Flat unsigned 16-bit array of (frequency, on_ms, off_ms) events
+    """
+    whole = (60000 * 4) / tempo
+    events = array.array("H")
+    for note_index in range(0, len(melody), 2):
+        duration_divider = melody[note_index + 1]
+        if duration_divider == 0:
+            # Invalid duration, skip this note
+            continue
+        note_duration = whole / abs(duration_divider)
+        if duration_divider < 0:
+            # Dotted note duration (1.5x longer)
+            note_duration *= 1.5
+        events.append(melody[note_index])
+        events.append(int(note_duration * NOTE_PLAY_RATIO))
+        events.append(int(note_duration) + SILENCE_DURATION)
+    return events
+
+
+def play(pin, melody):
+    """
+    Play a melody on the specified PWM pin (blocks until it ends)
+    
+    Args:
+        pin: PWM pin object for audio output
+        melody: List containing alternating notes and durations
+    """
+    events = compile_melody(melody, tempo)
+    print(f"Playing melody with {len(events)//3} notes")
+    
+    for i in range(0, len(events), 3):
+        if events[i]:
+            pin.freq(events[i])
+            pin.duty_u16(PWM_DUTY_CYCLE)
+        time.sleep_ms(events[i + 1])
+        pin.duty_u16(0)
+        time.sleep_ms(events[i + 2])
+    
+    print("Melody playback completed")
+
+
+class Sequencer:
+    """
+    Non-blocking melody player
+    
+    Steps through precompiled events from a one-shot hardware Timer
+    callback, or from an asyncio task when no timer is given, so the CPU
+    is free between note edges.
+    
+    Args:
+        pin: PWM pin object for audio output
+        timer: machine.Timer to drive playback, or None to use asyncio
+    """
+    
+    def __init__(self, pin, timer=None):
+        self.pin = pin
+        self.timer = timer
+        self.events = array.array("H")
+        self.base_tempo = DEFAULT_TEMPO  # Tempo the events were compiled for
+        self.tempo = DEFAULT_TEMPO       # Current playback tempo
+        self.index = 0                   # Next (or sounding) note
+        self.playing = False
+        self._note_on = False            # In the on part of note `index`
+        self._task = None
+        self._callback = self._step      # Bound once; no allocation per note
+    
+    def __len__(self):
+        return len(self.events) // 3
+    
+    def load(self, melody, tempo=DEFAULT_TEMPO):
+        """
+        Stop playback and load a new melody
+        
+        Args:
+            melody: Note/duration list, or events from compile_melody()
+            tempo: Tempo the melody (or its events) is timed for
+        """
+        self.stop()
+        if not isinstance(melody, array.array):
+            melody = compile_melody(melody, tempo)
+        self.events = melody
+        self.base_tempo = tempo
+    
+    def play(self):
+        """Start (or restart) playback from the current position"""
+        if self.playing or self.index >= len(self):
+            return
+        self.playing = True
+        if self.timer is not None:
+            self._schedule(0)
+        else:
+            self._task = asyncio.create_task(self._run())
+    
+    def pause(self):
+        """Stop playback, keeping the position; the current note restarts on resume"""
+        if not self.playing:
+            return
+        self.playing = False
+        if self.timer is not None:
+            self.timer.deinit()
+        elif self._task:
+            self._task.cancel()
+            self._task = None
+        self._note_on = False
+        self.pin.duty_u16(0)
+    
+    def resume(self):
+        """Continue playback after pause()"""
+        self.play()
+    
+    def stop(self):
+        """Stop playback and rewind to the first note"""
+        self.pause()
+        self.index = 0
+    
+    def seek(self, index):
+        """Jump to note number index"""
+        was_playing = self.playing
+        self.pause()
+        self.index = max(0, min(index, len(self)))
+        if was_playing:
+            self.play()
+    
+    def set_tempo(self, tempo):
+        """
+        Change speed; takes effect from the next note edge
+
+        Raises:
+            ValueError: If tempo is outside MIN_TEMPO..MAX_TEMPO
+        """
+        tempo = int(tempo)
+        if not MIN_TEMPO <= tempo <= MAX_TEMPO:
+            raise ValueError("tempo must be %d-%d BPM" % (MIN_TEMPO, MAX_TEMPO))
+        self.tempo = tempo
+    
+    def _advance(self):
+        # Perform the next note edge; returns ms until the following one, or -1 at the end
+        events = self.events
+        i = self.index * 3
+        if self._note_on:
+            self.pin.duty_u16(0)
+            self._note_on = False
+            self.index += 1
+            return events[i + 2] * self.base_tempo // self.tempo
+        if i >= len(events):
+            self.playing = False
+            return -1
+        if events[i]:
+            self.pin.freq(events[i])
+            self.pin.duty_u16(PWM_DUTY_CYCLE)
+        self._note_on = True
+        return events[i + 1] * self.base_tempo // self.tempo
+    
+    def _schedule(self, delay):
+        self.timer.init(mode=self.timer.ONE_SHOT, period=max(delay, 1), callback=self._callback)
+    
+    def _step(self, timer):
+        if not self.playing:
+            return
+        delay = self._advance()
+        if delay >= 0:
+            self._schedule(delay)
+    
+    async def _run(self):
+        while self.playing:
+            delay = self._advance()
+            if delay < 0:
+                break
+            await asyncio.sleep_ms(delay)
+        self._task = None
+    
+    async def wait(self):
+        """Wait until playback ends or is paused"""
+        while self.playing:
+            await asyncio.sleep_ms(SILENCE_DURATION)
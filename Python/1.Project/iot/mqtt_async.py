@@ -0,0 +1,233 @@
+"""
+Event-driven asyncio MQTT Client
+
+Minimal MQTT 3.1.1 client (QoS 0/1 receive, QoS 0 publish) built on
+asyncio streams, replacing the umqtt.simple polling pattern:
+- Topics are subscribed once per connection, not on every loop
+- Keepalive pings and reconnects (with backoff) run in the background
+- Incoming messages go into a bounded queue; await client.get() to read
+  them. When the queue is full the oldest message is dropped.
+
+Runs on MicroPython and CPython, so it can be tested against a local
+broker stand-in.
+"""
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# Client configuration
+DEFAULT_PORT = 1883            # Plain MQTT port
+DEFAULT_KEEPALIVE = 60         # Seconds; a PINGREQ is sent every half of this
+QUEUE_SIZE = 4                 # Messages buffered before the oldest is dropped
+RECONNECT_DELAY_MIN = 1        # First reconnect delay in seconds
+RECONNECT_DELAY_MAX = 30       # Longest reconnect delay in seconds
+MAX_PACKET_SIZE = 4096         # Largest packet body accepted; bigger ones drop the connection
+
+# Packet types (upper nibble of the fixed header)
+CONNECT = 0x10
+CONNACK = 0x20
+PUBLISH = 0x30
+PUBACK = 0x40
+SUBSCRIBE = 0x82               # Includes the mandatory 0b0010 flags
+SUBACK = 0x90
+PINGREQ = 0xC0
+PINGRESP = 0xD0
+DISCONNECT = 0xE0
+
+
+def _encode_length(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        out.append(byte | 0x80 if n else byte)
+        if not n:
+            return out
+
+
+def _string(s):
+    if isinstance(s, str):
+        s = s.encode()
+    return len(s).to_bytes(2, "big") + s
+
+
+def _packet(header, body):
+    return bytes([header]) + _encode_length(len(body)) + body
+
+
+class MQTTClient:
+    """
+    asyncio MQTT client
+
+    Args:
+        client_id: Unique client identifier
+        server: Broker host name or IP
+        port: Broker port
+        keepalive: Keepalive interval in seconds
+        queue_size: Messages buffered for get()
+    """
+
+    def __init__(self, client_id, server, port=DEFAULT_PORT, keepalive=DEFAULT_KEEPALIVE, queue_size=QUEUE_SIZE):
+        self.client_id = client_id
+        self.server = server
+        self.port = port
+        self.keepalive = keepalive
+        self.queue_size = queue_size
+        self.topics = {}               # topic -> qos, resubscribed on every connect
+        self.connected = asyncio.Event()
+        self._queue = []
+        self._queue_event = asyncio.Event()
+        self._reader = None
+        self._writer = None
+        self._write_lock = asyncio.Lock()
+        self._packet_id = 0
+        self._task = None
+        self._running = False
+
+    def subscribe(self, topic, qos=0):
+        """Register a topic; it is subscribed once per (re)connection"""
+        if isinstance(topic, str):
+            topic = topic.encode()
+        self.topics[topic] = qos
+        if self.connected.is_set():
+            asyncio.create_task(self._send_subscribe({topic: qos}))
+
+    def start(self):
+        """Start the background connection task (call inside a running event loop)"""
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def get(self):
+        """Wait for the next message; returns (topic, payload) as bytes"""
+        while not self._queue:
+            self._queue_event.clear()
+            await self._queue_event.wait()
+        return self._queue.pop(0)
+
+    async def publish(self, topic, msg, retain=False):
+        """Publish at QoS 0 (waits for the connection if it is down)"""
+        await self.connected.wait()
+        if isinstance(msg, str):
+            msg = msg.encode()
+        await self._write(_packet(PUBLISH | retain, _string(topic) + msg))
+
+    async def disconnect(self):
+        """Send DISCONNECT and stop reconnecting"""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.connected.is_set():
+            try:
+                await self._write(bytes([DISCONNECT, 0]))
+            except OSError:
+                pass
+        await self._close()
+
+    async def _write(self, data):
+        async with self._write_lock:
+            self._writer.write(data)
+            await self._writer.drain()
+
+    async def _read_packet(self):
+        header = (await self._reader.readexactly(1))[0]
+        length = 0
+        shift = 0
+        while True:
+            byte = (await self._reader.readexactly(1))[0]
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+            if shift == 28:
+                raise OSError("Malformed remaining length")
+        if length > MAX_PACKET_SIZE:
+            raise OSError(f"Packet too large: {length} bytes")
+        body = await self._reader.readexactly(length) if length else b""
+        return header, body
+
+    def _next_packet_id(self):
+        self._packet_id = self._packet_id % 0xFFFF + 1
+        return self._packet_id
+
+    async def _send_subscribe(self, topics):
+        body = self._next_packet_id().to_bytes(2, "big")
+        for topic in topics:
+            body += _string(topic) + bytes([topics[topic]])
+        await self._write(_packet(SUBSCRIBE, body))
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.server, self.port)
+        body = _string(b"MQTT") + bytes([4, 0x02]) + self.keepalive.to_bytes(2, "big")
+        body += _string(self.client_id)
+        await self._write(_packet(CONNECT, body))
+        header, resp = await asyncio.wait_for(self._read_packet(), self.keepalive)
+        if header != CONNACK or len(resp) < 2 or resp[1] != 0:
+            raise OSError(f"MQTT connection refused: {resp[1] if len(resp) > 1 else '?'}")
+        if self.topics:
+            await self._send_subscribe(self.topics)
+
+    async def _close(self):
+        self.connected.clear()
+        if self._writer:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = None
+
+    def _deliver(self, topic, payload):
+        if len(self._queue) >= self.queue_size:
+            self._queue.pop(0)
+        self._queue.append((topic, payload))
+        self._queue_event.set()
+
+    async def _pinger(self):
+        while True:
+            await asyncio.sleep(self.keepalive / 2)
+            await self._write(bytes([PINGREQ, 0]))
+
+    async def _receive(self):
+        while True:
+            # Broker must answer pings well within 1.5 keepalive periods
+            header, body = await asyncio.wait_for(self._read_packet(), self.keepalive * 1.5)
+            kind = header & 0xF0
+            if kind == PUBLISH:
+                qos = (header >> 1) & 0x03
+                topic_len = int.from_bytes(body[:2], "big")
+                topic = body[2:2 + topic_len]
+                pos = 2 + topic_len
+                if qos:
+                    packet_id = body[pos:pos + 2]
+                    pos += 2
+                    await self._write(bytes([PUBACK, 2]) + packet_id)
+                self._deliver(topic, body[pos:])
+            # CONNACK/SUBACK/PINGRESP need no action beyond resetting the timeout
+
+    async def _run(self):
+        delay = RECONNECT_DELAY_MIN
+        while self._running:
+            pinger = None
+            try:
+                await self._connect()
+                print(f"MQTT connected to {self.server}")
+                self.connected.set()
+                delay = RECONNECT_DELAY_MIN
+                pinger = asyncio.create_task(self._pinger())
+                await self._receive()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"MQTT connection lost: {e}")
+            finally:
+                if pinger:
+                    pinger.cancel()
+                await self._close()
+            if self._running:
+                print(f"MQTT reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_DELAY_MAX)
@@ -1,12 +1,12 @@
 """Music Player Module
 
-This module provides musical note definitions and playback functionality.
+This module provides musical note definitions and the built-in songs;
+playback functions come from melody.py and are re-exported here.
 Thanks to Robson Couto for open-sourced scores.
 GitHub: https://github.com/robsoncouto/arduino-songs
 """
 
-import time
-import machine
+from melody import *
 
 # Musical note frequency definitions (Hz)
 NOTE_B0 =  31
@@ -100,12 +100,6 @@ NOTE_D8 =  4699
 NOTE_DS8 = 4978
 REST = 0  # Rest/silence note
 
-# Musical timing constants
-DEFAULT_TEMPO = 220              # Default playback tempo (BPM)
-NOTE_PLAY_RATIO = 0.9            # Percentage of note duration to play (90%)
-PWM_DUTY_CYCLE = 30000           # PWM duty cycle for audio output
-SILENCE_DURATION = 100           # Default silence duration in ms
-
 # Note duration guide:
 # - Positive numbers: 4=quarter, 8=eighth, 16=sixteenth note
 # - Negative numbers: dotted notes (e.g., -4 = dotted quarter note)
@@ -224,83 +218,10 @@ song = {
 }
 
 
-# Global tempo setting - modify to change playback speed
-tempo = DEFAULT_TEMPO
-
-# Calculate whole note duration in milliseconds based on tempo
-wholenote = (60000 * 4) / tempo
-
-def tone(pin, frequency, duration):
-    """
-    Generate a tone on the specified pin
-    
-    Args:
-        pin: PWM pin object for audio output
-        frequency: Tone frequency in Hz (0 for silence)
-        duration: Duration in milliseconds
-    """
-    if frequency == 0:
-        # Silence - no frequency output
-        pass
-    else:
-        # Generate tone with specified frequency
-        pin.freq(frequency)
-        pin.duty_u16(PWM_DUTY_CYCLE)
-    
-    time.sleep_ms(duration)
-    pin.duty_u16(0)  # Stop audio output
-
-def noTone(pin):
-    """
-    Stop audio output on the specified pin
-    
-    Args:
-        pin: PWM pin object to silence
-    """
-    tone(pin, 0, SILENCE_DURATION)
-
-def play(pin, melody):
-    """
-    Play a melody on the specified PWM pin
-    
-    Args:
-        pin: PWM pin object for audio output
-        melody: List containing alternating notes and durations
-    """
-    print(f"Playing melody with {len(melody)//2} notes")
-    
-    # Process melody data (notes and durations are alternating)
-    for note_index in range(0, len(melody), 2):
-        note_frequency = melody[note_index]
-        duration_divider = melody[note_index + 1]
-        
-        # Calculate note duration based on tempo
-        if duration_divider > 0:
-            # Regular note duration
-            note_duration = wholenote / duration_divider
-        elif duration_divider < 0:
-            # Dotted note duration (1.5x longer)
-            note_duration = wholenote / abs(duration_divider)
-            note_duration *= 1.5
-        else:
-            # Invalid duration, skip this note
-            continue
-            
-        # Play note for specified percentage of duration
-        play_duration = int(note_duration * NOTE_PLAY_RATIO)
-        tone(pin, note_frequency, play_duration)
-        
-        # Wait for full note duration before next note
-        time.sleep_ms(int(note_duration))
-        
-        # Ensure clean audio output between notes
-        noTone(pin)
-    
-    print("Melody playback completed")
-    
-
 # Demo/test code - runs when file is executed directly
 if __name__ == '__main__':
+    import machine
+    
     # Initialize PWM pin for audio output
     BUZZER_PIN = 15
     buzzer = machine.PWM(machine.Pin(BUZZER_PIN))
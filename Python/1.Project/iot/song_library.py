@@ -0,0 +1,146 @@
+"""
+Compact Binary Song Library
+
+Songs are stored in one flash file instead of Python list literals, so
+a program only spends RAM on the melody it is about to play. Opening the
+library reads just the header and the index; notes are read on demand.
+
+File layout (little endian):
+    header  "<4sBB"   magic b"SNG1", note table size, song count
+    notes   "<H" * n  frequency of each note index (index 0 = REST)
+    index   per song: "<B" name length, name, "<IHH" offset, note count, tempo
+    data    "<H" per note: note index << 4 | dotted << 3 | log2(divider)
+
+Build the file from the lists in play_music.py with build_songs.py.
+"""
+import array
+import struct
+from melody import DEFAULT_TEMPO, compile_melody
+
+SONG_FILE = "songs.bin"        # Default library file on flash
+MAGIC = b"SNG1"
+
+_HEADER = "<4sBB"
+_ENTRY = "<IHH"
+
+
+def encode_note(note_index, divider):
+    """
+    Pack one note into its 16-bit code
+
+    Args:
+        note_index: Position of the frequency in the note table
+        divider: Duration divider (4=quarter, negative for dotted)
+
+    Returns:
+        int: Packed note code
+    """
+    length = abs(divider)
+    shift = 0
+    while (1 << shift) < length:
+        shift += 1
+    if (1 << shift) != length or shift > 7:
+        raise ValueError(f"Unsupported note duration: {divider}")
+    return note_index << 4 | (8 if divider < 0 else 0) | shift
+
+
+def write_library(songs, path=SONG_FILE, tempo=DEFAULT_TEMPO):
+    """
+    Convert melody lists into a library file
+
+    Args:
+        songs: dict of name -> list of alternating notes and durations
+        path: Output file
+        tempo: Tempo stored with every song
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    notes = [0]
+    for name in songs:
+        for freq in songs[name][0::2]:
+            if freq not in notes:
+                notes.append(freq)
+    if len(notes) > 255:
+        raise ValueError("Too many distinct notes")
+
+    index = b""
+    data = b""
+    offset = struct.calcsize(_HEADER) + 2 * len(notes)
+    offset += sum(1 + len(name.encode()) + struct.calcsize(_ENTRY) for name in songs)
+    for name in songs:
+        melody = songs[name]
+        codes = array.array("H", [encode_note(notes.index(melody[i]), melody[i + 1])
+                                  for i in range(0, len(melody), 2) if melody[i + 1]])
+        key = name.encode()
+        index += struct.pack("<B", len(key)) + key + struct.pack(_ENTRY, offset + len(data), len(codes), tempo)
+        data += struct.pack(f"<{len(codes)}H", *codes)
+
+    with open(path, "wb") as f:
+        f.write(struct.pack(_HEADER, MAGIC, len(notes), len(songs)))
+        f.write(struct.pack(f"<{len(notes)}H", *notes))
+        f.write(index)
+        f.write(data)
+    return offset + len(data)
+
+
+class SongLibrary:
+    """
+    Read-only access to a song library file
+
+    Args:
+        path: Library file written by write_library()
+    """
+
+    def __init__(self, path=SONG_FILE):
+        self.path = path
+        self.index = {}        # name -> (offset, note count, tempo)
+        with open(path, "rb") as f:
+            magic, note_count, song_count = struct.unpack(_HEADER, f.read(struct.calcsize(_HEADER)))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a song library")
+            self.notes = array.array("H", struct.unpack(f"<{note_count}H", f.read(2 * note_count)))
+            for _ in range(song_count):
+                name = f.read(f.read(1)[0]).decode()
+                self.index[name] = struct.unpack(_ENTRY, f.read(struct.calcsize(_ENTRY)))
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def names(self):
+        return list(self.index)
+
+    def tempo(self, name):
+        """Tempo (BPM) the song was stored with"""
+        return self.index[name][2]
+
+    def _codes(self, name):
+        offset, count, _ = self.index[name]
+        codes = array.array("H", bytes(2 * count))
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            f.readinto(codes)  # Little-endian, same as the RP2040
+        return codes
+
+    def melody(self, name):
+        """
+        Load one song as a note/duration list
+
+        Returns:
+            list: Alternating notes and durations, as accepted by play()
+        """
+        melody = []
+        for code in self._codes(name):
+            divider = 1 << (code & 7)
+            melody.append(self.notes[code >> 4])
+            melody.append(-divider if code & 8 else divider)
+        return melody
+
+    def events(self, name):
+        """
+        Load one song compiled for the Sequencer
+
+        Returns:
+            array: (frequency, on_ms, off_ms) events at the song's tempo
+        """
+        return compile_melody(self.melody(name), self.tempo(name))
@@ -0,0 +1,109 @@
+"""
+Static Asset Serving
+
+Serves files from flash through http_server with caching headers:
+- If a precompressed "<file>.gz" exists (see build_assets.py) and the
+  browser accepts gzip, the compressed file is sent as-is
+- Files are streamed from disk in small chunks, never loaded whole
+- Every response carries an ETag and Cache-Control; a browser that
+  revalidates with a matching If-None-Match gets an empty 304
+"""
+import os
+try:
+    import hashlib
+except ImportError:
+    import uhashlib as hashlib
+try:
+    import binascii
+except ImportError:
+    import ubinascii as binascii
+from http_server import Response
+
+# Cache configuration
+DEFAULT_MAX_AGE = 3600         # Seconds a browser may reuse an asset without asking
+HASH_CHUNK_SIZE = 512          # Bytes read per step while computing an ETag
+
+CONTENT_TYPES = {
+    "css": "text/css",
+    "js": "application/javascript",
+    "html": "text/html",
+    "json": "application/json",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "ico": "image/x-icon",
+}
+
+# path -> (size, etag), filled on first use so each file is hashed once
+_file_info = {}
+
+
+def file_info(path):
+    """
+    Size and ETag of a file, or None if it does not exist
+
+    The ETag is derived from the file contents, so rebuilding an asset
+    automatically invalidates browser caches.
+    """
+    info = _file_info.get(path)
+    if info is None:
+        try:
+            size = os.stat(path)[6]
+        except OSError:
+            return None
+        digest = hashlib.sha1()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        with open(path, "rb") as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                digest.update(memoryview(buf)[:n])
+        etag = '"%s"' % binascii.hexlify(digest.digest()[:8]).decode()
+        info = (size, etag)
+        _file_info[path] = info
+    return info
+
+
+def static_handler(filename, content_type=None, max_age=DEFAULT_MAX_AGE):
+    """
+    Build an http_server handler that serves one file
+
+    Args:
+        filename: Path of the uncompressed file on flash (its .gz sibling is preferred)
+        content_type: Content-Type header, guessed from the extension if omitted
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        coroutine function: Handler for HTTPServer.add_route
+    """
+    if content_type is None:
+        content_type = CONTENT_TYPES.get(filename.rsplit(".", 1)[-1], "application/octet-stream")
+    cache_control = "public, max-age=%d" % max_age
+    gz_name = filename + ".gz"
+
+    async def handler(request):
+        path = filename
+        headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        info = None
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            info = file_info(gz_name)
+            if info:
+                path = gz_name
+                headers["Content-Encoding"] = "gzip"
+        if info is None:
+            info = file_info(filename)
+            if info is None:
+                return Response(b"Not Found", 404, "text/plain")
+
+        size, etag = info
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(b"", 304, None, headers)
+        return Response(open(path, "rb"), 200, content_type, headers, size)
+
+    return handler
+
+
+def add_static(app, url, filename, content_type=None, max_age=DEFAULT_MAX_AGE):
+    """Register a static file on an HTTPServer at url"""
+    app.add_route(url, static_handler(filename, content_type, max_age), ("GET", "HEAD"))
@@ -0,0 +1,211 @@
+"""
+Asynchronous WiFi Connection Manager
+
+Keeps the station interface connected from a background asyncio task
+instead of blocking the program in a sleep loop:
+- link_up is an asyncio.Event that is set while the link is usable, so
+  network code can simply `await wifi.link_up.wait()`
+- Failed attempts back off exponentially (RETRY_DELAY_MIN..RETRY_DELAY_MAX)
+- The access point's BSSID and channel are cached (also on flash) so a
+  rejoin targets the known AP directly instead of scanning again; the
+  blocking scan is repeated at most every RESCAN_INTERVAL seconds
+- Errors inside the supervisor are logged and retried, never fatal
+
+Everything else in the program (LED animations, sensor sampling) keeps
+running while the link is down. The WLAN object can be injected, so the
+manager can be tested with a fake network.WLAN.
+"""
+import json
+import os
+import time
+try:
+    import binascii
+except ImportError:
+    import ubinascii as binascii
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+try:
+    import network
+except ImportError:
+    network = None             # Not on a board - a fake WLAN must be passed in
+
+# WiFi status codes (same values as network.STAT_*)
+STATUS_GOT_IP = 3
+
+# Connection timing constants
+CONNECT_TIMEOUT = 10           # Seconds to wait for one connection attempt
+STATUS_POLL_INTERVAL = 0.1     # Seconds between status checks while connecting
+LINK_CHECK_INTERVAL = 1        # Seconds between link checks while connected
+RETRY_DELAY_MIN = 1            # First retry delay in seconds
+RETRY_DELAY_MAX = 60           # Longest retry delay in seconds
+RESCAN_INTERVAL = 60           # Least seconds between two (blocking) scans
+CACHED_AP_ATTEMPTS = 3         # Failed rejoins before the cached AP is dropped
+CACHE_FILE = "wifi_cache.json" # Last known AP (BSSID/channel), kept across resets
+
+
+class WiFiManager:
+    """
+    Background WiFi connection manager
+
+    Args:
+        ssid: WiFi network name
+        psk: WiFi password
+        wlan: Station interface; defaults to network.WLAN(network.STA_IF)
+        cache_file: Where the last AP is stored, or None to keep it in RAM only
+    """
+
+    def __init__(self, ssid, psk, wlan=None, cache_file=CACHE_FILE):
+        self.ssid = ssid
+        self.ssid_bytes = ssid.encode()  # Scan results are raw bytes, maybe not UTF-8
+        self.psk = psk
+        self.wlan = wlan if wlan is not None else network.WLAN(network.STA_IF)
+        self.cache_file = cache_file
+        self.link_up = asyncio.Event()
+        self.retry_delay = RETRY_DELAY_MIN
+        self.ip_address = None
+        self.ap = self._load_cache()    # {"bssid": hex str, "channel": int} or None
+        self.last_scan = None           # time.time() of the last scan
+        self.failures = 0               # Failed attempts in a row
+        self._task = None
+
+    def _load_cache(self):
+        if not self.cache_file:
+            return None
+        try:
+            with open(self.cache_file) as f:
+                ap = json.load(f)
+            return ap if ap.get("ssid") == self.ssid else None
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(self.ap, f)
+        except OSError as e:
+            print(f"Could not save WiFi cache: {e}")
+
+    def _find_ap(self):
+        """Scan for the strongest AP with our SSID and cache it"""
+        best = None
+        self.last_scan = time.time()
+        for entry in self.wlan.scan():
+            ssid, bssid, channel, rssi = entry[0], entry[1], entry[2], entry[3]
+            if ssid == self.ssid_bytes and (best is None or rssi > best[2]):
+                best = (bssid, channel, rssi)
+        if best:
+            self.ap = {"ssid": self.ssid, "bssid": binascii.hexlify(best[0]).decode(), "channel": best[1]}
+            print(f"Found AP {self.ap['bssid']} on channel {self.ap['channel']}")
+            self.failures = 0           # A fresh AP gets its own grace period
+            self._save_cache()
+
+    def _scan_due(self):
+        return self.last_scan is None or time.time() - self.last_scan >= RESCAN_INTERVAL
+
+    def _forget_ap(self):
+        self.ap = None
+        self.failures = 0
+        if self.cache_file:
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+    def is_connected(self):
+        return self.wlan.status() == STATUS_GOT_IP
+
+    async def connect_once(self):
+        """
+        Make one connection attempt without blocking other tasks
+
+        Returns:
+            bool: True if the link came up
+        """
+        self.wlan.active(True)
+        if self.ap is None and self._scan_due():
+            # Scanning blocks for seconds, so it is rate limited
+            self._find_ap()
+        if self.ap:
+            # Fast rejoin: go straight to the known access point
+            print(f"Connecting to {self.ssid} via {self.ap['bssid']}...")
+            self.wlan.connect(self.ssid, self.psk, bssid=binascii.unhexlify(self.ap["bssid"]))
+        else:
+            print(f"Connecting to {self.ssid}...")
+            self.wlan.connect(self.ssid, self.psk)
+
+        waited = 0
+        while waited < CONNECT_TIMEOUT:
+            status = self.wlan.status()
+            if status < 0 or status >= STATUS_GOT_IP:
+                break
+            await asyncio.sleep(STATUS_POLL_INTERVAL)
+            waited += STATUS_POLL_INTERVAL
+
+        if self.is_connected():
+            self.ip_address = self.wlan.ifconfig()[0]
+            print(f"WiFi connected, IP Address: {self.ip_address}")
+            self.failures = 0
+            return True
+
+        print(f"WiFi connection failed. Status: {self.wlan.status()}")
+        self.wlan.disconnect()
+        self.failures += 1
+        if self.ap and self.failures >= CACHED_AP_ATTEMPTS:
+            # The cached AP may have moved or gone; scan again when due
+            self._forget_ap()
+        return False
+
+    async def _supervise(self):
+        """One supervisor step: check the link, or make one attempt"""
+        if self.is_connected():
+            if not self.link_up.is_set():
+                # Already connected when the manager started
+                self.ip_address = self.wlan.ifconfig()[0]
+                self.link_up.set()
+            await asyncio.sleep(LINK_CHECK_INTERVAL)
+            return
+
+        if self.link_up.is_set():
+            print("WiFi link lost")
+            self.link_up.clear()
+
+        if await self.connect_once():
+            self.retry_delay = RETRY_DELAY_MIN
+            self.link_up.set()
+        else:
+            await asyncio.sleep(self._back_off())
+
+    def _back_off(self):
+        """Return the delay before the next attempt and double it"""
+        delay = self.retry_delay
+        print(f"Retrying in {delay}s")
+        self.retry_delay = min(delay * 2, RETRY_DELAY_MAX)
+        return delay
+
+    async def run(self):
+        """Connection supervisor; run as a task with start()"""
+        while True:
+            try:
+                await self._supervise()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. OSError from scan()/connect(); log it and keep supervising
+                print(f"WiFi error: {e}")
+                self.link_up.clear()
+                await asyncio.sleep(self._back_off())
+
+    def start(self):
+        """Start the supervisor task (call from inside a running event loop)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def wait_connected(self):
+        """Wait until the link is up; returns the IP address"""
+        await self.link_up.wait()
+        return self.ip_address
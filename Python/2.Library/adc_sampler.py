@@ -0,0 +1,132 @@
+import array
+
+try:
+    from machine import ADC, Timer
+except ImportError:                 # Off the board, e.g. with a synthetic source
+    ADC = Timer = None
+
+# Background ADC sampling for several channels. A periodic Timer visits the
+# channels round-robin at rate_hz; each visit takes `oversample` readings
+# back to back and averages them (decimation), which cuts noise and adds
+# resolution below the ADC's own. Decimated samples go into a per-channel
+# ring buffer, and the optional `smoothing` filter keeps the latest value:
+#   None     - the latest decimated sample
+#   "ema"    - exponential moving average, weight 1 / 2**ema_shift
+#   "median" - median of the last `window` samples (kills single spikes)
+# read() just returns that value, so the main loop never waits for the ADC.
+#
+# All buffers are preallocated arrays laid out per channel, so the timer
+# callback does not allocate. A source may be an ADC pin number or any object
+# with read_u16(), which lets the sampler run off the board with a fake
+# source; call sample() yourself there instead of start().
+
+FILTER_NONE = None
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+
+
+class ADCSampler:
+
+    def __init__(self, sources, rate_hz=500, oversample=4, smoothing=FILTER_NONE,
+                 ema_shift=3, window=5, history=16, timer=None):
+        self.adcs = [ADC(s) if isinstance(s, int) else s for s in sources]
+        n = len(self.adcs)
+        if smoothing == FILTER_MEDIAN and window > history:
+            raise ValueError("window larger than history")
+        self.n = n
+        self.rate_hz = rate_hz
+        self.oversample = oversample
+        self.smoothing = smoothing
+        self.ema_shift = ema_shift
+        self.window = window
+        self.size = history
+        self.ring = array.array("H", [0] * (n * history))   # Channel c at c * history
+        self.pos = array.array("H", [0] * n)                # Next slot per channel
+        self.count = array.array("H", [0] * n)              # Valid slots per channel
+        self.ema = array.array("I", [0] * n)                # value << ema_shift
+        self.values = array.array("H", [0] * n)             # Latest filtered values
+        self.scratch = array.array("H", [0] * window)
+        self.channel = 0
+        self.timer = timer
+        self._tick_cb = self._tick
+
+    def start(self):
+        if self.timer is None:
+            self.timer = Timer()
+        self.timer.init(mode=Timer.PERIODIC, freq=self.rate_hz, callback=self._tick_cb)
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.deinit()
+
+    def _tick(self, t):
+        self.sample()
+
+    def sample(self):
+        # Sample the next channel once (oversampled) and update its value
+        c = self.channel
+        adc = self.adcs[c]
+        total = 0
+        for _ in range(self.oversample):
+            total += adc.read_u16()
+        value = total // self.oversample
+        size = self.size
+        base = c * size
+        p = self.pos[c]
+        self.ring[base + p] = value
+        self.pos[c] = p + 1 if p + 1 < size else 0
+        count = self.count[c]
+        if count < size:
+            count += 1
+            self.count[c] = count
+        if self.smoothing == FILTER_EMA:
+            shift = self.ema_shift
+            if count == 1:
+                self.ema[c] = value << shift    # Start from the first sample
+            else:
+                self.ema[c] += value - (self.ema[c] >> shift)
+            value = self.ema[c] >> shift
+        elif self.smoothing == FILTER_MEDIAN:
+            value = self._median(c, count)
+        self.values[c] = value
+        c += 1
+        self.channel = 0 if c == self.n else c
+
+    def _median(self, c, count):
+        # Insertion sort of the newest samples into the scratch buffer
+        n = min(count, self.window)
+        size = self.size
+        base = c * size
+        ring = self.ring
+        scratch = self.scratch
+        p = self.pos[c]
+        for k in range(n):
+            p = p - 1 if p else size - 1
+            v = ring[base + p]
+            j = k
+            while j and scratch[j - 1] > v:
+                scratch[j] = scratch[j - 1]
+                j -= 1
+            scratch[j] = v
+        return scratch[n // 2]
+
+    def read(self, channel=0):
+        # Latest filtered value (0-65535)
+        return self.values[channel]
+
+    def latest(self, channel=0):
+        # Newest decimated sample, unfiltered
+        p = self.pos[channel]
+        p = p - 1 if p else self.size - 1
+        return self.ring[channel * self.size + p]
+
+    def history(self, channel=0):
+        # Buffered samples of one channel, oldest first
+        size = self.size
+        base = channel * size
+        count = self.count[channel]
+        start = self.pos[channel] - count
+        return [self.ring[base + (start + k) % size] for k in range(count)]
+
+    def ready(self, channel=0):
+        return self.count[channel] != 0
@@ -0,0 +1,113 @@
+# Checks for adc_sampler.py with synthetic ADC sources. Runs on CPython
+# (python adc_sampler_test.py, from this folder) or on the board; no ADC
+# or Timer is used, every step is a manual sample() call.
+
+from adc_sampler import ADCSampler, FILTER_EMA, FILTER_MEDIAN
+
+
+class SequenceADC:
+    # Returns the given values in turn, then repeats the last one
+    def __init__(self, values):
+        self.values = list(values)
+        self.i = 0
+        self.reads = 0
+
+    def read_u16(self):
+        self.reads += 1
+        v = self.values[min(self.i, len(self.values) - 1)]
+        self.i += 1
+        return v
+
+
+class ConstantADC:
+    def __init__(self, value):
+        self.value = value
+
+    def read_u16(self):
+        return self.value
+
+
+def test_round_robin():
+    a = SequenceADC([100] * 8)
+    b = SequenceADC([200] * 8)
+    c = SequenceADC([300] * 8)
+    s = ADCSampler([a, b, c], oversample=1)
+    order = []
+    for _ in range(6):
+        order.append(s.channel)
+        s.sample()
+    assert order == [0, 1, 2, 0, 1, 2], order
+    assert (a.reads, b.reads, c.reads) == (2, 2, 2)
+    assert [s.read(i) for i in range(3)] == [100, 200, 300]
+
+
+def test_oversample_average():
+    a = SequenceADC([1000, 2000, 3000, 4000])
+    s = ADCSampler([a], oversample=4)
+    s.sample()
+    assert a.reads == 4
+    assert s.read() == 2500, s.read()
+    assert s.latest() == 2500
+
+
+def test_ring_wraparound():
+    a = SequenceADC(range(1, 11))
+    s = ADCSampler([a], oversample=1, history=4)
+    for _ in range(3):
+        s.sample()
+    assert s.history() == [1, 2, 3]
+    for _ in range(7):
+        s.sample()
+    assert s.history() == [7, 8, 9, 10], s.history()
+    assert s.latest() == 10
+    assert s.pos[0] == 10 % 4
+
+
+def test_ema_convergence():
+    a = SequenceADC([0] + [40000] * 200)
+    s = ADCSampler([a], oversample=1, smoothing=FILTER_EMA, ema_shift=3)
+    s.sample()
+    assert s.read() == 0                       # Starts at the first sample
+    s.sample()
+    assert 0 < s.read() < 40000                # Moves 1/8 of the way per sample
+    for _ in range(120):
+        s.sample()
+    assert abs(s.read() - 40000) <= 8, s.read()
+    assert s.latest() == 40000
+
+
+def test_median_rejects_spike():
+    a = SequenceADC([1000, 1010, 65535, 990, 1005, 0, 1000])
+    s = ADCSampler([a], oversample=1, smoothing=FILTER_MEDIAN, window=5, history=8)
+    for _ in range(7):
+        s.sample()
+        assert s.read() < 2000, s.read()       # Neither spike ever shows
+    assert s.latest() == 1000
+
+
+def test_channels_independent():
+    s = ADCSampler([ConstantADC(500), ConstantADC(60000)], smoothing=FILTER_MEDIAN,
+                   window=3, history=4)
+    for _ in range(10):
+        s.sample()
+    assert s.read(0) == 500 and s.read(1) == 60000
+    assert s.history(0) == [500] * 4 and s.history(1) == [60000] * 4
+
+
+def run():
+    tests = [test_round_robin, test_oversample_average, test_ring_wraparound,
+             test_ema_convergence, test_median_rejects_spike, test_channels_independent]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print("ok    ", test.__name__)
+        except AssertionError as e:
+            failed += 1
+            print("FAILED", test.__name__, e)
+    print("%d passed, %d failed" % (len(tests) - failed, failed))
+    return failed == 0
+
+
+if __name__ == "__main__":
+    run()
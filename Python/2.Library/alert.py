@@ -0,0 +1,139 @@
+import array
+from machine import Timer
+
+# Non-blocking beep/flash patterns for a buzzer and an LED. A pattern is a
+# flat array('H') of (freq, level, ms) steps: the buzzer sounds at freq Hz
+# (0 = quiet) and the LED is set to level (0-65535, any non-zero value turns
+# a plain Pin on) for ms milliseconds. A one-shot Timer moves from step to
+# step, so the main loop keeps measuring and can call play() as often as it
+# likes: the same pattern keeps running, a different one takes over at once.
+# Call run() from an asyncio task instead to drive the steps without a Timer.
+
+DUTY = 32768
+FULL = 65535
+
+
+def pattern(*steps):
+    # pattern((freq, level, ms), ...) -> compact timing table
+    table = array.array("H")
+    for freq, level, ms in steps:
+        table.append(freq)
+        table.append(level)
+        table.append(ms)
+    return table
+
+
+def beep(on_ms, off_ms, freq=1000, level=FULL):
+    # The usual on/off alert
+    return pattern((freq, level, on_ms), (0, 0, off_ms))
+
+
+def ramp(f_start, f_end, l_start, l_end, steps, step_ms):
+    # Linear sweep of pitch and brightness in equal steps
+    table = array.array("H")
+    for i in range(steps):
+        table.append(f_start + (f_end - f_start) * i // steps)
+        table.append(l_start + (l_end - l_start) * i // steps)
+        table.append(step_ms)
+    return table
+
+
+class AlertPlayer:
+
+    def __init__(self, buzzer=None, led=None, timer=None, duty=DUTY):
+        # buzzer / led: machine.PWM or machine.Pin (active buzzer, plain LED)
+        self.buzzer = buzzer
+        self.led = led
+        self.buzzer_pwm = hasattr(buzzer, "duty_u16")
+        self.led_pwm = hasattr(led, "duty_u16")
+        self.timer = timer if timer is not None else Timer()
+        self.duty = duty
+        self.pattern = None
+        self.intro = None
+        self.table = None                   # Table being stepped through
+        self.index = 0
+        self.repeat = False
+        self.wait_ms = 0                    # Length of the current step (0 = idle)
+        self.event = None                   # Set by run() when asyncio drives us
+        self._step_cb = self._step
+        self._output(0, 0)
+
+    def _output(self, freq, level):
+        buzzer = self.buzzer
+        if buzzer is not None:
+            if not self.buzzer_pwm:
+                buzzer.value(1 if freq else 0)
+            elif freq:
+                buzzer.freq(freq)
+                buzzer.duty_u16(self.duty)
+            else:
+                buzzer.duty_u16(0)
+        led = self.led
+        if led is not None:
+            if self.led_pwm:
+                led.duty_u16(level)
+            else:
+                led.value(1 if level else 0)
+
+    def play(self, table, repeat=True, intro=None):
+        # Switch to table now, unless it is already playing. An intro table
+        # is played once before it.
+        if table is self.pattern and self.wait_ms:
+            return
+        self.timer.deinit()
+        self.pattern = table
+        self.intro = intro
+        self.repeat = repeat
+        self.table = intro if intro else table
+        self.index = 0
+        self._step(None)
+        if self.event is not None:
+            self.event.set()                # Wake run() for the new timing
+
+    def stop(self):
+        self.timer.deinit()
+        self.pattern = None
+        self.wait_ms = 0
+        self._output(0, 0)
+        if self.event is not None:
+            self.event.set()
+
+    @property
+    def playing(self):
+        return self.wait_ms != 0
+
+    def _step(self, t):
+        table = self.table
+        i = self.index
+        if i >= len(table):
+            if table is self.intro:
+                table = self.table = self.pattern
+            elif not self.repeat:
+                self.pattern = None
+                self.wait_ms = 0
+                self._output(0, 0)
+                return
+            i = 0
+        self._output(table[i], table[i + 1])
+        self.wait_ms = table[i + 2] or 1
+        self.index = i + 3
+        if self.event is None:
+            self.timer.init(mode=Timer.ONE_SHOT, period=self.wait_ms, callback=self._step_cb)
+
+    async def run(self):
+        # Step the patterns from this task; play() and stop() wake it at once
+        import asyncio
+        self.timer.deinit()
+        self.event = event = asyncio.Event()
+        try:
+            while True:
+                event.clear()
+                if not self.wait_ms:
+                    await event.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(event.wait(), self.wait_ms / 1000)
+                except asyncio.TimeoutError:
+                    self._step(None)
+        finally:
+            self.event = None
@@ -0,0 +1,142 @@
+from machine import Timer
+
+# 8x8 LED dot matrices behind 74HC595s (see hc595.py). The register chain
+# holds one data byte per matrix followed by the shared row-select byte; a
+# hardware Timer latches one row of every matrix per tick, so the picture
+# stays up while the main program runs.
+#
+# Frame buffer: bytearray of 8 rows x n matrices, row 0 at the top,
+# buf[row * n + m] = matrix m (0 = leftmost), bit 7 = leftmost column, 1 = on.
+
+ROWS = 8
+
+# 5x7 font, ASCII 0x20-0x5A, 5 column bytes per character (bit 0 = top)
+FONT_FIRST = 0x20
+FONT_WIDTH = 5
+FONT = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x5f\x00\x00\x00\x07\x00\x07\x00\x14\x7f\x14\x7f\x14"
+    b"\x24\x2a\x7f\x2a\x12\x23\x13\x08\x64\x62\x36\x49\x55\x22\x50\x00\x05\x03\x00\x00"
+    b"\x00\x1c\x22\x41\x00\x00\x41\x22\x1c\x00\x08\x2a\x1c\x2a\x08\x08\x08\x3e\x08\x08"
+    b"\x00\x50\x30\x00\x00\x08\x08\x08\x08\x08\x00\x60\x60\x00\x00\x20\x10\x08\x04\x02"
+    b"\x3e\x51\x49\x45\x3e\x00\x42\x7f\x40\x00\x42\x61\x51\x49\x46\x21\x41\x45\x4b\x31"
+    b"\x18\x14\x12\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a\x49\x49\x30\x01\x71\x09\x05\x03"
+    b"\x36\x49\x49\x49\x36\x06\x49\x49\x29\x1e\x00\x36\x36\x00\x00\x00\x56\x36\x00\x00"
+    b"\x08\x14\x22\x41\x00\x14\x14\x14\x14\x14\x00\x41\x22\x14\x08\x02\x01\x51\x09\x06"
+    b"\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36\x3e\x41\x41\x41\x22"
+    b"\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f\x09\x09\x01\x01\x3e\x41\x41\x51\x32"
+    b"\x7f\x08\x08\x08\x7f\x00\x41\x7f\x41\x00\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41"
+    b"\x7f\x40\x40\x40\x40\x7f\x02\x04\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e"
+    b"\x7f\x09\x09\x09\x06\x3e\x41\x51\x21\x5e\x7f\x09\x19\x29\x46\x46\x49\x49\x49\x31"
+    b"\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20\x40\x20\x1f\x7f\x20\x18\x20\x7f"
+    b"\x63\x14\x08\x14\x63\x03\x04\x78\x04\x03\x61\x51\x49\x45\x43"
+)
+
+
+def rotate_left(bitmap, width_bytes):
+    # Rotate every row of a row-major bitmap one column left, in place
+    for start in range(0, len(bitmap), width_bytes):
+        end = start + width_bytes - 1
+        carry = bitmap[start] >> 7
+        for i in range(start, end):
+            bitmap[i] = ((bitmap[i] << 1) | (bitmap[i + 1] >> 7)) & 0xFF
+        bitmap[end] = ((bitmap[end] << 1) | carry) & 0xFF
+
+
+def rotate_right(bitmap, width_bytes):
+    # Rotate every row of a row-major bitmap one column right, in place
+    for start in range(0, len(bitmap), width_bytes):
+        end = start + width_bytes - 1
+        carry = (bitmap[end] & 1) << 7
+        for i in range(end, start, -1):
+            bitmap[i] = (bitmap[i] >> 1) | ((bitmap[i - 1] & 1) << 7)
+        bitmap[start] = (bitmap[start] >> 1) | carry
+
+
+class DotMatrix:
+
+    def __init__(self, register, matrices=1, refresh_hz=100, timer=None, active_low=True):
+        # register: HC595 with a chain of matrices + 1 registers
+        self.register = register
+        self.n = matrices
+        self.buf = bytearray(ROWS * matrices)
+        self.frame = register.buf                  # Reused for every row
+        self.invert = 0xFF if active_low else 0
+        self.select = bytes(1 << r for r in range(ROWS))
+        self.row = 0
+        self.timer = timer if timer is not None else Timer()
+        self.refresh_hz = refresh_hz
+        self._refresh_cb = self._refresh
+
+    def start(self):
+        self.timer.init(mode=Timer.PERIODIC, freq=self.refresh_hz * ROWS, callback=self._refresh_cb)
+
+    def stop(self):
+        self.timer.deinit()
+        self.clear()
+        frame = self.frame
+        for i in range(self.n):
+            frame[i] = self.invert
+        frame[self.n] = 0
+        self.register.write()
+
+    def clear(self):
+        for i in range(len(self.buf)):
+            self.buf[i] = 0
+
+    def show(self, rows, matrix=0):
+        # Copy 8 row bytes (top row first) into one matrix
+        n = self.n
+        for r in range(ROWS):
+            self.buf[r * n + matrix] = rows[r]
+
+    def _refresh(self, t):
+        r = self.row
+        n = self.n
+        buf = self.buf
+        frame = self.frame
+        base = r * n
+        invert = self.invert
+        for m in range(n):
+            frame[m] = buf[base + m] ^ invert
+        frame[n] = self.select[r]
+        self.register.write()                      # Data and row latch together
+        r += 1
+        self.row = 0 if r == ROWS else r
+
+
+class TextScroller:
+
+    def __init__(self, matrix, text, spacing=1):
+        # Render text once into a wide bitmap (led by one blank screen)
+        self.matrix = matrix
+        n = matrix.n
+        columns = 8 * n + len(text) * (FONT_WIDTH + spacing)
+        self.width = (columns + 7) // 8           # Bytes per bitmap row
+        self.bitmap = bytearray(ROWS * self.width)
+        x = 8 * n
+        for ch in text.upper():
+            code = ord(ch) - FONT_FIRST
+            if not 0 <= code < len(FONT) // FONT_WIDTH:
+                code = 0
+            for col in range(FONT_WIDTH):
+                bits = FONT[code * FONT_WIDTH + col]
+                for r in range(ROWS):
+                    if bits >> r & 1:
+                        self.bitmap[r * self.width + (x >> 3)] |= 0x80 >> (x & 7)
+                x += 1
+            x += spacing
+        self.steps = self.width * 8                # Steps for one full pass
+
+    def step(self):
+        # Scroll one column and show the visible window
+        rotate_left(self.bitmap, self.width)
+        matrix = self.matrix
+        n = matrix.n
+        buf = matrix.buf
+        width = self.width
+        bitmap = self.bitmap
+        for r in range(ROWS):
+            src = r * width
+            dst = r * n
+            for m in range(n):
+                buf[dst + m] = bitmap[src + m]
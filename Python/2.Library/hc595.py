@@ -0,0 +1,147 @@
+import array
+import time
+from machine import Pin
+from rp2 import PIO, StateMachine, asm_pio
+
+# 74HC595 shift register driver. A whole frame (one byte per register in a
+# daisy chain) is shifted out and then latched once, so the outputs never
+# show a half-shifted frame.
+#
+# Backends:
+#   PIO     - any three pins; a state machine clocks the bits (default)
+#   SPI     - a machine.SPI whose SCK/MOSI are wired to SH_CP/DS
+#   BITBANG - plain Pin writes, for comparison
+#
+# The first byte of a frame is shifted first, so it ends up in the register
+# farthest down the chain.
+
+PIO_BACKEND = "pio"
+SPI_BACKEND = "spi"
+BITBANG_BACKEND = "bitbang"
+
+LATCH_FLAG = 1 << 23      # Set in a FIFO word to latch after its byte
+
+
+@asm_pio(out_init=PIO.OUT_LOW, set_init=PIO.OUT_LOW, sideset_init=PIO.OUT_LOW,
+         out_shiftdir=PIO.SHIFT_LEFT)
+def hc595_pio():
+    # Each FIFO word: data byte in bits 31-24, latch flag in bit 23
+    wrap_target()
+    label("top")
+    pull().side(0)
+    set(x, 7).side(0)
+    label("bit")
+    out(pins, 1).side(0)          # Data while SH_CP is low
+    jmp(x_dec, "bit").side(1)     # Rising edge shifts it in
+    out(y, 1).side(0)
+    jmp(not_y, "top").side(0)
+    set(pins, 1).side(0)          # ST_CP pulse copies the frame to the outputs
+    set(pins, 0).side(0)
+    wrap()
+
+
+class HC595:
+
+    def __init__(self, data, clock, latch, chain=1, backend=PIO_BACKEND, spi=None, sm_id=1, freq=4000000):
+        # data/clock/latch are GPIO numbers (DS, SH_CP, ST_CP)
+        self.chain = chain
+        self.buf = bytearray(chain)
+        self.backend = backend
+        if backend == PIO_BACKEND:
+            self.sm = StateMachine(sm_id, hc595_pio, freq=freq, out_base=Pin(data),
+                                   set_base=Pin(latch), sideset_base=Pin(clock))
+            self.sm.active(1)
+            self.words = array.array("I", [0] * chain)
+        elif backend == SPI_BACKEND:
+            if spi is None:
+                raise ValueError("SPI backend needs an SPI object")
+            self.spi = spi
+            self.latch = Pin(latch, Pin.OUT, value=0)
+        elif backend == BITBANG_BACKEND:
+            self.data = Pin(data, Pin.OUT, value=0)
+            self.clock = Pin(clock, Pin.OUT, value=0)
+            self.latch = Pin(latch, Pin.OUT, value=0)
+        else:
+            raise ValueError("Unknown backend: %s" % backend)
+
+    def write(self, frame=None):
+        # Shift a whole frame (default: self.buf) and latch once
+        if frame is None:
+            frame = self.buf
+        if self.backend == PIO_BACKEND:
+            words = self.words
+            n = len(frame)
+            if n != len(words):
+                words = array.array("I", [0] * n)
+            for i in range(n):
+                words[i] = frame[i] << 24
+            words[n - 1] |= LATCH_FLAG
+            self.sm.put(words)
+        elif self.backend == SPI_BACKEND:
+            self.spi.write(frame)
+            self.latch(1)
+            self.latch(0)
+        else:
+            data = self.data
+            clock = self.clock
+            for byte in frame:
+                for bit in range(7, -1, -1):
+                    clock(0)
+                    data((byte >> bit) & 1)
+                    clock(1)
+            self.latch(1)
+            self.latch(0)
+
+    def write_byte(self, value, index=0):
+        # Set one register of the chain and refresh the frame
+        self.buf[index] = value
+        self.write()
+
+    def clear(self):
+        for i in range(self.chain):
+            self.buf[i] = 0
+        self.write()
+
+    def deinit(self):
+        if self.backend == PIO_BACKEND:
+            self.sm.active(0)
+
+
+def _legacy_write(data, clock, latch, byte):
+    # Bit-bang timing of the original examples (1 ms around every edge)
+    latch.low()
+    for bit in range(7, -1, -1):
+        clock.low()
+        time.sleep_ms(1)
+        data.value((byte >> bit) & 1)
+        time.sleep_ms(1)
+        clock.high()
+        time.sleep_ms(1)
+    latch.high()
+
+
+def benchmark(data=0, clock=2, latch=1, n=500, spi=None):
+    # Bytes per second for each backend on the same pins (nothing needs to
+    # be connected). Pass an SPI on pins that suit it to include SPI.
+    frame = bytearray(range(4))
+    results = []
+
+    pins = (Pin(data, Pin.OUT), Pin(clock, Pin.OUT), Pin(latch, Pin.OUT))
+    t = time.ticks_ms()
+    for i in range(8):
+        _legacy_write(pins[0], pins[1], pins[2], i)
+    results.append(("legacy", 8, time.ticks_diff(time.ticks_ms(), t)))
+
+    backends = [BITBANG_BACKEND, PIO_BACKEND]
+    if spi is not None:
+        backends.append(SPI_BACKEND)
+    for backend in backends:
+        reg = HC595(data, clock, latch, chain=len(frame), backend=backend, spi=spi)
+        t = time.ticks_ms()
+        for _ in range(n):
+            reg.write(frame)
+        results.append((backend, n * len(frame), time.ticks_diff(time.ticks_ms(), t)))
+        reg.deinit()
+
+    for name, count, ms in results:
+        print("%-8s %8d bytes/s" % (name, count * 1000 // (ms or 1)))
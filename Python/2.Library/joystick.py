@@ -0,0 +1,122 @@
+from machine import ADC, Pin
+
+# Analog joystick with self calibration. The centre is measured at start-up
+# (leave the stick alone) and the extents grow as the stick is moved, so
+# each half axis maps to -RANGE..RANGE whatever the module's real span is.
+# The scale factors are recomputed only when an extent grows; a reading is
+# then a subtraction, a multiply and a shift. A radial dead zone keeps a
+# resting stick at (0, 0), and poll() turns the position into one of 4 or 8
+# directions and reports it only when it changes. Integer maths throughout.
+
+RANGE = 1000                # Output of read() per half axis
+MIN_SPAN = 8192             # Starting half-axis span until the stick is moved
+SCALE_SHIFT = 16
+
+CENTER = 0
+UP = 1
+UP_RIGHT = 2
+RIGHT = 3
+DOWN_RIGHT = 4
+DOWN = 5
+DOWN_LEFT = 6
+LEFT = 7
+UP_LEFT = 8
+NAMES = ("CENTER", "UP", "UP_RIGHT", "RIGHT", "DOWN_RIGHT",
+         "DOWN", "DOWN_LEFT", "LEFT", "UP_LEFT")
+
+TAN_22_5 = 414              # tan(22.5 deg) * 1000, the 8-way sector border
+
+
+def _reader(source):
+    # ADC pin number, object with read_u16(), or a function returning 0-65535
+    if isinstance(source, int):
+        return ADC(source).read_u16
+    if hasattr(source, "read_u16"):
+        return source.read_u16
+    return source
+
+
+class Joystick:
+
+    def __init__(self, x, y, button=None, dead_zone=150, directions=8,
+                 invert_x=False, invert_y=True, calibrate_samples=32):
+        # dead_zone: radius in read() units; button: GPIO pin (pressed = low)
+        self.read_x = _reader(x)
+        self.read_y = _reader(y)
+        self.button = Pin(button, Pin.IN, Pin.PULL_UP) if button is not None else None
+        self.dead_zone_sq = dead_zone * dead_zone
+        self.directions = directions
+        self.sign_x = -1 if invert_x else 1
+        self.sign_y = -1 if invert_y else 1
+        self.last = CENTER
+        self.calibrate(calibrate_samples)
+
+    def calibrate(self, samples=32):
+        # Take the resting position as the centre and reset the extents
+        sx = sy = 0
+        for _ in range(samples):
+            sx += self.read_x()
+            sy += self.read_y()
+        self.cx = sx // samples
+        self.cy = sy // samples
+        self.x_min = max(self.cx - MIN_SPAN, 0)
+        self.x_max = min(self.cx + MIN_SPAN, 65535)
+        self.y_min = max(self.cy - MIN_SPAN, 0)
+        self.y_max = min(self.cy + MIN_SPAN, 65535)
+        self._rescale()
+
+    def _rescale(self):
+        # RANGE / half-axis span in fixed point, one factor per half axis
+        full = RANGE << SCALE_SHIFT
+        self.x_neg = full // max(self.cx - self.x_min, 1)
+        self.x_pos = full // max(self.x_max - self.cx, 1)
+        self.y_neg = full // max(self.cy - self.y_min, 1)
+        self.y_pos = full // max(self.y_max - self.cy, 1)
+
+    def read(self):
+        # Calibrated (x, y) in -RANGE..RANGE, right and up positive
+        rx = self.read_x()
+        ry = self.read_y()
+        if rx < self.x_min or rx > self.x_max or ry < self.y_min or ry > self.y_max:
+            self.x_min = min(self.x_min, rx)
+            self.x_max = max(self.x_max, rx)
+            self.y_min = min(self.y_min, ry)
+            self.y_max = max(self.y_max, ry)
+            self._rescale()
+        dx = rx - self.cx
+        dy = ry - self.cy
+        x = dx * (self.x_pos if dx > 0 else self.x_neg) >> SCALE_SHIFT
+        y = dy * (self.y_pos if dy > 0 else self.y_neg) >> SCALE_SHIFT
+        if x * x + y * y < self.dead_zone_sq:
+            return 0, 0
+        return x * self.sign_x, y * self.sign_y
+
+    def direction(self):
+        # Current position as one of the direction constants
+        x, y = self.read()
+        if not x and not y:
+            return CENTER
+        ax = x if x > 0 else -x
+        ay = y if y > 0 else -y
+        if self.directions == 4:
+            if ax >= ay:
+                return RIGHT if x > 0 else LEFT
+            return UP if y > 0 else DOWN
+        if ay * 1000 < ax * TAN_22_5:
+            return RIGHT if x > 0 else LEFT
+        if ax * 1000 < ay * TAN_22_5:
+            return UP if y > 0 else DOWN
+        if y > 0:
+            return UP_RIGHT if x > 0 else UP_LEFT
+        return DOWN_RIGHT if x > 0 else DOWN_LEFT
+
+    def poll(self):
+        # New direction if it changed since the last poll, else None
+        d = self.direction()
+        if d == self.last:
+            return None
+        self.last = d
+        return d
+
+    def pressed(self):
+        return self.button is not None and self.button.value() == 0
@@ -0,0 +1,123 @@
+import array
+import time
+from machine import Pin, Timer
+
+# Matrix keypad scanner. While idle every row is driven high and the
+# pulled-down column pins wait for a rising-edge IRQ, so nothing runs until
+# a key goes down. A timer then scans the matrix until all keys are released
+# again. Each key is debounced on its own from timestamps kept in
+# preallocated arrays, so several keys can be held at once (true n-key
+# rollover needs a diode per key). Press, release and long-press events are
+# queued in a ring buffer; read them with get().
+
+PRESS = 1
+RELEASE = 2
+LONG_PRESS = 3
+
+
+class Keypad:
+
+    def __init__(self, row_pins, col_pins, layout, debounce_ms=20, long_press_ms=800,
+                 scan_ms=5, queue_size=16, timer=None):
+        # layout: rows of key labels, e.g. [["1", "2", "3", "A"], ...]
+        self.rows = [Pin(p, Pin.OUT, value=0) for p in row_pins]
+        self.cols = [Pin(p, Pin.IN, Pin.PULL_DOWN) for p in col_pins]
+        self.keys = [key for row in layout for key in row]
+        n = len(self.keys)
+        self.raw = bytearray(n)                   # Last sampled level per key
+        self.state = bytearray(n)                 # Debounced level per key
+        self.long_sent = bytearray(n)
+        self.changed_at = array.array("I", [0] * n)   # ticks_ms of last raw change
+        self.pressed_at = array.array("I", [0] * n)   # ticks_ms of debounced press
+        self.debounce_ms = debounce_ms
+        self.long_press_ms = long_press_ms
+        self.scan_ms = scan_ms
+        self.queue = array.array("H", [0] * queue_size)
+        self.head = 0
+        self.tail = 0
+        self.timer = timer if timer is not None else Timer()
+        self.scanning = False
+        self._scan_cb = self._scan
+        self._wake_cb = self._wake
+        self._idle()
+
+    def _idle(self):
+        # Drive all rows so any key pulls its column high
+        self.timer.deinit()
+        self.scanning = False
+        for row in self.rows:
+            row(1)
+        for col in self.cols:
+            col.irq(trigger=Pin.IRQ_RISING, handler=self._wake_cb)
+
+    def _wake(self, pin):
+        if self.scanning:
+            return
+        self.scanning = True
+        for col in self.cols:
+            col.irq(handler=None)
+        self.timer.init(mode=Timer.PERIODIC, period=self.scan_ms, callback=self._scan_cb)
+
+    def _put(self, event, key):
+        nxt = (self.head + 1) % len(self.queue)
+        if nxt != self.tail:                      # Drop events when full
+            self.queue[self.head] = event << 8 | key
+            self.head = nxt
+
+    def _scan(self, t):
+        now = time.ticks_ms()
+        rows = self.rows
+        cols = self.cols
+        raw = self.raw
+        state = self.state
+        changed_at = self.changed_at
+        for row in rows:
+            row(0)
+        active = False
+        k = 0
+        for row in rows:
+            row(1)
+            for col in cols:
+                v = col.value()
+                if v != raw[k]:
+                    raw[k] = v
+                    changed_at[k] = now
+                elif v != state[k] and time.ticks_diff(now, changed_at[k]) >= self.debounce_ms:
+                    state[k] = v
+                    if v:
+                        self.pressed_at[k] = now
+                        self.long_sent[k] = 0
+                        self._put(PRESS, k)
+                    else:
+                        self._put(RELEASE, k)
+                if state[k] and not self.long_sent[k] and \
+                        time.ticks_diff(now, self.pressed_at[k]) >= self.long_press_ms:
+                    self.long_sent[k] = 1
+                    self._put(LONG_PRESS, k)
+                if v or state[k]:
+                    active = True
+                k += 1
+            row(0)
+        if not active:
+            self._idle()
+
+    def get(self):
+        # Next (event, key label) from the queue, or None
+        if self.head == self.tail:
+            return None
+        item = self.queue[self.tail]
+        self.tail = (self.tail + 1) % len(self.queue)
+        return item >> 8, self.keys[item & 0xFF]
+
+    def is_pressed(self, key):
+        return self.state[self.keys.index(key)] == 1
+
+    def pressed(self):
+        return [self.keys[k] for k in range(len(self.keys)) if self.state[k]]
+
+    def deinit(self):
+        self.timer.deinit()
+        for col in self.cols:
+            col.irq(handler=None)
+        for row in self.rows:
+            row(0)
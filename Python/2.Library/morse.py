@@ -0,0 +1,255 @@
+import time
+from machine import Pin, Timer
+
+# Morse code transmitter and decoder.
+#
+# encode() compiles text ahead of time into a packed run-length table: one
+# byte per dot or dash, on-time in the high nibble and the following off-time
+# in the low nibble, both in dot units (dot 1, dash 3, gaps 1 / 3 / 7).
+# MorseTransmitter streams such tables to an LED and/or buzzer from a
+# one-shot Timer and keeps further messages in a queue.
+#
+# MorseDecoder times the marks on a button or light-sensor pin from its edge
+# IRQ, tells dots from dashes as each mark ends, and a Timer closes letters
+# and words when the gap grows long enough. The dot length follows the
+# sender's speed.
+
+MORSE_CODE = {
+    'A': '.-',   'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.',
+    'F': '..-.', 'G': '--.',  'H': '....', 'I': '..',  'J': '.---',
+    'K': '-.-',  'L': '.-..', 'M': '--',   'N': '-.',  'O': '---',
+    'P': '.--.', 'Q': '--.-', 'R': '.-.',  'S': '...', 'T': '-',
+    'U': '..-',  'V': '...-', 'W': '.--',  'X': '-..-', 'Y': '-.--',
+    'Z': '--..',
+    '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-',
+    '5': '.....', '6': '-....', '7': '--...', '8': '---..', '9': '----.',
+    '?': '..--..', '/': '-..-.', ',': '--..--', '.': '.-.-.-',
+    ';': '-.-.-.', '!': '-.-.--', '@': '.--.-.', ':': '---...'
+}
+
+DOT = 1
+DASH = 3
+SYMBOL_GAP = 1
+LETTER_GAP = 3
+WORD_GAP = 7
+
+# Codes packed behind a leading 1 bit: dot = 0, dash = 1 ("A" = 0b101)
+ENCODE = {}
+DECODE = bytearray(128)
+for _char, _code in MORSE_CODE.items():
+    _packed = 1
+    for _symbol in _code:
+        _packed = _packed << 1 | (_symbol == '-')
+    ENCODE[_char] = _packed
+    DECODE[_packed] = ord(_char)
+
+
+def unit_ms(wpm):
+    # PARIS standard: 50 units per word
+    return 1200 // wpm
+
+
+def encode(text):
+    # Text -> bytearray of on << 4 | off elements; unsupported characters are skipped
+    out = bytearray()
+    for char in text.upper():
+        if char == ' ':
+            if out:
+                out[-1] = out[-1] & 0xF0 | WORD_GAP
+            continue
+        packed = ENCODE.get(char)
+        if packed is None:
+            continue
+        n = 0
+        while packed >> (n + 1):
+            n += 1
+        for bit in range(n - 1, -1, -1):
+            out.append((DASH if packed >> bit & 1 else DOT) << 4 | SYMBOL_GAP)
+        if out[-1] & 0x0F != WORD_GAP:
+            out[-1] = out[-1] & 0xF0 | LETTER_GAP
+    return out
+
+
+def to_string(elements):
+    # Packed table -> ".- -..." for printing
+    s = []
+    for e in elements:
+        s.append('-' if e >> 4 == DASH else '.')
+        gap = e & 0x0F
+        if gap == LETTER_GAP:
+            s.append(' ')
+        elif gap == WORD_GAP:
+            s.append(' / ')
+    return ''.join(s).strip(' /')
+
+
+def duration_ms(elements, unit):
+    total = 0
+    for e in elements:
+        total += (e >> 4) + (e & 0x0F)
+    return total * unit
+
+
+class MorseTransmitter:
+
+    def __init__(self, led=None, buzzer=None, unit=150, freq=1000, duty=32768,
+                 queue_size=4, timer=None):
+        # led: machine.Pin or PWM; buzzer: machine.PWM (passive) or Pin (active)
+        self.led = led
+        self.buzzer = buzzer
+        self.buzzer_pwm = hasattr(buzzer, "duty_u16")
+        if self.buzzer_pwm:
+            buzzer.freq(freq)
+        self.unit = unit
+        self.duty = duty
+        self.queue = [None] * queue_size
+        self.head = 0
+        self.tail = 0
+        self.elements = None                # Message being sent
+        self.index = 0
+        self.mark = False                   # True while the signal is on
+        self.timer = timer if timer is not None else Timer()
+        self._step_cb = self._step
+        self._output(0)
+
+    def _output(self, on):
+        if self.led is not None:
+            if hasattr(self.led, "duty_u16"):
+                self.led.duty_u16(65535 if on else 0)
+            else:
+                self.led.value(on)
+        if self.buzzer is not None:
+            if self.buzzer_pwm:
+                self.buzzer.duty_u16(self.duty if on else 0)
+            else:
+                self.buzzer.value(on)
+
+    def send(self, text):
+        # Compile and queue a message; False when the queue is full
+        elements = encode(text)
+        if not elements:
+            return True
+        nxt = (self.head + 1) % len(self.queue)
+        if nxt == self.tail:
+            return False
+        self.queue[self.head] = elements
+        self.head = nxt
+        if self.elements is None:
+            self._next_message()
+        return True
+
+    @property
+    def busy(self):
+        return self.elements is not None
+
+    def pending(self):
+        return (self.head - self.tail) % len(self.queue)
+
+    def _next_message(self):
+        if self.head == self.tail:
+            self.elements = None
+            return
+        self.elements = self.queue[self.tail]
+        self.queue[self.tail] = None
+        self.tail = (self.tail + 1) % len(self.queue)
+        self.index = 0
+        self.mark = False
+        self._step(None)
+
+    def _step(self, t):
+        elements = self.elements
+        if elements is None:
+            return
+        if not self.mark:
+            if self.index == len(elements):
+                self._next_message()
+                return
+            self.mark = True
+            self._output(1)
+            units = elements[self.index] >> 4
+        else:
+            self.mark = False
+            self._output(0)
+            units = elements[self.index] & 0x0F
+            self.index += 1
+        self.timer.init(mode=Timer.ONE_SHOT, period=units * self.unit, callback=self._step_cb)
+
+    def stop(self):
+        # Abort the current message and drop the queue
+        self.timer.deinit()
+        self.elements = None
+        self.head = self.tail = 0
+        for i in range(len(self.queue)):
+            self.queue[i] = None
+        self._output(0)
+
+
+class MorseDecoder:
+
+    def __init__(self, pin, unit=150, active_low=False, min_ms=15, buffer_size=64,
+                 timer=None, pull=None):
+        # pin: GPIO number of a button or a light sensor's digital output
+        self.pin = Pin(pin, Pin.IN, pull)
+        self.active = 0 if active_low else 1
+        self.unit = unit                    # Current dot length estimate (ms)
+        self.min_ms = min_ms                # Shorter marks are contact bounce
+        self.code = 1                       # Symbols of the open letter
+        self.mark_start = 0
+        self.word_open = False
+        self.buf = bytearray(buffer_size)   # Decoded characters (ring)
+        self.head = 0
+        self.tail = 0
+        self.timer = timer if timer is not None else Timer()
+        self._gap_cb = self._gap
+        self.pin.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=self._edge)
+
+    def _put(self, c):
+        nxt = (self.head + 1) % len(self.buf)
+        if nxt != self.tail:
+            self.buf[self.head] = c
+            self.head = nxt
+
+    def _edge(self, pin):
+        now = time.ticks_ms()
+        if pin.value() == self.active:
+            self.timer.deinit()             # Gap over before it closed a letter
+            self.mark_start = now
+            return
+        length = time.ticks_diff(now, self.mark_start)
+        if length >= self.min_ms:
+            # Threshold halfway between a dot (1) and a dash (3)
+            unit = self.unit
+            if length < 2 * unit:
+                self.code = self.code << 1
+                self.unit = unit + (length - unit) // 4
+            else:
+                self.code = self.code << 1 | 1
+                self.unit = unit + (length // 3 - unit) // 4
+            if self.code > 0x7F:            # Longer than any known letter
+                self.code = 1
+                self._put(ord('?'))
+        # A letter ends after 2 units of silence (between 1 and 3)
+        self.timer.init(mode=Timer.ONE_SHOT, period=2 * self.unit, callback=self._gap_cb)
+
+    def _gap(self, t):
+        if self.code != 1:
+            self._put(DECODE[self.code] or ord('?'))
+            self.code = 1
+            self.word_open = True
+            # A word ends after 5 units (between 3 and 7): 3 more from here
+            self.timer.init(mode=Timer.ONE_SHOT, period=3 * self.unit, callback=self._gap_cb)
+        elif self.word_open:
+            self.word_open = False
+            self._put(ord(' '))
+
+    def read(self):
+        # Characters decoded so far, or ""
+        out = []
+        while self.tail != self.head:
+            out.append(chr(self.buf[self.tail]))
+            self.tail = (self.tail + 1) % len(self.buf)
+        return ''.join(out)
+
+    def deinit(self):
+        self.pin.irq(handler=None)
+        self.timer.deinit()
@@ -0,0 +1,118 @@
+from machine import Pin, Timer
+
+# Multiplexed 7-segment display behind a 74HC595 (see hc595.py). A hardware
+# Timer lights one digit per tick from a precomputed segment buffer, so the
+# display keeps refreshing while the main program does other work. Callers
+# only set a number or a string.
+#
+# Brightness is the share of each digit slot the digit stays lit; below 100
+# a second one-shot timer blanks the digit early.
+
+# Segment bits: dp g f e d c b a
+FONT = {
+    "0": 0x3F, "1": 0x06, "2": 0x5B, "3": 0x4F, "4": 0x66,
+    "5": 0x6D, "6": 0x7D, "7": 0x07, "8": 0x7F, "9": 0x6F,
+    "A": 0x77, "B": 0x7C, "C": 0x39, "D": 0x5E, "E": 0x79, "F": 0x71,
+    "G": 0x3D, "H": 0x76, "I": 0x06, "J": 0x1E, "L": 0x38, "N": 0x54,
+    "O": 0x5C, "P": 0x73, "R": 0x50, "S": 0x6D, "T": 0x78, "U": 0x3E,
+    "Y": 0x6E, "-": 0x40, "_": 0x08, " ": 0x00,
+}
+DP = 0x80
+
+
+class SegmentDisplay:
+
+    def __init__(self, register, digit_pins, refresh_hz=100, brightness=100, timer=None, active_low=True):
+        # digit_pins: select pins, ones (rightmost) digit first
+        # refresh_hz: full-display refreshes per second
+        # brightness: on-time per digit in percent
+        self.register = register
+        self.on = 0 if active_low else 1
+        self.off = 1 - self.on
+        self.digit_pins = [Pin(p, Pin.OUT, value=self.off) for p in digit_pins]
+        self.digits = len(digit_pins)
+        self.segments = bytearray(self.digits)    # Index 0 = ones digit
+        self.pos = 0
+        self.timer = timer if timer is not None else Timer()
+        self.blank_timer = Timer()
+        self.refresh_hz = refresh_hz
+        self.brightness = brightness
+        self.running = False
+        self._refresh_cb = self._refresh
+        self._blank_cb = self._blank
+        self._timing()
+
+    def _timing(self):
+        slot_us = 1000000 // (self.refresh_hz * self.digits)
+        self.on_us = slot_us * self.brightness // 100
+        self.blanking = self.on_us < slot_us
+        self.blank_freq = 1000000 / max(self.on_us, 1)
+
+    def start(self):
+        self.running = True
+        self.timer.init(mode=Timer.PERIODIC, freq=self.refresh_hz * self.digits, callback=self._refresh_cb)
+
+    def stop(self):
+        self.running = False
+        self.timer.deinit()
+        self.blank_timer.deinit()
+        for pin in self.digit_pins:
+            pin(self.off)
+
+    def set_refresh(self, refresh_hz):
+        self.refresh_hz = refresh_hz
+        self._timing()
+        if self.running:
+            self.start()
+
+    def set_brightness(self, brightness):
+        self.brightness = max(0, min(brightness, 100))
+        self._timing()
+
+    def show_number(self, value, leading_zeros=True):
+        # Right-aligned decimal number; '-' for negatives
+        text = str(value)
+        if leading_zeros:
+            sign = "-" if value < 0 else ""
+            text = sign + text[len(sign):].zfill(self.digits - len(sign))
+        self.show_text(text)
+
+    def show_text(self, text):
+        # Right-aligned text; '.' lights the decimal point of the character before it
+        segs = self.segments
+        pos = 0
+        i = len(text) - 1
+        while pos < self.digits:
+            if i < 0:
+                segs[pos] = 0
+            else:
+                c = text[i]
+                dp = 0
+                if c == "." and i > 0:
+                    dp = DP
+                    i -= 1
+                    c = text[i]
+                segs[pos] = FONT.get(c.upper(), 0) | dp
+                i -= 1
+            pos += 1
+
+    def clear(self):
+        for i in range(self.digits):
+            self.segments[i] = 0
+
+    def _refresh(self, t):
+        pins = self.digit_pins
+        pins[self.pos](self.off)
+        pos = self.pos + 1
+        if pos == self.digits:
+            pos = 0
+        self.pos = pos
+        if not self.on_us:
+            return
+        self.register.write_byte(self.segments[pos])
+        pins[pos](self.on)
+        if self.blanking:
+            self.blank_timer.init(mode=Timer.ONE_SHOT, freq=self.blank_freq, callback=self._blank_cb)
+
+    def _blank(self, t):
+        self.digit_pins[self.pos](self.off)
@@ -0,0 +1,142 @@
+import array
+import math
+import time
+from machine import PWM, Pin, Timer
+
+# Hobby servos with timed motion profiles. Each servo gets a table of PWM
+# duties per degree, worked out once, so setting a position is a lookup and
+# one interpolation between degrees. ServoGroup moves one or more servos
+# from a periodic Timer along a motion profile (progress over time, also a
+# precomputed table): all servos in a move start together and arrive
+# together, however far each one has to go. Positions follow the elapsed
+# time, so a late tick never makes the motion drift.
+#
+# Positions are kept in tenths of a degree.
+
+PWM_FREQ = 50
+PROFILE_STEPS = 64
+ONE = 65535                 # Full progress in a profile table
+
+LINEAR = 0
+EASE = 1                    # Cosine ease in and out
+TRAPEZOID = 2               # Constant acceleration, cruise, constant deceleration
+ACCEL_FRACTION = 0.25       # Share of a trapezoid move spent speeding up
+
+
+def _profile(curve):
+    return array.array("H", [int(curve(i / PROFILE_STEPS) * ONE + 0.5)
+                             for i in range(PROFILE_STEPS + 1)])
+
+
+def _trapezoid(u, a=ACCEL_FRACTION):
+    v = 1 / (1 - a)         # Cruise speed so the area is 1
+    if u < a:
+        return v * u * u / (2 * a)
+    if u <= 1 - a:
+        return v * (u - a / 2)
+    return 1 - v * (1 - u) * (1 - u) / (2 * a)
+
+
+PROFILES = (
+    _profile(lambda u: u),
+    _profile(lambda u: (1 - math.cos(math.pi * u)) / 2),
+    _profile(_trapezoid),
+)
+
+
+class Servo:
+
+    def __init__(self, pin, min_us=500, max_us=2500, max_angle=180, freq=PWM_FREQ):
+        self.pwm = PWM(Pin(pin))
+        self.pwm.freq(freq)
+        self.max_angle = max_angle
+        period_us = 1000000 // freq
+        # Duty for every whole degree, plus one so the last one interpolates
+        self.duty = array.array("H", [
+            (min_us + (max_us - min_us) * min(a, max_angle) // max_angle) * 65535 // period_us
+            for a in range(max_angle + 2)])
+        self.position = 0                  # Tenths of a degree
+
+    def write_tenths(self, pos):
+        if pos < 0:
+            pos = 0
+        elif pos > self.max_angle * 10:
+            pos = self.max_angle * 10
+        i = pos // 10
+        duty = self.duty
+        self.pwm.duty_u16(duty[i] + (duty[i + 1] - duty[i]) * (pos - i * 10) // 10)
+        self.position = pos
+
+    def write(self, angle):
+        # Jump straight to an angle in degrees
+        self.write_tenths(int(angle * 10))
+
+    @property
+    def angle(self):
+        return self.position / 10
+
+    def deinit(self):
+        self.pwm.deinit()
+
+
+class ServoGroup:
+
+    def __init__(self, servos, period_ms=20, timer=None):
+        # period_ms: update interval; 20 ms matches the 50 Hz servo frame
+        self.servos = servos
+        n = len(servos)
+        self.start = array.array("i", [0] * n)
+        self.delta = array.array("i", [0] * n)
+        self.period_ms = period_ms
+        self.timer = timer if timer is not None else Timer()
+        self.profile = PROFILES[LINEAR]
+        self.duration = 0
+        self.t0 = 0
+        self.moving = False
+        self._tick_cb = self._tick
+
+    def move(self, angles, duration_ms=None, speed=90, profile=TRAPEZOID):
+        # Move every servo to its angle (None = stay). Without duration_ms the
+        # longest travel sets the time at `speed` degrees per second; the
+        # others slow down so all of them arrive together.
+        self.timer.deinit()
+        longest = 0
+        for i, servo in enumerate(self.servos):
+            self.start[i] = servo.position
+            target = servo.position if angles[i] is None else int(angles[i] * 10)
+            self.delta[i] = target - servo.position
+            longest = max(longest, abs(self.delta[i]))
+        if duration_ms is None:
+            duration_ms = longest * 100 // speed      # Tenths / (deg/s) -> ms
+        self.profile = PROFILES[profile]
+        self.duration = max(duration_ms, 1)
+        self.t0 = time.ticks_ms()
+        self.moving = True
+        self.timer.init(mode=Timer.PERIODIC, period=self.period_ms, callback=self._tick_cb)
+
+    def _tick(self, t):
+        elapsed = time.ticks_diff(time.ticks_ms(), self.t0)
+        if elapsed >= self.duration:
+            progress = ONE
+            self.timer.deinit()
+            self.moving = False
+        else:
+            # Look up and interpolate the profile at this point in time
+            x = elapsed * PROFILE_STEPS
+            i = x // self.duration
+            frac = x - i * self.duration
+            p = self.profile
+            progress = p[i] + (p[i + 1] - p[i]) * frac // self.duration
+        start = self.start
+        delta = self.delta
+        for k, servo in enumerate(self.servos):
+            servo.write_tenths(start[k] + delta[k] * progress // ONE)
+
+    def stop(self):
+        # Hold where the servos are now
+        self.timer.deinit()
+        self.moving = False
+
+    def wait(self):
+        while self.moving:
+            time.sleep_ms(self.period_ms)
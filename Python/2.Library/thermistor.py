@@ -0,0 +1,112 @@
+import array
+import math
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # CPython, so benchmark() also runs on a desktop
+    from time import perf_counter
+    def ticks_us(): return int(perf_counter() * 1000000)
+    def ticks_diff(a, b): return a - b
+
+# NTC thermistor conversion by lookup table. The curve from ADC code to
+# temperature is worked out once with the float formula (Beta or
+# Steinhart-Hart) at every 2**step_bits codes; after that a reading costs a
+# shift, a mask and one linear interpolation in integer maths, with no
+# division or logarithm. A smaller step_bits means a bigger table and a
+# smaller error; benchmark() shows both.
+#
+# Wiring as in the kit: 3.3 V - series resistor - ADC pin - thermistor - GND,
+# so R = series * code / (65535 - code).
+
+ADC_MAX = 65535
+KELVIN_OFFSET = 273.15
+
+
+def resistance(code, series=10000):
+    code = min(max(code, 1), ADC_MAX - 1)
+    return series * code / (ADC_MAX - code)
+
+
+def beta_celsius(code, beta=3950, r0=10000, t0=25.0, series=10000):
+    # Reference Beta equation (float, one log per call)
+    r = resistance(code, series)
+    return 1.0 / (1.0 / (t0 + KELVIN_OFFSET) + math.log(r / r0) / beta) - KELVIN_OFFSET
+
+
+def steinhart_celsius(code, coefficients, series=10000):
+    # 1/T = A + B ln R + C (ln R)^3
+    a, b, c = coefficients
+    ln_r = math.log(resistance(code, series))
+    return 1.0 / (a + b * ln_r + c * ln_r * ln_r * ln_r) - KELVIN_OFFSET
+
+
+def fit_steinhart(points):
+    # Coefficients (A, B, C) from three (celsius, ohms) calibration points
+    (t1, r1), (t2, r2), (t3, r3) = points
+    l1, l2, l3 = math.log(r1), math.log(r2), math.log(r3)
+    y1 = 1 / (t1 + KELVIN_OFFSET)
+    y2 = 1 / (t2 + KELVIN_OFFSET)
+    y3 = 1 / (t3 + KELVIN_OFFSET)
+    g2 = (y2 - y1) / (l2 - l1)
+    g3 = (y3 - y1) / (l3 - l1)
+    c = (g3 - g2) / (l3 - l2) / (l1 + l2 + l3)
+    b = g2 - c * (l1 * l1 + l1 * l2 + l2 * l2)
+    a = y1 - (b + l1 * l1 * c) * l1
+    return a, b, c
+
+
+class Thermistor:
+
+    def __init__(self, beta=3950, r0=10000, t0=25.0, series=10000, coefficients=None,
+                 step_bits=8):
+        # coefficients: Steinhart-Hart (A, B, C); used instead of beta when given
+        self.step_bits = step_bits
+        self.mask = (1 << step_bits) - 1
+        if coefficients is not None:
+            convert = lambda code: steinhart_celsius(code, coefficients, series)
+        else:
+            convert = lambda code: beta_celsius(code, beta, r0, t0, series)
+        # Hundredths of a degree; the ends are clamped to what 'h' can hold
+        entries = (ADC_MAX + 1 >> step_bits) + 1
+        self.table = array.array("h", [0] * entries)
+        for i in range(entries):
+            t = round(convert(i << step_bits) * 100)
+            self.table[i] = min(max(t, -32768), 32767)
+
+    def centi_celsius(self, code):
+        # Temperature in 1/100 degC, integers only
+        i = code >> self.step_bits
+        t = self.table[i]
+        return t + ((self.table[i + 1] - t) * (code & self.mask) >> self.step_bits)
+
+    def celsius(self, code):
+        return self.centi_celsius(code) / 100
+
+    def fahrenheit(self, code):
+        return self.centi_celsius(code) * 9 / 500 + 32
+
+
+def benchmark(beta=3950, r0=10000, series=10000, t_min=-20, t_max=100, n=2000):
+    # Table size, worst error (degC) within t_min..t_max and time per reading
+    codes = [c for c in range(64, ADC_MAX, 64)
+             if t_min <= beta_celsius(c, beta, r0, 25.0, series) <= t_max]
+    sample = [codes[i * len(codes) // n] for i in range(n)]
+
+    t = ticks_us()
+    for code in sample:
+        beta_celsius(code, beta, r0, 25.0, series)
+    formula_us = ticks_diff(ticks_us(), t)
+    print("%-10s %6s %10s %8.2f us" % ("formula", "-", "-", formula_us / n))
+
+    for step_bits in (10, 8, 6, 4):
+        sensor = Thermistor(beta, r0, 25.0, series, step_bits=step_bits)
+        worst = 0
+        for code in codes:
+            err = abs(sensor.celsius(code) - beta_celsius(code, beta, r0, 25.0, series))
+            worst = max(worst, err)
+        t = ticks_us()
+        for code in sample:
+            sensor.centi_celsius(code)
+        lut_us = ticks_diff(ticks_us(), t)
+        print("%-10s %6d %8.3f C %8.2f us" % ("lut/%d" % step_bits, len(sensor.table) * 2,
+                                              worst, lut_us / n))
@@ -0,0 +1,122 @@
+import array
+import time
+import machine
+
+# Several buzzers played from one timer-driven event list. Every voice must
+# sit on its own PWM slice (GPIO n uses slice (n >> 1) & 7), because the two
+# channels of a slice share one frequency. Events are kept sorted by time;
+# each timer callback applies every event that is due, so note boundaries of
+# different voices that share a timestamp change together, and delays are
+# measured from the start time so they do not drift.
+
+DUTY = 30000
+
+
+def pwm_slice(pin):
+    return (pin >> 1) & 7
+
+
+class ToneEngine:
+
+    def __init__(self, pins, timer=None, duty=DUTY):
+        slices = [pwm_slice(p) for p in pins]
+        for s in slices:
+            if slices.count(s) > 1:
+                raise ValueError("Each voice needs its own PWM slice")
+        self.voices = [machine.PWM(machine.Pin(p)) for p in pins]
+        for v in self.voices:
+            v.duty_u16(0)
+        self.timer = timer if timer is not None else machine.Timer()
+        self.duty = duty
+        self.pending = []                  # (time_ms, freq, voice) while building
+        self.times = array.array("I")      # Sorted event times in ms
+        self.actions = array.array("I")    # voice << 16 | freq (0 = off)
+        self.pos = 0
+        self.playing = False
+        self._start = 0
+        self._callback = self._step
+
+    def note(self, voice, freq, start_ms, duration_ms):
+        # Schedule one note; freq 0 is a rest
+        if freq:
+            self.pending.append((start_ms, freq, voice))
+        self.pending.append((start_ms + duration_ms, 0, voice))
+
+    def chord(self, freqs, start_ms, duration_ms):
+        # One note per voice, all starting and stopping together
+        for voice, freq in enumerate(freqs):
+            self.note(voice, freq, start_ms, duration_ms)
+
+    def sweep(self, voice, f_start, f_end, start_ms, duration_ms, steps=16):
+        # Pitch slide sound effect made of short steps
+        step_ms = duration_ms // steps
+        for i in range(steps):
+            freq = f_start + (f_end - f_start) * i // (steps - 1 or 1)
+            self.pending.append((start_ms + i * step_ms, freq, voice))
+        self.pending.append((start_ms + steps * step_ms, 0, voice))
+
+    def add_events(self, voice, events, start_ms=0):
+        # Append (freq, on_ms, off_ms) events from melody.compile_melody()
+        t = start_ms
+        for i in range(0, len(events), 3):
+            self.note(voice, events[i], t, events[i + 1])
+            t += events[i + 1] + events[i + 2]
+        return t
+
+    def clear(self):
+        self.stop()
+        self.pending = []
+        self.times = array.array("I")
+        self.actions = array.array("I")
+
+    def _compile(self):
+        # Offs sort before ons at the same time, so repeated notes retrigger
+        self.pending.sort()
+        self.times = array.array("I", [e[0] for e in self.pending])
+        self.actions = array.array("I", [e[2] << 16 | e[1] for e in self.pending])
+        self.pending = []
+
+    def play(self):
+        if self.pending:
+            self._compile()
+        if not self.times:
+            return
+        self.pos = 0
+        self.playing = True
+        self._start = time.ticks_ms()
+        self._step(None)
+
+    def stop(self):
+        self.timer.deinit()
+        self.playing = False
+        for v in self.voices:
+            v.duty_u16(0)
+
+    def _step(self, t):
+        if not self.playing:
+            return
+        now = time.ticks_diff(time.ticks_ms(), self._start)
+        times = self.times
+        actions = self.actions
+        n = len(times)
+        i = self.pos
+        while i < n and times[i] <= now:
+            a = actions[i]
+            v = self.voices[a >> 16]
+            if a & 0xFFFF:
+                v.freq(a & 0xFFFF)
+                v.duty_u16(self.duty)
+            else:
+                v.duty_u16(0)
+            i += 1
+        self.pos = i
+        if i < n:
+            self.timer.init(mode=machine.Timer.ONE_SHOT, period=max(times[i] - now, 1),
+                            callback=self._callback)
+        else:
+            self.playing = False
+
+    def deinit(self):
+        self.stop()
+        for v in self.voices:
+            v.deinit()
@@ -0,0 +1,143 @@
+import array
+from machine import Pin, Timer
+from rp2 import PIO, StateMachine, asm_pio
+
+# HC-SR04 ranging with PIO echo timing. Each sensor gets a state machine
+# that sends the 10 us trigger pulse and counts the echo in 1 us steps, so
+# the resolution no longer depends on how fast Python polls the pin and the
+# CPU never waits for an echo. A Timer fires every period_ms: it collects the
+# result of the sensor that was just triggered and triggers the next one.
+# Only one sensor pings at a time, and a period longer than the echo timeout
+# lets the previous ping die out first, so sensors do not hear each other.
+#
+# Readings are the median of the last `window` echoes per sensor; a lone
+# missed or wild echo is ignored. Read them any time with distance_cm(), or
+# pass a callback(index, cm) to be told about every new reading.
+
+PIO_FREQ = 2000000          # 2 cycles per count -> 1 count per microsecond
+US_PER_CM = 58              # Round trip time for 1 cm at ~343 m/s
+SPEED_OF_SOUND_CM_PER_US = 0.0343
+
+
+@asm_pio(set_init=PIO.OUT_LOW)
+def echo_timer():
+    # Pull a timeout (in us), trigger, push the remaining count (0 = timeout)
+    wrap_target()
+    pull()
+    set(pins, 1)[19]                # 10 us trigger pulse
+    set(pins, 0)
+    mov(x, osr)
+    label("wait_high")
+    jmp(pin, "high")
+    jmp(x_dec, "wait_high")
+    jmp("timeout")                  # x has wrapped past 0 here
+    label("high")
+    mov(x, osr)
+    label("count")
+    jmp(x_dec, "next")
+    jmp("timeout")
+    label("next")
+    jmp(pin, "count")
+    mov(isr, x)
+    jmp("done")
+    label("timeout")
+    mov(isr, null)
+    label("done")
+    push()
+    wrap()
+
+
+class Ultrasonic:
+
+    def __init__(self, sensors, period_ms=60, window=5, max_cm=400, sm_base=4,
+                 timer=None, callback=None):
+        # sensors: list of (trigger_pin, echo_pin); sm_base: first state machine id
+        self.sms = []
+        for i, (trig, echo) in enumerate(sensors):
+            sm = StateMachine(sm_base + i, echo_timer, freq=PIO_FREQ,
+                              set_base=Pin(trig, Pin.OUT), jmp_pin=Pin(echo, Pin.IN))
+            sm.active(1)
+            self.sms.append(sm)
+        n = len(self.sms)
+        # Waiting for the echo and timing it may each take a full timeout;
+        # both must end before the next tick (leave 5 ms to spare)
+        self.timeout = min(max_cm * US_PER_CM, (period_ms - 5) * 500)
+        self.period_ms = period_ms
+        self.window = window
+        self.samples = [array.array("H", [0] * window) for _ in range(n)]
+        self.pos = bytearray(n)             # Next slot in each sample ring
+        self.count = bytearray(n)           # Valid samples in each ring
+        self.misses = bytearray(n)          # Consecutive missing echoes
+        self.median_us = array.array("H", [0] * n)
+        self.scratch = array.array("H", [0] * window)
+        self.current = 0
+        self.timer = timer if timer is not None else Timer()
+        self.callback = callback
+        self._tick_cb = self._tick
+
+    def start(self):
+        self.current = 0
+        self.sms[0].put(self.timeout)
+        self.timer.init(mode=Timer.PERIODIC, period=self.period_ms, callback=self._tick_cb)
+
+    def stop(self):
+        self.timer.deinit()
+
+    def deinit(self):
+        self.stop()
+        for sm in self.sms:
+            sm.active(0)
+
+    def _record(self, i, echo_us):
+        if not echo_us:
+            if self.misses[i] < self.window:
+                self.misses[i] += 1
+            if self.misses[i] >= self.window:
+                self.count[i] = 0           # Nothing in range any more
+                self.pos[i] = 0
+                self.median_us[i] = 0
+            return
+        self.misses[i] = 0
+        samples = self.samples[i]
+        samples[self.pos[i]] = echo_us
+        self.pos[i] = (self.pos[i] + 1) % self.window
+        if self.count[i] < self.window:
+            self.count[i] += 1
+        # Insertion sort of the valid samples into the scratch buffer
+        n = self.count[i]
+        scratch = self.scratch
+        for k in range(n):
+            v = samples[k]
+            j = k
+            while j and scratch[j - 1] > v:
+                scratch[j] = scratch[j - 1]
+                j -= 1
+            scratch[j] = v
+        self.median_us[i] = scratch[n // 2]
+
+    def _tick(self, t):
+        i = self.current
+        sm = self.sms[i]
+        echo_us = 0
+        if sm.rx_fifo():
+            remaining = sm.get()
+            if 0 < remaining <= self.timeout:   # Anything else is a miss
+                echo_us = self.timeout - remaining
+        self._record(i, echo_us)
+        if self.callback:
+            self.callback(i, self.distance_cm(i))
+        i += 1
+        if i == len(self.sms):
+            i = 0
+        self.current = i
+        sm = self.sms[i]
+        while sm.rx_fifo():                 # Drop anything stale
+            sm.get()
+        sm.put(self.timeout)
+
+    def distance_cm(self, i=0):
+        # Filtered distance of sensor i, or -1 when nothing is in range
+        us = self.median_us[i]
+        if not us:
+            return -1
+        return us * SPEED_OF_SOUND_CM_PER_US / 2
@@ -10,46 +10,125 @@ except:
 
 DEBUG = 0
 
-def server_handshake(sock):
-    clr = sock.makefile("rwb", 0)
-    l = clr.readline()
-    #sys.stdout.write(repr(l))
+# Largest request header block accepted by server_handshake(); anything
+# bigger is rejected instead of growing a buffer on the heap.
+MAX_HEADER_SIZE = 1024
 
-    webkey = None
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_KEY_HEADER = b"sec-websocket-key"
+_PROTOCOL_HEADER = b"sec-websocket-protocol"
+_RESPONSE_HEAD = b"""\
+HTTP/1.1 101 Switching Protocols\r
+Upgrade: websocket\r
+Connection: Upgrade\r
+Sec-WebSocket-Accept: """
+_ACCEPT_LEN = 28  # base64 of a 20-byte SHA1 digest
+_KEY_LEN = 24     # base64 of the client's 16-byte nonce
 
-    while 1:
-        l = clr.readline()
-        if not l:
+# Allocated once and reused by every handshake, so frequent controller
+# reconnects do not fragment the heap.
+_hdr_buf = bytearray(MAX_HEADER_SIZE)
+_resp_buf = bytearray(len(_RESPONSE_HEAD) + _ACCEPT_LEN + 4)
+_resp_buf[:len(_RESPONSE_HEAD)] = _RESPONSE_HEAD
+_resp_buf[-4:] = b"\r\n\r\n"
+
+
+def _recv_headers(sock, buf):
+    # Fill buf until the blank line ending the header block is seen.
+    # Returns the number of bytes up to and including the first CRLF of
+    # the terminator.
+    mv = memoryview(buf)
+    try:
+        recv_into = sock.recv_into
+    except AttributeError:
+        recv_into = sock.readinto
+    n = 0
+    while True:
+        if n == len(buf):
+            raise OSError("Headers too large")
+        got = recv_into(mv[n:])
+        if not got:
             raise OSError("EOF in headers")
-        if l == b"\r\n":
-            break
-    #    sys.stdout.write(l)
-        h, v = [x.strip() for x in l.split(b":", 1)]
-        if DEBUG:
-            print((h, v))
-        if h == b'Sec-WebSocket-Key':
-            webkey = v
-
-    if not webkey:
+        # Resume the search a few bytes back in case CRLFCRLF straddles reads
+        i = n - 3 if n > 3 else 0
+        n += got
+        while i <= n - 4:
+            if buf[i] == 13 and buf[i + 1] == 10 and buf[i + 2] == 13 and buf[i + 3] == 10:
+                return i + 2
+            i += 1
+
+
+def _find_header(buf, end, name):
+    # Case-insensitive search for header `name` (lowercase bytes) in
+    # buf[:end]. Returns (start, stop) of the stripped value, or None.
+    nlen = len(name)
+    i = 0
+    while i < end:
+        # Skip to the start of the next line (the request line is skipped too)
+        while i < end and buf[i] != 10:
+            i += 1
+        i += 1
+        if i + nlen >= end or buf[i + nlen] != 58:  # ':'
+            continue
+        j = 0
+        while j < nlen and (buf[i + j] | 0x20) == name[j]:
+            j += 1
+        if j != nlen:
+            continue
+        s = i + nlen + 1
+        while s < end and buf[s] == 32:
+            s += 1
+        e = s
+        while e < end and buf[e] != 13:
+            e += 1
+        while e > s and buf[e - 1] == 32:
+            e -= 1
+        return s, e
+    return None
+
+
+def server_handshake(sock, subprotocols=()):
+    # subprotocols: server-side preference list of Sec-WebSocket-Protocol
+    # tokens (bytes). Returns the one agreed with the client, or None.
+    end = _recv_headers(sock, _hdr_buf)
+    span = _find_header(_hdr_buf, end, _KEY_HEADER)
+    if not span:
         raise OSError("Not a websocket request")
+    if span[1] - span[0] != _KEY_LEN or _hdr_buf[span[1] - 1] != 61:  # '='
+        raise OSError("Bad Sec-WebSocket-Key")
 
+    webkey = memoryview(_hdr_buf)[span[0]:span[1]]
     if DEBUG:
-        print("Sec-WebSocket-Key:", webkey, len(webkey))
+        print("Sec-WebSocket-Key:", bytes(webkey), len(webkey))
 
     d = hashlib.sha1(webkey)
-    d.update(b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11")
-    respkey = d.digest()
-    respkey = binascii.b2a_base64(respkey)[:-1]
+    d.update(_GUID)
+    respkey = binascii.b2a_base64(d.digest())
     if DEBUG:
-        print("respkey:", respkey)
+        print("respkey:", respkey[:-1])
 
-    sock.send(b"""\
-HTTP/1.1 101 Switching Protocols\r
-Upgrade: websocket\r
-Connection: Upgrade\r
-Sec-WebSocket-Accept: """)
-    sock.send(respkey)
-    sock.send("\r\n\r\n")
+    proto = None
+    if subprotocols:
+        span = _find_header(_hdr_buf, end, _PROTOCOL_HEADER)
+        if span:
+            offered = [x.strip() for x in bytes(_hdr_buf[span[0]:span[1]]).split(b",")]
+            for p in subprotocols:
+                if p in offered:
+                    proto = p
+                    break
+
+    # Whole 101 response goes out in a single send
+    pos = len(_RESPONSE_HEAD)
+    _resp_buf[pos:pos + _ACCEPT_LEN] = respkey[:_ACCEPT_LEN]
+    if proto:
+        resp = _resp_buf[:-2] + b"Sec-WebSocket-Protocol: " + proto + b"\r\n\r\n"
+    else:
+        resp = _resp_buf
+    mv = memoryview(resp)
+    sent = 0
+    while sent < len(resp):
+        sent += sock.send(mv[sent:])
+    return proto
 
 
 # Very simplified client handshake, works for MicroPython's
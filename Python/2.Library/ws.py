@@ -6,6 +6,7 @@ import uwebsocket
 import websocket_helper
 import time
 import json
+import struct
 
 NAME = 'PicoW'
 AP_PASSWORD = "123456789"
@@ -13,6 +14,78 @@ STA_NAME = "MakerStarsHall"
 STA_PASSWORD = "sunfounder" 
 SWITCH_MODE = "sta" # Change the values to "ap" or "sta" to select the operating mode
 
+# Sec-WebSocket-Protocol tokens. A client that offers PROTOCOL_BINARY gets
+# the compact struct frames below; anyone else keeps talking JSON.
+PROTOCOL_BINARY = b"sfc.bin"
+PROTOCOL_JSON = b"sfc.json"
+
+# Binary frame layout (little-endian), same in both directions:
+#   byte 0      frame type (FRAME_STATE)
+#   bytes 1-4   uint32 button mask, bit i = REGIONS[i] pressed/true
+#   bytes 5-    int16 x, int16 y for every region in REGIONS order
+#               (sliders and single values use x, joysticks use x and y)
+REGIONS = "ABCDEFGHIJKLMNOPQ"
+FRAME_STATE = 0x01
+FRAME_FMT = "<BI"
+FRAME_HEADER = 5
+FRAME_SIZE = FRAME_HEADER + 4 * len(REGIONS)
+_ZEROS = bytes(FRAME_SIZE - FRAME_HEADER)
+
+
+def _int16(v):
+    # Round floats and clamp to what an int16 slot can carry
+    v = int(round(v))
+    return -32768 if v < -32768 else 32767 if v > 32767 else v
+
+
+class BinaryFrame():
+    # Decoded view over a preallocated receive buffer. Accessors read the
+    # bytes in place, nothing is copied or allocated per message.
+
+    def __init__(self):
+        self.buf = bytearray(FRAME_SIZE)
+        self.mv = memoryview(self.buf)
+
+    def _i16(self, offset):
+        v = self.buf[offset] | (self.buf[offset + 1] << 8)
+        return v - 0x10000 if v & 0x8000 else v
+
+    def pressed(self, region):
+        i = REGIONS.find(region)
+        if i < 0 or len(region) != 1:
+            return False
+        return bool((self.buf[1] | self.buf[2] << 8 | self.buf[3] << 16 | self.buf[4] << 24) & (1 << i))
+
+    def x(self, region):
+        i = REGIONS.find(region)
+        if i < 0 or len(region) != 1:
+            return 0
+        return self._i16(FRAME_HEADER + 4 * i)
+
+    def y(self, region):
+        i = REGIONS.find(region)
+        if i < 0 or len(region) != 1:
+            return 0
+        return self._i16(FRAME_HEADER + 4 * i + 2)
+
+    def pack(self, values):
+        # Encode a dict like send_dict; unknown keys and strings are skipped,
+        # floats are rounded and numbers are clamped to the int16 range
+        mask = 0
+        self.mv[FRAME_HEADER:] = _ZEROS
+        for key, v in values.items():
+            i = REGIONS.find(key)
+            if i < 0 or len(key) != 1:
+                continue
+            if isinstance(v, bool):
+                mask |= v << i
+            elif isinstance(v, (int, float)):
+                struct.pack_into("<h", self.buf, FRAME_HEADER + 4 * i, _int16(v))
+            elif isinstance(v, (list, tuple)) and len(v) == 2:
+                struct.pack_into("<hh", self.buf, FRAME_HEADER + 4 * i, _int16(v[0]), _int16(v[1]))
+        struct.pack_into(FRAME_FMT, self.buf, 0, FRAME_STATE, mask)
+        return self.mv
+
 
 class WS_Server():
     
@@ -34,6 +107,9 @@ class WS_Server():
         self.client_s = None
         self.ws = None
         self.wlan = None
+        self.binary = False
+        self.rx = BinaryFrame()
+        self.tx = BinaryFrame()
     
     def setup_conn(self, accept_handler):
         self.listen_s = socket.socket()
@@ -56,15 +132,25 @@ class WS_Server():
         cl, remote_addr = listen_sock.accept()
         print("\nWebSocket connection from:", remote_addr)
         self.client_s = cl
-        websocket_helper.server_handshake(cl)
+        proto = websocket_helper.server_handshake(cl, (PROTOCOL_BINARY, PROTOCOL_JSON))
+        self.binary = proto == PROTOCOL_BINARY
         self.ws = uwebsocket.websocket(cl, True)
+        # The greeting is always JSON so the app can identify the device
         self.ws.write(json.dumps(self.send_dict))
+        if self.binary:
+            self.ws.ioctl(9, 2)  # send subsequent frames as binary
         print("have sended!")
         cl.setblocking(False)
 
     def read(self):
         if self.ws == None:
             return None
+        if self.binary:
+            # Returns self.rx, overwritten by the next read
+            n = self.ws.readinto(self.rx.buf)
+            if n == FRAME_SIZE and self.rx.buf[0] == FRAME_STATE:
+                return self.rx
+            return None
         recv = self.ws.read()
         if recv != None and recv != b"":
             recv = recv.decode()
@@ -86,6 +172,12 @@ class WS_Server():
         return status,result
 
     def write(self):
+        if self.binary:
+            try:
+                self.ws.write(self.tx.pack(self.send_dict))
+            except AttributeError:
+                pass
+            return
         try:
             value=json.dumps(self.send_dict)
             value = value.encode(value)
@@ -125,3 +217,29 @@ class WS_Server():
         self.stop()
         s = self.setup_conn(None)
         self.accept_conn(s)
+
+
+def benchmark(n=1000):
+    # Messages per second for one decode + reply encode cycle in each mode,
+    # without the network in the loop.
+    state = {'A': 50, 'K': [-30, 75], 'M': True, 'N': False, 'Q': 100}
+    text = json.dumps(state).encode()
+    frame = BinaryFrame()
+    wire = bytes(frame.pack(state))
+    rx = BinaryFrame()
+
+    t = time.ticks_ms()
+    for _ in range(n):
+        json.loads(text.decode())
+        json.dumps(state).encode()
+    t_json = time.ticks_diff(time.ticks_ms(), t) or 1
+
+    t = time.ticks_ms()
+    for _ in range(n):
+        rx.mv[:] = wire
+        rx.x('A'), rx.x('K'), rx.y('K'), rx.pressed('M')
+        frame.pack(state)
+    t_bin = time.ticks_diff(time.ticks_ms(), t) or 1
+
+    print("json:   %d msg/s" % (n * 1000 // t_json))
+    print("binary: %d msg/s" % (n * 1000 // t_bin))